@@ -1144,7 +1144,7 @@ async def get_stock_history(
         symbol = symbol.upper()
 
         # Get historical data from database
-        history = historical_db.get_stock_history(symbol=symbol, days=days)
+        history = historical_db.get_stock_history(symbol=symbol, days=days, lite=True)
 
         if not history:
             raise HTTPException(
@@ -1313,7 +1313,7 @@ async def get_sector_analysis(
     """
     try:
         # Get top performers from database
-        top_stocks = historical_db.get_top_performers(days=days, limit=100)
+        top_stocks = historical_db.get_top_performers_summary(days=days, limit=100)
 
         if not top_stocks:
             return SectorAnalysisResponse(
@@ -2157,7 +2157,8 @@ async def get_backtest_results(
     - Analysis results
     """
     try:
-        run_data = backtest_db.get_backtest_run(run_id)
+        # Agent scores are only returned with the signals themselves
+        run_data = backtest_db.get_backtest_run(run_id, include_agent_scores=include_signals)
 
         if not run_data:
             raise HTTPException(status_code=404, detail=f"Backtest run {run_id} not found")
@@ -2230,7 +2231,8 @@ async def compare_backtests(run_ids: str = Query(..., description="Comma-separat
         # Fetch all runs
         runs = []
         for run_id in run_id_list:
-            run_data = backtest_db.get_backtest_run(run_id)
+            # Only the equity curve is derived from signals here
+            run_data = backtest_db.get_backtest_run(run_id, include_agent_scores=False)
             if not run_data:
                 logger.warning(f"Run {run_id} not found, skipping")
                 continue
@@ -8,7 +8,10 @@ Includes specialized caching for technical indicators with incremental updates.
 from typing import Any, Optional, Dict
 from datetime import datetime, timedelta
 from collections import OrderedDict
+from pathlib import Path
 import logging
+import os
+import re
 import threading
 import pandas as pd
 import numpy as np
@@ -274,6 +277,147 @@ class CacheManager:
             return False
 
 
+class IndicatorDiskCache:
+    """
+    On-disk store of calculated technical indicators, one .npz file per symbol.
+
+    Lets a restarted process reuse indicators from the previous run instead
+    of recomputing them. Each file records the bar count, last timestamp and
+    last close of the price data it was calculated from, and is only served
+    for identical data.
+
+    Indicator values may be floats, ints, None or numeric numpy arrays; a
+    result holding anything else is not persisted.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize disk cache.
+
+        Args:
+            cache_dir: Directory for the per-symbol files (created if missing)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, symbol: str) -> Path:
+        """File for a symbol; characters unsafe in file names become '_'"""
+        return self.cache_dir / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', symbol)}.npz"
+
+    @staticmethod
+    def _signature(symbol: str, price_data: pd.DataFrame) -> np.ndarray:
+        """What a stored entry must match: symbol, bar count, last timestamp, last close"""
+        return np.array([
+            symbol,
+            str(len(price_data)),
+            str(price_data.index[-1]),
+            repr(float(price_data['Close'].iloc[-1])),
+        ])
+
+    def save(self, symbol: str, price_data: pd.DataFrame, indicators: Dict) -> bool:
+        """
+        Persist indicators calculated from price_data.
+
+        Args:
+            symbol: Stock symbol
+            price_data: Price DataFrame the indicators were calculated from
+            indicators: Calculated indicators
+
+        Returns:
+            True if written
+        """
+        if len(price_data) == 0:
+            return False
+
+        arrays = {}
+        float_keys, float_values, int_keys, int_values = [], [], [], []
+        for key, value in indicators.items():
+            if value is None or isinstance(value, (float, np.floating)):
+                float_keys.append(key)
+                float_values.append(np.nan if value is None else value)
+            elif isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+                int_keys.append(key)
+                int_values.append(value)
+            elif isinstance(value, np.ndarray) and value.dtype.kind in 'iuf':
+                arrays[f"array:{key}"] = value
+            else:
+                logger.debug(f"Not persisting indicators for {symbol}: {key} is {type(value).__name__}")
+                return False
+
+        arrays.update({
+            '__signature__': self._signature(symbol, price_data),
+            '__float_keys__': np.array(float_keys, dtype=str),
+            '__float_values__': np.array(float_values, dtype=np.float64),
+            '__int_keys__': np.array(int_keys, dtype=str),
+            '__int_values__': np.array(int_values, dtype=np.int64),
+        })
+
+        path = self._path(symbol)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **arrays)
+            # Readers never see a half-written file
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            logger.warning(f"Failed to persist indicators for {symbol}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+
+    def load(self, symbol: str, price_data: pd.DataFrame) -> Optional[Dict]:
+        """
+        Load indicators previously saved for exactly this price data.
+
+        Args:
+            symbol: Stock symbol
+            price_data: Current price DataFrame
+
+        Returns:
+            Indicators, or None if there is no matching entry
+        """
+        path = self._path(symbol)
+        if len(price_data) == 0 or not path.exists():
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                if not np.array_equal(stored['__signature__'], self._signature(symbol, price_data)):
+                    return None
+
+                indicators = {}
+                float_pairs = zip(
+                    stored['__float_keys__'].tolist(), stored['__float_values__'].tolist(), strict=True
+                )
+                for key, value in float_pairs:
+                    indicators[key] = None if np.isnan(value) else value
+                int_pairs = zip(
+                    stored['__int_keys__'].tolist(), stored['__int_values__'].tolist(), strict=True
+                )
+                for key, value in int_pairs:
+                    indicators[key] = value
+                for name in stored.files:
+                    if name.startswith('array:'):
+                        indicators[name[len('array:'):]] = stored[name]
+                return indicators
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable indicator cache file for {symbol}: {e}")
+            return None
+
+    def invalidate(self, symbol: str) -> bool:
+        """
+        Delete the stored entry for a symbol.
+
+        Returns:
+            True if a file existed
+        """
+        try:
+            self._path(symbol).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+
 class TechnicalIndicatorCache:
     """
     Specialized cache for technical indicators with incremental update support.
@@ -282,17 +426,25 @@ class TechnicalIndicatorCache:
     updates when only a few new price bars are added, avoiding full recalculation.
     """
 
-    def __init__(self, cache_manager: Optional[CacheManager] = None, max_incremental_bars: int = 5):
+    def __init__(
+        self,
+        cache_manager: Optional[CacheManager] = None,
+        max_incremental_bars: int = 5,
+        disk_cache: Optional[IndicatorDiskCache] = None
+    ):
         """
         Initialize technical indicator cache.
 
         Args:
             cache_manager: CacheManager instance to use (creates new if None)
             max_incremental_bars: Maximum new bars to allow incremental update
+            disk_cache: Optional on-disk store consulted on in-memory misses
+                and written after every calculation
         """
         self.cache_manager = cache_manager or get_cache_manager()
         self.cache = self.cache_manager.get_cache('technical_indicators', max_size=500, ttl=900)
         self.max_incremental_bars = max_incremental_bars
+        self.disk_cache = disk_cache
         self._lock = threading.RLock()
 
     def get_indicators(
@@ -323,6 +475,19 @@ class TechnicalIndicatorCache:
         with self._lock:
             cached = self.cache.get(cache_key)
 
+            # Same bars as last time: nothing to recompute
+            if cached and self._is_unchanged(cached, price_data):
+                logger.debug(f"Indicator cache hit for {symbol}")
+                return cached['indicators']
+
+            # Not in memory (e.g. after a restart): try the disk store
+            if not cached and self.disk_cache is not None:
+                indicators = self.disk_cache.load(symbol, price_data)
+                if indicators is not None:
+                    logger.debug(f"Loaded indicators for {symbol} from disk")
+                    self._cache_indicators(cache_key, symbol, price_data, indicators, persist=False)
+                    return indicators
+
             # Check if incremental update is possible
             if cached and self._can_update_incrementally(cached, price_data):
                 logger.debug(f"Incremental update possible for {symbol}")
@@ -332,6 +497,30 @@ class TechnicalIndicatorCache:
             logger.debug(f"Full recalculation for {symbol}")
             return self._calculate_and_cache(cache_key, symbol, price_data, calculator_func)
 
+    def _is_unchanged(self, cached: Dict, price_data: pd.DataFrame) -> bool:
+        """
+        Check if price_data is the data the cached indicators were built from.
+
+        Matches on bar count, last timestamp and last close, so a revised
+        final bar (e.g. an intraday close update) still recalculates.
+
+        Args:
+            cached: Cached indicator data
+            price_data: Current price DataFrame
+
+        Returns:
+            True if the cached indicators can be returned as-is
+        """
+        metadata = cached.get('metadata')
+        if not metadata or len(price_data) == 0:
+            return False
+
+        return (
+            metadata.get('last_bar_count') == len(price_data)
+            and metadata.get('last_timestamp') == price_data.index[-1]
+            and metadata.get('last_close') == float(price_data['Close'].iloc[-1])
+        )
+
     def _can_update_incrementally(self, cached: Dict, price_data: pd.DataFrame) -> bool:
         """
         Check if incremental update is possible.
@@ -442,7 +631,14 @@ class TechnicalIndicatorCache:
 
         return indicators
 
-    def _cache_indicators(self, cache_key: str, symbol: str, price_data: pd.DataFrame, indicators: Dict):
+    def _cache_indicators(
+        self,
+        cache_key: str,
+        symbol: str,
+        price_data: pd.DataFrame,
+        indicators: Dict,
+        persist: bool = True
+    ):
         """
         Cache indicators with metadata.
 
@@ -451,6 +647,7 @@ class TechnicalIndicatorCache:
             symbol: Stock symbol
             price_data: Price DataFrame
             indicators: Calculated indicators
+            persist: Also write them to the disk cache, if one is configured
         """
         cached_data = {
             'indicators': indicators,
@@ -464,6 +661,8 @@ class TechnicalIndicatorCache:
         }
 
         self.cache.set(cache_key, cached_data, ttl=900)  # 15 minutes
+        if persist and self.disk_cache is not None:
+            self.disk_cache.save(symbol, price_data, indicators)
         logger.debug(f"Cached indicators for {symbol}: {len(indicators)} indicators")
 
     def invalidate(self, symbol: str) -> bool:
@@ -477,7 +676,8 @@ class TechnicalIndicatorCache:
             True if cache existed
         """
         cache_key = f"indicators_{symbol}"
-        return self.cache.delete(cache_key)
+        on_disk = self.disk_cache is not None and self.disk_cache.invalidate(symbol)
+        return self.cache.delete(cache_key) or on_disk
 
     def clear(self):
         """Clear all cached indicators"""
@@ -492,6 +692,7 @@ class TechnicalIndicatorCache:
 # Global cache manager instance
 _cache_manager: Optional[CacheManager] = None
 _cache_lock = threading.Lock()
+_indicator_disk_cache: Optional[IndicatorDiskCache] = None
 
 
 def get_cache_manager() -> CacheManager:
@@ -508,3 +709,24 @@ def get_cache_manager() -> CacheManager:
                 _cache_manager = CacheManager()
                 logger.info("Cache manager initialized")
     return _cache_manager
+
+
+def get_indicator_disk_cache() -> Optional[IndicatorDiskCache]:
+    """
+    Get the shared on-disk indicator store (singleton).
+
+    Enabled by setting INDICATOR_CACHE_DIR; returns None when it is unset.
+
+    Returns:
+        Global IndicatorDiskCache instance, or None
+    """
+    global _indicator_disk_cache
+    cache_dir = os.getenv('INDICATOR_CACHE_DIR')
+    if not cache_dir:
+        return None
+    if _indicator_disk_cache is None:
+        with _cache_lock:
+            if _indicator_disk_cache is None:  # Double-check locking
+                _indicator_disk_cache = IndicatorDiskCache(cache_dir)
+                logger.info(f"Indicator disk cache enabled at {cache_dir}")
+    return _indicator_disk_cache
@@ -158,15 +158,21 @@ class HistoricalDataCollector:
             # Analyze each stock
             success_count = 0
             fail_count = 0
+            analyses = []
 
             for symbol in stocks_to_analyze:
                 try:
-                    self._analyze_and_store_stock(symbol)
+                    analyses.append(self._analyze_stock(symbol))
                     success_count += 1
                 except Exception as e:
                     logger.error(f"Failed to analyze {symbol}: {e}")
                     fail_count += 1
 
+            # Store the whole sweep; rows that cannot be stored count as failures
+            store_failures = self._store_analyses(analyses)
+            success_count -= store_failures
+            fail_count += store_failures
+
             # Update stats
             duration = (datetime.now() - start_time).total_seconds()
             self.stats['total_collections'] += 1
@@ -193,6 +199,31 @@ class HistoricalDataCollector:
         except Exception as e:
             logger.error(f"Data collection failed: {e}", exc_info=True)
 
+    def _store_analyses(self, analyses: List[Dict[str, Any]]) -> int:
+        """
+        Store analyses in one transaction, falling back to one row at a time
+
+        Args:
+            analyses: Analyses returned by _analyze_stock
+
+        Returns:
+            Number of analyses that could not be stored
+        """
+        try:
+            self.db.save_stock_analyses_bulk(analyses)
+            return 0
+        except Exception as e:
+            logger.warning(f"Bulk save failed, saving analyses individually: {e}")
+
+        failures = 0
+        for analysis in analyses:
+            try:
+                self.db.save_stock_analysis(**analysis)
+            except Exception as e:
+                logger.error(f"Failed to store analysis for {analysis['symbol']}: {e}")
+                failures += 1
+        return failures
+
     def _collect_market_regime(self):
         """Collect and store current market regime"""
         try:
@@ -214,12 +245,15 @@ class HistoricalDataCollector:
         except Exception as e:
             logger.error(f"Failed to collect market regime: {e}")
 
-    def _analyze_and_store_stock(self, symbol: str):
+    def _analyze_stock(self, symbol: str) -> Dict[str, Any]:
         """
-        Analyze a single stock and store results
+        Analyze a single stock
 
         Args:
             symbol: Stock symbol to analyze
+
+        Returns:
+            Analysis in the form accepted by save_stock_analyses_bulk
         """
         # Get stock analysis
         result = self.stock_scorer.score_stock(symbol)
@@ -252,20 +286,19 @@ class HistoricalDataCollector:
         except Exception as e:
             logger.debug(f"Could not fetch price/sector for {symbol}: {e}")
 
-        # Save to database
-        self.db.save_stock_analysis(
-            symbol=symbol,
-            composite_score=composite_score,
-            recommendation=recommendation,
-            confidence=confidence,
-            agent_scores=agent_scores,
-            weights=weights,
-            market_regime=market_regime,
-            price=price,
-            sector=sector
-        )
+        logger.debug(f"Analyzed {symbol}: {composite_score:.2f} ({recommendation})")
 
-        logger.debug(f"Saved analysis for {symbol}: {composite_score:.2f} ({recommendation})")
+        return {
+            'symbol': symbol,
+            'composite_score': composite_score,
+            'recommendation': recommendation,
+            'confidence': confidence,
+            'agent_scores': agent_scores,
+            'weights': weights,
+            'market_regime': market_regime,
+            'price': price,
+            'sector': sector
+        }
 
     def _cleanup_old_data(self):
         """Clean up old data based on retention policy"""
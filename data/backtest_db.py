@@ -10,17 +10,329 @@ This module provides:
 
 import sqlite3
 import json
+import os
+import time
 import uuid
-from datetime import datetime
-from typing import Dict, List, Optional
+import calendar
+import copy
+from functools import lru_cache
+from itertools import chain, islice, repeat
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence
 from dataclasses import dataclass, asdict
 import logging
+import shutil
+import threading
+import zlib
 from pathlib import Path
+from types import MappingProxyType
+
+import numpy as np
 
 from core.backtester import BacktestResult, BacktestSummary
+from core.cache_manager import LRUCache
+
+# Optional apsw backend for the long-lived read connection
+try:
+    import apsw
+    APSW_AVAILABLE = True
+except ImportError:
+    APSW_AVAILABLE = False
+
+# Optional zstd codec for stored JSON blobs (zlib is used otherwise)
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Optional columnar mirror of backtest_signals for analytics scans
+try:
+    import duckdb
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    COLUMNAR_AVAILABLE = True
+except ImportError:
+    COLUMNAR_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Bumped whenever the on-disk layout changes; stored in PRAGMA user_version
+#   1: binary run_id / integer signal date
+#   2: hot summary metrics promoted to REAL columns on backtest_runs
+#   3: summary/metadata/agent_scores written as codec-prefixed BLOBs
+#      (rows written earlier keep their JSON TEXT and still decode)
+#   4: backtest_signals.run_id cascades deletes from backtest_runs
+#   5: agent_scores moved out of backtest_signals into backtest_agent_scores
+SCHEMA_VERSION = 5
+
+# Summary metrics stored as real columns so run listings can skip the JSON blob
+SUMMARY_COLUMNS = ('hit_rate_3m', 'avg_alpha_3m', 'sharpe_ratio_3m', 'max_drawdown', 'win_rate')
+
+
+def _np_default(obj):
+    """json.dumps fallback for numpy values; native JSON types never reach it"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Leading byte of a stored JSON blob, naming how the rest is encoded
+_BLOB_RAW = 0
+_BLOB_ZLIB = 1
+_BLOB_ZSTD = 2
+
+# How long a reader waits on a locked database (sqlite3.connect's default)
+_BUSY_TIMEOUT_MS = 5000
+
+# Shorter payloads gain nothing from compression
+_COMPRESS_MIN_BYTES = 128
+
+
+def _encode_json(obj) -> bytes:
+    """Serialize obj to JSON and store it compressed when that saves space"""
+    payload = json.dumps(obj, default=_np_default).encode()
+    if len(payload) >= _COMPRESS_MIN_BYTES:
+        if ZSTD_AVAILABLE:
+            codec, compressed = _BLOB_ZSTD, zstandard.ZstdCompressor(level=3).compress(payload)
+        else:
+            codec, compressed = _BLOB_ZLIB, zlib.compress(payload, 6)
+        if len(compressed) < len(payload):
+            return bytes((codec,)) + compressed
+    return bytes((_BLOB_RAW,)) + payload
+
+
+def _json_text(value) -> str:
+    """Recover the JSON text of a stored blob (legacy rows are already TEXT)"""
+    if isinstance(value, str):
+        return value
+
+    codec, payload = value[0], memoryview(value)[1:]
+    if codec == _BLOB_ZLIB:
+        payload = zlib.decompress(payload)
+    elif codec == _BLOB_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise ImportError("zstandard is required. Install with: pip install zstandard")
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+    elif codec != _BLOB_RAW:
+        raise ValueError(f"Unknown JSON blob codec {codec}")
+    return bytes(payload).decode()
+
+
+def _decode_json(value):
+    """Deserialize a stored JSON blob"""
+    return json.loads(_json_text(value))
+
+
+def _uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUIDv7 (RFC 9562)
+
+    The leading 48 bits are the Unix time in milliseconds, so run ids saved
+    in sequence land next to each other in the backtest_runs primary key.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), 'big')
+    value = (
+        (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76                          # version
+        | (rand >> 64 & 0xFFF) << 64         # rand_a
+        | 0b10 << 62                         # variant
+        | rand & 0x3FFF_FFFF_FFFF_FFFF       # rand_b
+    )
+    return uuid.UUID(int=value)
+
+
+def _encode_run_id(run_id: str) -> bytes:
+    """Pack a UUID string into its 16-byte storage form (raises ValueError if malformed)"""
+    return uuid.UUID(run_id).bytes
+
+
+def _decode_run_id(raw: bytes) -> str:
+    """Unpack a stored 16-byte run_id back into its canonical UUID string"""
+    return str(uuid.UUID(bytes=raw))
+
+
+def _encode_date(value) -> int:
+    """Store signal dates as integer epoch seconds of their wall-clock time"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return calendar.timegm(value.timetuple())
+
+
+def _decode_date(value: int) -> str:
+    """Return a stored signal date as a naive ISO-8601 string"""
+    return datetime.fromtimestamp(value, tz=timezone.utc).replace(tzinfo=None).isoformat()
+
+
+# Signals of one run, in chronological order
+_SELECT_RUN_SIGNALS_TEMPLATE = """
+    SELECT signal_id, symbol, date, recommendation, composite_score, confidence,
+           entry_price, exit_price,
+           forward_return_1m, forward_return_3m, forward_return_6m,
+           benchmark_return_1m, benchmark_return_3m, benchmark_return_6m,
+           alpha_1m, alpha_3m, alpha_6m,
+           {agent_scores}market_regime
+    FROM backtest_signals
+    WHERE run_id = ?
+    ORDER BY date, symbol
+"""
+# agent_scores is reassembled as a JSON object from the normalized side table
+_SELECT_RUN_SIGNALS = _SELECT_RUN_SIGNALS_TEMPLATE.format(agent_scores="""(
+               SELECT json_group_object(a.name, sc.score)
+               FROM backtest_agent_scores sc
+               JOIN backtest_agents a ON a.agent_id = sc.agent_id
+               WHERE sc.signal_id = backtest_signals.signal_id
+           ) AS agent_scores, """)
+# Same query without the agent_scores JSON, for summary-only consumers
+_SELECT_RUN_SIGNALS_LITE = _SELECT_RUN_SIGNALS_TEMPLATE.format(agent_scores='NULL AS agent_scores, ')
+# Column omitted entirely, for columnar consumers
+_SELECT_RUN_SIGNALS_NO_AGENT_SCORES = _SELECT_RUN_SIGNALS_TEMPLATE.format(agent_scores='')
+
+# Rows are pulled from the cursor in chunks of this size while streaming
+_FETCH_ARRAYSIZE = 1000
+
+
+_SIGNAL_INSERT_COLUMNS = (
+    'run_id', 'symbol', 'date', 'recommendation', 'composite_score', 'confidence',
+    'entry_price', 'exit_price',
+    'forward_return_1m', 'forward_return_3m', 'forward_return_6m',
+    'benchmark_return_1m', 'benchmark_return_3m', 'benchmark_return_6m',
+    'alpha_1m', 'alpha_3m', 'alpha_6m',
+    'market_regime',
+)
+
+# Signals per multi-row INSERT; 50 x 18 params stays under the 999-variable
+# limit of older SQLite builds
+_SIGNAL_INSERT_CHUNK = 50
+
+
+# Parsed get_backtest_run results kept per database; saved runs never change,
+# so the TTL only bounds staleness from deletes made by other processes
+_RUN_CACHE_SIZE = 32
+_RUN_CACHE_TTL = 3600
+
+
+# Columns save_backtest_run_soa cannot default
+_SOA_REQUIRED_COLUMNS = ('symbol', 'date', 'recommendation', 'composite_score', 'confidence', 'entry_price')
+
+
+@lru_cache(maxsize=4)
+def _signal_insert_sql(rows: int) -> str:
+    """Multi-row INSERT for `rows` signals; cached so the SQL text stays stable per size"""
+    placeholders = '(' + ', '.join('?' * len(_SIGNAL_INSERT_COLUMNS)) + ')'
+    return (
+        f"INSERT INTO backtest_signals ({', '.join(_SIGNAL_INSERT_COLUMNS)}) VALUES "
+        + ', '.join([placeholders] * rows)
+    )
+
+
+def _signal_row(run_key: bytes, result: BacktestResult) -> tuple:
+    """Bind parameters for one signal (in _SIGNAL_INSERT_COLUMNS order) and its agent scores"""
+    return (
+        run_key,
+        result.symbol,
+        _encode_date(result.date),
+        result.recommendation,
+        result.composite_score,
+        result.confidence,
+        result.entry_price,
+        result.exit_price,
+        result.forward_return_1m,
+        result.forward_return_3m,
+        result.forward_return_6m,
+        result.benchmark_return_1m,
+        result.benchmark_return_3m,
+        result.benchmark_return_6m,
+        result.alpha_1m,
+        result.alpha_3m,
+        result.alpha_6m,
+        result.market_regime
+    ), result.agent_scores
+
+
+def _insert_agent_scores(cursor: sqlite3.Cursor, agent_ids: Dict[str, int], signal_scores):
+    """
+    Store (signal_id, {agent: score}) pairs as backtest_agent_scores rows
+
+    agent_ids caches backtest_agents name -> id and is extended with any
+    agent registered here.
+    """
+    rows = []
+    for signal_id, scores in signal_scores:
+        for name, score in scores.items():
+            agent_id = agent_ids.get(name)
+            if agent_id is None:
+                cursor.execute("INSERT OR IGNORE INTO backtest_agents (name) VALUES (?)", (name,))
+                agent_id = agent_ids[name] = cursor.execute(
+                    "SELECT agent_id FROM backtest_agents WHERE name = ?", (name,)
+                ).fetchone()[0]
+            rows.append((signal_id, agent_id, None if score is None else float(score)))
+
+    cursor.executemany(
+        "INSERT INTO backtest_agent_scores (signal_id, agent_id, score) VALUES (?, ?, ?)", rows
+    )
+
+
+def _signal_arrow_schema() -> 'pa.Schema':
+    """Arrow schema of a Parquet signal partition (mirrors _SELECT_RUN_SIGNALS)"""
+    real = pa.float64()
+    return pa.schema([
+        ('signal_id', pa.int64()),
+        ('symbol', pa.string()),
+        ('date', pa.int64()),
+        ('recommendation', pa.string()),
+        ('composite_score', real),
+        ('confidence', real),
+        ('entry_price', real),
+        ('exit_price', real),
+        ('forward_return_1m', real),
+        ('forward_return_3m', real),
+        ('forward_return_6m', real),
+        ('benchmark_return_1m', real),
+        ('benchmark_return_3m', real),
+        ('benchmark_return_6m', real),
+        ('alpha_1m', real),
+        ('alpha_3m', real),
+        ('alpha_6m', real),
+        ('agent_scores', pa.string()),
+        ('market_regime', pa.string()),
+    ])
+
+
+def _signal_from_row(signal: Dict) -> Dict:
+    """Decode the stored columns of a backtest_signals row dict in place"""
+    signal['date'] = _decode_date(signal['date'])
+    if signal['agent_scores'] is not None:
+        signal['agent_scores'] = _decode_json(signal['agent_scores'])
+    return signal
+
+
+def _freeze(value):
+    """Read-only view of a decoded JSON value: dicts at any depth become proxies"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+
+def _copy_run(run: Dict) -> Dict:
+    """
+    Copy of a cached run that callers may modify
+
+    The run dict and its small containers are copied; the signals list is
+    copied too, but the signals in it are shared read-only views, so a
+    cache hit costs a list copy rather than a deep copy of every signal.
+    """
+    return {
+        **run,
+        'symbols': list(run['symbols']),
+        'summary': copy.deepcopy(run['summary']),
+        'metadata': copy.deepcopy(run['metadata']),
+        'signals': list(run['signals']),
+    }
+
 
 @dataclass
 class BacktestRun:
@@ -46,14 +358,27 @@ class BacktestDatabase:
         run_id = db.save_backtest_run(name, results, summary, analysis)
         run = db.get_backtest_run(run_id)
         all_runs = db.list_backtest_runs()
+
+    When constructed with columnar_dir (and duckdb/pyarrow are installed),
+    every run's signals are also written as a Parquet partition
+    (columnar_dir/run_id=<uuid>/signals.parquet) and cross-run scans such
+    as get_signals_by_symbol are answered by DuckDB over that dataset.
+    SQLite remains the source of truth.
+
+    The database runs in WAL mode with long-lived connections: a writer
+    serialized by a lock for saves and deletes, and one read-only reader
+    per thread, so reads never wait on a running save or on each other
+    (apsw connections cannot be used from two threads at once). Call
+    close() to release them.
     """
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, columnar_dir: Optional[str] = None):
         """
         Initialize database connection
 
         Args:
             db_path: Path to SQLite database file (default: data/backtest_history.db)
+            columnar_dir: Directory for the optional Parquet signal store
         """
         if db_path is None:
             # Default to data directory in project root
@@ -64,17 +389,150 @@ class BacktestDatabase:
 
         self.db_path = db_path
         self._create_tables()
+
+        self._write_lock = threading.Lock()
+        self._writer = self._connect(readonly=False)
+        # thread -> that thread's read-only connection
+        self._readers: Dict[threading.Thread, object] = {}
+        self._readers_lock = threading.Lock()
+        self._run_cache = LRUCache(max_size=_RUN_CACHE_SIZE, default_ttl=_RUN_CACHE_TTL)
+        # run_key -> number of deletes; a read only caches its result if no
+        # delete of that run committed while it was running
+        self._run_generations: Dict[bytes, int] = {}
+        self._run_cache_lock = threading.Lock()
+        # backtest_agents name -> id, only touched under the write lock
+        self._agent_ids: Dict[str, int] = {}
+
+        self.columnar_dir: Optional[Path] = None
+        if columnar_dir is not None:
+            if COLUMNAR_AVAILABLE:
+                self.columnar_dir = Path(columnar_dir)
+                self.columnar_dir.mkdir(parents=True, exist_ok=True)
+                self.sync_columnar_store()
+            else:
+                logger.warning("duckdb/pyarrow not installed - columnar signal store disabled")
+
         logger.info(f"BacktestDatabase initialized at {db_path}")
 
+    def _connect(self, readonly: bool = False):
+        """
+        Open a long-lived connection
+
+        The writer is shared across threads under the write lock; each
+        thread gets its own reader from _get_reader(), which close() may
+        close from another thread.
+
+        The read-only connection is an apsw connection when apsw is
+        installed, so its prepared statements persist in the statement
+        cache; otherwise both are sqlite3 connections whose rows support
+        access by column name.
+        """
+        if readonly and APSW_AVAILABLE:
+            conn = apsw.Connection(self.db_path, flags=apsw.SQLITE_OPEN_READONLY)
+            # apsw has no busy timeout by default; match sqlite3's 5s so readers
+            # opening while the WAL index is being rebuilt wait instead of failing
+            conn.setbusytimeout(_BUSY_TIMEOUT_MS)
+            return conn
+
+        if readonly:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            # Deleting a run cascades to its signals
+            conn.execute("PRAGMA foreign_keys = ON")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def close(self):
+        """Close the reader and writer connections"""
+        with self._write_lock:
+            self._writer.close()
+        with self._readers_lock:
+            readers, self._readers = list(self._readers.values()), {}
+        for reader in readers:
+            reader.close()
+
+    def _get_reader(self):
+        """
+        Return the calling thread's read-only connection, opening it on first use
+
+        Connections left behind by threads that have exited are closed
+        whenever a new one is opened.
+        """
+        # Keyed by Thread object, not ident: idents are reused, so a new
+        # thread could pick up a reader that is being closed as stale
+        current = threading.current_thread()
+        reader = self._readers.get(current)
+        if reader is not None:
+            return reader
+
+        reader = self._connect(readonly=True)
+        with self._readers_lock:
+            stale = [thread for thread in self._readers if not thread.is_alive()]
+            for thread in stale:
+                self._readers.pop(thread).close()
+            self._readers[current] = reader
+        return reader
+
+    def _fetch(self, sql: str, params: tuple = ()) -> Iterator[Dict]:
+        """
+        Run a read query on this thread's reader, yielding each row as a dict
+
+        apsw readers prepare with SQLITE_PREPARE_PERSISTENT.
+        """
+        reader = self._get_reader()
+        if isinstance(reader, sqlite3.Connection):
+            cursor = reader.cursor()
+            cursor.arraysize = _FETCH_ARRAYSIZE
+            for row in cursor.execute(sql, params):
+                yield dict(row)
+            return
+
+        cursor = reader.cursor()
+        names = None
+        for row in cursor.execute(sql, params, prepare_flags=apsw.SQLITE_PREPARE_PERSISTENT):
+            if names is None:
+                names = [column[0] for column in cursor.get_description()]
+            yield dict(zip(names, row, strict=True))
+
     def _create_tables(self):
-        """Create database schema if not exists"""
+        """Create database schema if not exists, migrating legacy layouts"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
-        # Backtest runs table
+        # WAL lets the reader connection run while the writer holds a transaction
+        cursor.execute("PRAGMA journal_mode=WAL")
+
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        existing = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'backtest_runs'"
+        ).fetchone() is not None
+        legacy = existing and version < 1
+        # Signal tables from before the cascade foreign key and the agent
+        # score side table (v1-v4, which still carry agent_scores) cannot be
+        # altered in place, so they are rebuilt
+        rebuild_signals = existing and not legacy and 'agent_scores' in {
+            row[1] for row in cursor.execute("PRAGMA table_info(backtest_signals)")
+        }
+
+        if legacy:
+            # Move the TEXT-keyed tables aside; their indexes keep their names,
+            # so drop them before the new tables claim the same index names
+            cursor.execute("ALTER TABLE backtest_signals RENAME TO backtest_signals_legacy")
+            cursor.execute("ALTER TABLE backtest_runs RENAME TO backtest_runs_legacy")
+            for index in ('idx_signals_run_id', 'idx_signals_symbol',
+                          'idx_signals_date', 'idx_runs_created_at'):
+                cursor.execute(f"DROP INDEX IF EXISTS {index}")
+        elif rebuild_signals:
+            cursor.execute("ALTER TABLE backtest_signals RENAME TO backtest_signals_old")
+            for index in ('idx_signals_run_id', 'idx_signals_symbol', 'idx_signals_date'):
+                cursor.execute(f"DROP INDEX IF EXISTS {index}")
+
+        # Backtest runs table (run_id is the 16-byte UUID)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS backtest_runs (
-                run_id TEXT PRIMARY KEY,
+                run_id BLOB PRIMARY KEY,
                 name TEXT NOT NULL,
                 start_date TEXT NOT NULL,
                 end_date TEXT NOT NULL,
@@ -82,18 +540,23 @@ class BacktestDatabase:
                 frequency TEXT NOT NULL,
                 created_at TEXT NOT NULL,
                 total_signals INTEGER NOT NULL,
-                summary TEXT NOT NULL,  -- JSON
-                metadata TEXT  -- JSON
+                summary BLOB NOT NULL,  -- encoded JSON (see _encode_json)
+                metadata BLOB,  -- encoded JSON
+                hit_rate_3m REAL,
+                avg_alpha_3m REAL,
+                sharpe_ratio_3m REAL,
+                max_drawdown REAL,
+                win_rate REAL
             )
         """)
 
-        # Individual backtest signals table
+        # Individual backtest signals table (date is epoch seconds)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS backtest_signals (
                 signal_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                run_id TEXT NOT NULL,
+                run_id BLOB NOT NULL,
                 symbol TEXT NOT NULL,
-                date TEXT NOT NULL,
+                date INTEGER NOT NULL,
                 recommendation TEXT NOT NULL,
                 composite_score REAL NOT NULL,
                 confidence REAL NOT NULL,
@@ -108,12 +571,31 @@ class BacktestDatabase:
                 alpha_1m REAL,
                 alpha_3m REAL,
                 alpha_6m REAL,
-                agent_scores TEXT NOT NULL,  -- JSON
                 market_regime TEXT,
-                FOREIGN KEY (run_id) REFERENCES backtest_runs(run_id)
+                FOREIGN KEY (run_id) REFERENCES backtest_runs(run_id) ON DELETE CASCADE
+            )
+        """)
+
+        # Agent names, so score rows carry a small integer id
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS backtest_agents (
+                agent_id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
             )
         """)
 
+        # One row per signal per agent, clustered by signal for run reads
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS backtest_agent_scores (
+                signal_id INTEGER NOT NULL,
+                agent_id INTEGER NOT NULL,
+                score REAL,
+                PRIMARY KEY (signal_id, agent_id),
+                FOREIGN KEY (signal_id) REFERENCES backtest_signals(signal_id) ON DELETE CASCADE,
+                FOREIGN KEY (agent_id) REFERENCES backtest_agents(agent_id)
+            ) WITHOUT ROWID
+        """)
+
         # Create indexes for common queries
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_signals_run_id
@@ -130,11 +612,106 @@ class BacktestDatabase:
             ON backtest_signals(date)
         """)
 
+        # Covers per-agent aggregates without touching the signals
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_agent_scores_agent
+            ON backtest_agent_scores(agent_id, score)
+        """)
+
+        # Lets list_backtest_runs walk the index backward and stop at LIMIT
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_runs_created_at
+            ON backtest_runs(created_at DESC)
+        """)
+
+        if legacy:
+            self._migrate_legacy_tables(conn)
+        elif rebuild_signals:
+            columns = ', '.join(('signal_id',) + _SIGNAL_INSERT_COLUMNS)
+            cursor.execute(
+                f"INSERT INTO backtest_signals ({columns}) SELECT {columns} FROM backtest_signals_old"
+            )
+            self._move_agent_scores(cursor, 'backtest_signals_old')
+            cursor.execute("DROP TABLE backtest_signals_old")
+            logger.info("Rebuilt backtest_signals with ON DELETE CASCADE and normalized agent scores")
+
+        if existing and version < 2:
+            self._backfill_summary_columns(cursor)
+
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
         conn.commit()
         conn.close()
 
         logger.info("Database schema initialized")
 
+    def _backfill_summary_columns(self, cursor: sqlite3.Cursor):
+        """Add the promoted summary columns if missing and fill them from the JSON blob"""
+        present = {row[1] for row in cursor.execute("PRAGMA table_info(backtest_runs)")}
+        for column in SUMMARY_COLUMNS:
+            if column not in present:
+                cursor.execute(f"ALTER TABLE backtest_runs ADD COLUMN {column} REAL")
+
+        # Decoded in Python since summary may be an encoded BLOB, not JSON text
+        assignments = ', '.join(f"{column} = ?" for column in SUMMARY_COLUMNS)
+        updates = []
+        for run_key, blob in cursor.execute("SELECT run_id, summary FROM backtest_runs").fetchall():
+            summary = _decode_json(blob)
+            updates.append(tuple(summary.get(column) for column in SUMMARY_COLUMNS) + (run_key,))
+        cursor.executemany(f"UPDATE backtest_runs SET {assignments} WHERE run_id = ?", updates)
+        logger.info("Backfilled backtest_runs summary columns")
+
+    def _move_agent_scores(self, cursor: sqlite3.Cursor, source_table: str):
+        """Copy per-signal agent_scores JSON from an old signals table into backtest_agent_scores"""
+        _insert_agent_scores(cursor, {}, (
+            (signal_id, _decode_json(blob))
+            for signal_id, blob in cursor.execute(
+                f"SELECT signal_id, agent_scores FROM {source_table}"
+            ).fetchall()
+        ))
+
+    def _migrate_legacy_tables(self, conn: sqlite3.Connection):
+        """Copy rows from the TEXT-keyed legacy tables into the current schema"""
+        conn.executemany("""
+            INSERT INTO backtest_runs
+            (run_id, name, start_date, end_date, symbols, frequency, created_at, total_signals, summary, metadata)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            (_encode_run_id(row[0]),) + row[1:]
+            for row in conn.execute("""
+                SELECT run_id, name, start_date, end_date, symbols, frequency,
+                       created_at, total_signals, summary, metadata
+                FROM backtest_runs_legacy
+            """)
+        ))
+
+        conn.executemany("""
+            INSERT INTO backtest_signals
+            (signal_id, run_id, symbol, date, recommendation, composite_score, confidence,
+             entry_price, exit_price,
+             forward_return_1m, forward_return_3m, forward_return_6m,
+             benchmark_return_1m, benchmark_return_3m, benchmark_return_6m,
+             alpha_1m, alpha_3m, alpha_6m,
+             market_regime)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            (row[0], _encode_run_id(row[1]), row[2], _encode_date(row[3])) + row[4:]
+            for row in conn.execute("""
+                SELECT signal_id, run_id, symbol, date, recommendation, composite_score, confidence,
+                       entry_price, exit_price,
+                       forward_return_1m, forward_return_3m, forward_return_6m,
+                       benchmark_return_1m, benchmark_return_3m, benchmark_return_6m,
+                       alpha_1m, alpha_3m, alpha_6m,
+                       market_regime
+                FROM backtest_signals_legacy
+            """)
+        ))
+        self._move_agent_scores(conn.cursor(), 'backtest_signals_legacy')
+
+        conn.execute("DROP TABLE backtest_signals_legacy")
+        conn.execute("DROP TABLE backtest_runs_legacy")
+        logger.info("Migrated legacy backtest tables to binary run_id / integer date storage")
+
     def save_backtest_run(
         self,
         name: str,
@@ -162,25 +739,103 @@ class BacktestDatabase:
         Returns:
             run_id: UUID for the saved run
         """
-        run_id = str(uuid.uuid4())
-        created_at = datetime.now().isoformat()
+        run_uuid = _uuid7()
+        rows = (_signal_row(run_uuid.bytes, result) for result in results)
+        return self._save_run(
+            run_uuid, name, rows, len(results), summary,
+            start_date, end_date, symbols, frequency, metadata
+        )
+
+    def save_backtest_run_soa(
+        self,
+        name: str,
+        signals: Dict[str, Sequence],
+        summary: BacktestSummary,
+        start_date: datetime,
+        end_date: datetime,
+        symbols: List[str],
+        frequency: str = 'monthly',
+        metadata: Optional[Dict] = None
+    ) -> str:
+        """
+        Save a backtest run whose signals are held column-wise
 
-        # Convert summary to dict (with numpy type conversion)
-        def convert_to_python_type(obj):
-            """Convert numpy types to Python types for JSON serialization"""
-            import numpy as np
-            if isinstance(obj, (np.int64, np.int32, np.int16, np.int8)):
-                return int(obj)
-            elif isinstance(obj, (np.float64, np.float32, np.float16)):
-                return float(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, dict):
-                return {k: convert_to_python_type(v) for k, v in obj.items()}
-            elif isinstance(obj, (list, tuple)):
-                return [convert_to_python_type(item) for item in obj]
-            return obj
+        Equivalent to save_backtest_run, but takes one array (numpy array,
+        pandas Series or list) per BacktestResult field instead of a list of
+        objects. Numeric columns are converted with a single tolist() each,
+        so no per-signal attribute access happens in Python.
+
+        Args:
+            name: Human-readable name for the run
+            signals: Column name -> values, keyed by BacktestResult field names.
+                symbol, date, recommendation, composite_score, confidence and
+                entry_price are required; other columns default to NULL
+                (agent_scores to {}). NaN values are stored as NULL. date
+                may be datetime64 or datetime/ISO string values.
+            summary: BacktestSummary object
+            start_date: Backtest start date
+            end_date: Backtest end date
+            symbols: List of symbols tested
+            frequency: Rebalance frequency
+            metadata: Additional metadata (config, params, etc.)
+
+        Returns:
+            run_id: UUID for the saved run
+        """
+        missing = [column for column in _SOA_REQUIRED_COLUMNS if column not in signals]
+        if missing:
+            raise ValueError(f"Missing signal columns: {', '.join(missing)}")
+
+        total = len(signals['symbol'])
+        if any(len(values) != total for values in signals.values()):
+            raise ValueError("All signal columns must have the same length")
+
+        columns = []
+        for column in _SIGNAL_INSERT_COLUMNS[1:]:
+            if column not in signals:
+                columns.append(repeat(None, total))
+                continue
+
+            values = np.asarray(signals[column])
+            if column == 'date':
+                if np.issubdtype(values.dtype, np.datetime64):
+                    columns.append(values.astype('datetime64[s]').astype(np.int64).tolist())
+                else:
+                    columns.append([_encode_date(value) for value in values.tolist()])
+            else:
+                columns.append(values.tolist())
 
+        agent_scores = signals['agent_scores'] if 'agent_scores' in signals else repeat({}, total)
+
+        run_uuid = _uuid7()
+        rows = zip(zip(repeat(run_uuid.bytes, total), *columns, strict=True), agent_scores, strict=True)
+        return self._save_run(
+            run_uuid, name, rows, total, summary,
+            start_date, end_date, symbols, frequency, metadata
+        )
+
+    def _save_run(
+        self,
+        run_uuid: uuid.UUID,
+        name: str,
+        signal_rows: Iterator[tuple],
+        total_signals: int,
+        summary: BacktestSummary,
+        start_date: datetime,
+        end_date: datetime,
+        symbols: List[str],
+        frequency: str,
+        metadata: Optional[Dict]
+    ) -> str:
+        """
+        Insert a run row and its signals in one transaction
+
+        signal_rows yields (row in _SIGNAL_INSERT_COLUMNS order, agent_scores) pairs.
+        """
+        run_id = str(run_uuid)
+        created_at = datetime.now().isoformat()
+
+        # numpy values nested in the breakdowns are coerced by _np_default at dump time
         summary_dict = {
             'total_signals': int(summary.total_signals),
             'total_buys': int(summary.total_buys),
@@ -202,206 +857,193 @@ class BacktestDatabase:
             'avg_win': float(summary.avg_win),
             'avg_loss': float(summary.avg_loss),
             'win_loss_ratio': float(summary.win_loss_ratio),
-            'performance_by_recommendation': convert_to_python_type(summary.performance_by_recommendation),
-            'agent_correlations': convert_to_python_type(summary.agent_correlations),
-            'performance_by_regime': convert_to_python_type(summary.performance_by_regime)
+            'performance_by_recommendation': summary.performance_by_recommendation,
+            'agent_correlations': summary.agent_correlations,
+            'performance_by_regime': summary.performance_by_regime
         }
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._write_lock:
+            conn = self._writer
+            cursor = conn.cursor()
 
-        try:
-            # Insert backtest run
-            cursor.execute("""
-                INSERT INTO backtest_runs
-                (run_id, name, start_date, end_date, symbols, frequency, created_at, total_signals, summary, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                run_id,
-                name,
-                start_date.isoformat(),
-                end_date.isoformat(),
-                json.dumps(symbols),
-                frequency,
-                created_at,
-                len(results),
-                json.dumps(summary_dict),
-                json.dumps(metadata or {})
-            ))
-
-            # Insert individual signals
-            for result in results:
+            try:
+                # Insert backtest run
                 cursor.execute("""
-                    INSERT INTO backtest_signals
-                    (run_id, symbol, date, recommendation, composite_score, confidence,
-                     entry_price, exit_price,
-                     forward_return_1m, forward_return_3m, forward_return_6m,
-                     benchmark_return_1m, benchmark_return_3m, benchmark_return_6m,
-                     alpha_1m, alpha_3m, alpha_6m,
-                     agent_scores, market_regime)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT INTO backtest_runs
+                    (run_id, name, start_date, end_date, symbols, frequency, created_at, total_signals, summary, metadata,
+                     hit_rate_3m, avg_alpha_3m, sharpe_ratio_3m, max_drawdown, win_rate)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
-                    run_id,
-                    result.symbol,
-                    result.date.isoformat(),
-                    result.recommendation,
-                    result.composite_score,
-                    result.confidence,
-                    result.entry_price,
-                    result.exit_price,
-                    result.forward_return_1m,
-                    result.forward_return_3m,
-                    result.forward_return_6m,
-                    result.benchmark_return_1m,
-                    result.benchmark_return_3m,
-                    result.benchmark_return_6m,
-                    result.alpha_1m,
-                    result.alpha_3m,
-                    result.alpha_6m,
-                    json.dumps(result.agent_scores),
-                    result.market_regime
+                    run_uuid.bytes,
+                    name,
+                    start_date.isoformat(),
+                    end_date.isoformat(),
+                    json.dumps(symbols),
+                    frequency,
+                    created_at,
+                    total_signals,
+                    _encode_json(summary_dict),
+                    _encode_json(metadata or {}),
+                    *(summary_dict[column] for column in SUMMARY_COLUMNS)
                 ))
 
-            conn.commit()
-            logger.info(f"Saved backtest run {run_id} with {len(results)} signals")
-            return run_id
-
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Failed to save backtest run: {e}")
-            raise
-        finally:
-            conn.close()
-
-    def get_backtest_run(self, run_id: str) -> Optional[Dict]:
+                # Insert individual signals, many rows per statement
+                while True:
+                    chunk = list(islice(signal_rows, _SIGNAL_INSERT_CHUNK))
+                    if not chunk:
+                        break
+                    cursor.execute(
+                        _signal_insert_sql(len(chunk)),
+                        tuple(chain.from_iterable(row for row, _ in chunk))
+                    )
+                    # One multi-row INSERT under the write lock takes consecutive
+                    # AUTOINCREMENT ids ending at lastrowid
+                    first_id = cursor.lastrowid - len(chunk) + 1
+                    _insert_agent_scores(cursor, self._agent_ids, (
+                        (first_id + offset, scores) for offset, (_, scores) in enumerate(chunk)
+                    ))
+
+                if self.columnar_dir is not None:
+                    self._write_signal_partition(conn, run_id)
+
+                conn.commit()
+                logger.info(f"Saved backtest run {run_id} with {total_signals} signals")
+                return run_id
+
+            except Exception as e:
+                conn.rollback()
+                # Agents registered by this save were rolled back with it
+                self._agent_ids.clear()
+                logger.error(f"Failed to save backtest run: {e}")
+                raise
+
+    def get_backtest_run(self, run_id: str, include_agent_scores: bool = True) -> Optional[Dict]:
         """
         Retrieve a complete backtest run by ID
 
         Args:
             run_id: UUID of the run
+            include_agent_scores: If False, skip reading and parsing each
+                signal's agent_scores JSON (the key is set to None)
 
         Returns:
-            Dict with run metadata, summary, and results
+            Dict with run metadata, summary, and results. Runs are cached
+            after the first read; callers get their own copy of the run,
+            but its signals are read-only mappings shared with the cache.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        try:
+            run_key = _encode_run_id(run_id)
+        except ValueError:
+            logger.warning(f"Backtest run {run_id} not found")
+            return None
+
+        cache_key = f"{run_key.hex()}:{include_agent_scores}"
+        cached = self._run_cache.get(cache_key)
+        if cached is not None:
+            return _copy_run(cached)
+
+        # Taken before the query so a delete committing mid-read is noticed
+        generation = self._run_generations.get(run_key, 0)
 
         try:
             # Get run metadata
-            cursor.execute("""
+            rows = list(self._fetch("""
                 SELECT run_id, name, start_date, end_date, symbols, frequency,
                        created_at, total_signals, summary, metadata
                 FROM backtest_runs
                 WHERE run_id = ?
-            """, (run_id,))
+            """, (run_key,)))
 
-            row = cursor.fetchone()
-            if not row:
+            if not rows:
                 logger.warning(f"Backtest run {run_id} not found")
                 return None
 
-            run_data = {
-                'run_id': row[0],
-                'name': row[1],
-                'start_date': row[2],
-                'end_date': row[3],
-                'symbols': json.loads(row[4]),
-                'frequency': row[5],
-                'created_at': row[6],
-                'total_signals': row[7],
-                'summary': json.loads(row[8]),
-                'metadata': json.loads(row[9]) if row[9] else {}
-            }
-
-            # Get all signals for this run
-            cursor.execute("""
-                SELECT signal_id, symbol, date, recommendation, composite_score, confidence,
-                       entry_price, exit_price,
-                       forward_return_1m, forward_return_3m, forward_return_6m,
-                       benchmark_return_1m, benchmark_return_3m, benchmark_return_6m,
-                       alpha_1m, alpha_3m, alpha_6m,
-                       agent_scores, market_regime
-                FROM backtest_signals
-                WHERE run_id = ?
-                ORDER BY date, symbol
-            """, (run_id,))
-
-            signals = []
-            for row in cursor.fetchall():
-                signals.append({
-                    'signal_id': row[0],
-                    'symbol': row[1],
-                    'date': row[2],
-                    'recommendation': row[3],
-                    'composite_score': row[4],
-                    'confidence': row[5],
-                    'entry_price': row[6],
-                    'exit_price': row[7],
-                    'forward_return_1m': row[8],
-                    'forward_return_3m': row[9],
-                    'forward_return_6m': row[10],
-                    'benchmark_return_1m': row[11],
-                    'benchmark_return_3m': row[12],
-                    'benchmark_return_6m': row[13],
-                    'alpha_1m': row[14],
-                    'alpha_3m': row[15],
-                    'alpha_6m': row[16],
-                    'agent_scores': json.loads(row[17]),
-                    'market_regime': row[18]
-                })
-
-            run_data['signals'] = signals
-            return run_data
+            run_data = rows[0]
+            run_data['run_id'] = run_id
+            run_data['symbols'] = json.loads(run_data['symbols'])
+            run_data['summary'] = _decode_json(run_data['summary'])
+            run_data['metadata'] = _decode_json(run_data['metadata']) if run_data['metadata'] else {}
+
+            # Get all signals for this run, streamed straight off the cursor
+            sql = _SELECT_RUN_SIGNALS if include_agent_scores else _SELECT_RUN_SIGNALS_LITE
+            run_data['signals'] = [
+                _freeze(_signal_from_row(row)) for row in self._fetch(sql, (run_key,))
+            ]
+            with self._run_cache_lock:
+                if self._run_generations.get(run_key, 0) == generation:
+                    self._run_cache.set(cache_key, run_data)
+            return _copy_run(run_data)
 
         except Exception as e:
             logger.error(f"Failed to retrieve backtest run {run_id}: {e}")
             return None
-        finally:
-            conn.close()
 
-    def list_backtest_runs(self, limit: int = 100) -> List[Dict]:
+    def iter_backtest_signals(
+        self,
+        run_id: str,
+        include_agent_scores: bool = True
+    ) -> Iterator[Dict]:
+        """
+        Stream the signals of a backtest run without materializing them all
+
+        Intended for very large runs where get_backtest_run would hold every
+        signal dict in memory at once.
+
+        Args:
+            run_id: UUID of the run
+            include_agent_scores: If False, agent_scores is not read (set to None)
+
+        Yields:
+            Signal dicts in (date, symbol) order
+        """
+        try:
+            run_key = _encode_run_id(run_id)
+        except ValueError:
+            logger.warning(f"Backtest run {run_id} not found")
+            return
+
+        sql = _SELECT_RUN_SIGNALS if include_agent_scores else _SELECT_RUN_SIGNALS_LITE
+        for row in self._fetch(sql, (run_key,)):
+            yield _signal_from_row(row)
+
+    def list_backtest_runs(self, limit: int = 100, include_full_summary: bool = True) -> List[Dict]:
         """
         List all backtest runs (summary only)
 
         Args:
             limit: Maximum number of runs to return
+            include_full_summary: If False, 'summary' holds only the promoted
+                SUMMARY_COLUMNS read straight from their REAL columns, and the
+                JSON summary blob is never loaded or parsed
 
         Returns:
             List of run summaries (without individual signals)
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
         try:
-            cursor.execute("""
+            summary_columns = 'summary' if include_full_summary else ', '.join(SUMMARY_COLUMNS)
+            rows = self._fetch(f"""
                 SELECT run_id, name, start_date, end_date, symbols, frequency,
-                       created_at, total_signals, summary
-                FROM backtest_runs
+                       created_at, total_signals, {summary_columns}
+                FROM backtest_runs INDEXED BY idx_runs_created_at
                 ORDER BY created_at DESC
                 LIMIT ?
             """, (limit,))
 
             runs = []
-            for row in cursor.fetchall():
-                runs.append({
-                    'run_id': row[0],
-                    'name': row[1],
-                    'start_date': row[2],
-                    'end_date': row[3],
-                    'symbols': json.loads(row[4]),
-                    'frequency': row[5],
-                    'created_at': row[6],
-                    'total_signals': row[7],
-                    'summary': json.loads(row[8])
-                })
+            for run in rows:
+                run['run_id'] = _decode_run_id(run['run_id'])
+                run['symbols'] = json.loads(run['symbols'])
+                if include_full_summary:
+                    run['summary'] = _decode_json(run['summary'])
+                else:
+                    run['summary'] = {column: run.pop(column) for column in SUMMARY_COLUMNS}
+                runs.append(run)
 
             return runs
 
         except Exception as e:
             logger.error(f"Failed to list backtest runs: {e}")
             return []
-        finally:
-            conn.close()
 
     def delete_backtest_run(self, run_id: str) -> bool:
         """
@@ -413,32 +1055,43 @@ class BacktestDatabase:
         Returns:
             True if deleted, False otherwise
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
         try:
-            # Delete signals first (foreign key)
-            cursor.execute("DELETE FROM backtest_signals WHERE run_id = ?", (run_id,))
-
-            # Delete run
-            cursor.execute("DELETE FROM backtest_runs WHERE run_id = ?", (run_id,))
-
-            conn.commit()
+            run_key = _encode_run_id(run_id)
+        except ValueError:
+            logger.warning(f"Backtest run {run_id} not found")
+            return False
 
-            if cursor.rowcount > 0:
-                logger.info(f"Deleted backtest run {run_id}")
-                return True
-            else:
-                logger.warning(f"Backtest run {run_id} not found")
+        with self._write_lock:
+            conn = self._writer
+            cursor = conn.cursor()
+
+            try:
+                # Signals go with the run via ON DELETE CASCADE
+                cursor.execute("DELETE FROM backtest_runs WHERE run_id = ?", (run_key,))
+
+                conn.commit()
+
+                # Bumping the generation stops reads that began before the
+                # commit from caching the deleted run again
+                with self._run_cache_lock:
+                    self._run_generations[run_key] = self._run_generations.get(run_key, 0) + 1
+                    for include_agent_scores in (True, False):
+                        self._run_cache.delete(f"{run_key.hex()}:{include_agent_scores}")
+
+                if cursor.rowcount > 0:
+                    if self.columnar_dir is not None:
+                        shutil.rmtree(self._partition_dir(run_id), ignore_errors=True)
+                    logger.info(f"Deleted backtest run {run_id}")
+                    return True
+                else:
+                    logger.warning(f"Backtest run {run_id} not found")
+                    return False
+
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Failed to delete backtest run {run_id}: {e}")
                 return False
 
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Failed to delete backtest run {run_id}: {e}")
-            return False
-        finally:
-            conn.close()
-
     def get_signals_by_symbol(self, symbol: str, limit: int = 100) -> List[Dict]:
         """
         Get all historical backtest signals for a specific symbol
@@ -450,12 +1103,15 @@ class BacktestDatabase:
         Returns:
             List of signals across all backtest runs
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        if self.columnar_dir is not None:
+            try:
+                return self._get_signals_by_symbol_columnar(symbol, limit)
+            except Exception as e:
+                logger.error(f"Columnar signal scan failed for {symbol}, using SQLite: {e}")
 
         try:
-            cursor.execute("""
-                SELECT s.signal_id, s.run_id, r.name, s.symbol, s.date,
+            rows = self._fetch("""
+                SELECT s.signal_id, s.run_id, r.name AS run_name, s.symbol, s.date,
                        s.recommendation, s.composite_score, s.confidence,
                        s.alpha_3m, s.forward_return_3m
                 FROM backtest_signals s
@@ -466,27 +1122,199 @@ class BacktestDatabase:
             """, (symbol, limit))
 
             signals = []
-            for row in cursor.fetchall():
-                signals.append({
-                    'signal_id': row[0],
-                    'run_id': row[1],
-                    'run_name': row[2],
-                    'symbol': row[3],
-                    'date': row[4],
-                    'recommendation': row[5],
-                    'composite_score': row[6],
-                    'confidence': row[7],
-                    'alpha_3m': row[8],
-                    'forward_return_3m': row[9]
-                })
+            for signal in rows:
+                signal['run_id'] = _decode_run_id(signal['run_id'])
+                signal['date'] = _decode_date(signal['date'])
+                signals.append(signal)
 
             return signals
 
         except Exception as e:
             logger.error(f"Failed to get signals for {symbol}: {e}")
             return []
-        finally:
-            conn.close()
+
+    def get_agent_score_averages(self, run_id: Optional[str] = None) -> Dict[str, float]:
+        """
+        Average score per agent, read from the normalized agent score table
+
+        Args:
+            run_id: Restrict to one run's signals (default: all runs)
+
+        Returns:
+            Dict mapping agent name to its mean score
+        """
+        if run_id is None:
+            # Served entirely from idx_agent_scores_agent
+            sql = """
+                SELECT a.name, AVG(sc.score) AS avg_score
+                FROM backtest_agent_scores sc
+                JOIN backtest_agents a ON a.agent_id = sc.agent_id
+                GROUP BY sc.agent_id
+            """
+            params = ()
+        else:
+            try:
+                params = (_encode_run_id(run_id),)
+            except ValueError:
+                logger.warning(f"Backtest run {run_id} not found")
+                return {}
+            sql = """
+                SELECT a.name, AVG(sc.score) AS avg_score
+                FROM backtest_signals s
+                JOIN backtest_agent_scores sc ON sc.signal_id = s.signal_id
+                JOIN backtest_agents a ON a.agent_id = sc.agent_id
+                WHERE s.run_id = ?
+                GROUP BY sc.agent_id
+            """
+
+        try:
+            return {row['name']: row['avg_score'] for row in self._fetch(sql, params)}
+        except Exception as e:
+            logger.error(f"Failed to get agent score averages: {e}")
+            return {}
+
+    # ========================================================================
+    # Columnar signal store (optional, requires duckdb + pyarrow)
+    # ========================================================================
+
+    def _partition_dir(self, run_id: str) -> Path:
+        """Hive-style partition directory holding one run's signals"""
+        return self.columnar_dir / f"run_id={run_id}"
+
+    def _write_signal_partition(self, conn: sqlite3.Connection, run_id: str):
+        """Write a run's signals from SQLite to its Parquet partition"""
+        cursor = conn.execute(_SELECT_RUN_SIGNALS, (_encode_run_id(run_id),))
+        table = pa.Table.from_pylist([dict(row) for row in cursor], schema=_signal_arrow_schema())
+
+        partition = self._partition_dir(run_id)
+        partition.mkdir(parents=True, exist_ok=True)
+        # Write then rename so readers never see a half-written file
+        tmp_path = partition / 'signals.parquet.tmp'
+        pq.write_table(table, tmp_path)
+        tmp_path.replace(partition / 'signals.parquet')
+
+    def sync_columnar_store(self):
+        """
+        Bring the Parquet signal store in line with SQLite
+
+        Writes partitions for runs that have none (e.g. saved before the
+        store was enabled) and removes partitions of deleted runs.
+        """
+        if self.columnar_dir is None:
+            return
+
+        with self._write_lock:
+            conn = self._writer
+            run_ids = {_decode_run_id(row[0]) for row in conn.execute("SELECT run_id FROM backtest_runs")}
+            on_disk = {
+                path.parent.name.split('=', 1)[1]
+                for path in self.columnar_dir.glob('run_id=*/signals.parquet')
+            }
+
+            for run_id in run_ids - on_disk:
+                self._write_signal_partition(conn, run_id)
+            for run_id in on_disk - run_ids:
+                shutil.rmtree(self._partition_dir(run_id), ignore_errors=True)
+
+            if run_ids != on_disk:
+                logger.info(
+                    f"Synced columnar signal store: {len(run_ids - on_disk)} written, "
+                    f"{len(on_disk - run_ids)} removed"
+                )
+
+    def get_signals_arrow(
+        self,
+        run_id: str,
+        include_agent_scores: bool = True
+    ) -> Optional['pa.Table']:
+        """
+        Get a run's signals as a columnar Arrow table
+
+        Columns follow get_backtest_run's signal dicts, except that 'date' is
+        an Arrow timestamp[s] and 'agent_scores' stays a JSON string. Reads
+        the run's Parquet partition when the columnar store is enabled,
+        otherwise builds the columns directly from SQLite tuples without
+        creating a Python dict per row.
+
+        Args:
+            run_id: UUID of the run
+            include_agent_scores: If False, the agent_scores column is omitted
+
+        Returns:
+            pyarrow.Table, or None if the run does not exist
+        """
+        if not COLUMNAR_AVAILABLE:
+            raise ImportError("pyarrow and duckdb are required. Install with: pip install pyarrow duckdb")
+
+        try:
+            run_key = _encode_run_id(run_id)
+        except ValueError:
+            logger.warning(f"Backtest run {run_id} not found")
+            return None
+
+        schema = _signal_arrow_schema()
+        if not include_agent_scores:
+            schema = schema.remove(schema.get_field_index('agent_scores'))
+
+        partition = self._partition_dir(run_id) / 'signals.parquet' if self.columnar_dir else None
+        if partition is not None and partition.exists():
+            table = pq.read_table(partition, columns=schema.names)
+        else:
+            if not any(self._fetch("SELECT 1 FROM backtest_runs WHERE run_id = ?", (run_key,))):
+                logger.warning(f"Backtest run {run_id} not found")
+                return None
+            sql = _SELECT_RUN_SIGNALS if include_agent_scores else _SELECT_RUN_SIGNALS_NO_AGENT_SCORES
+            rows = [tuple(row) for row in self._get_reader().execute(sql, (run_key,))]
+
+            columns = list(zip(*rows, strict=True)) or [[] for _ in schema]
+            table = pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema, strict=True)],
+                schema=schema
+            )
+
+        # Epoch seconds reinterpret as timestamps without copying
+        date_index = table.schema.get_field_index('date')
+        return table.set_column(date_index, 'date', table.column('date').cast(pa.timestamp('s')))
+
+    def _get_signals_by_symbol_columnar(self, symbol: str, limit: int) -> List[Dict]:
+        """get_signals_by_symbol answered by DuckDB over the Parquet partitions"""
+        if not any(self.columnar_dir.glob('run_id=*/signals.parquet')):
+            return []
+
+        pattern = str(self.columnar_dir / 'run_id=*' / 'signals.parquet')
+        with duckdb.connect() as con:
+            cursor = con.execute("""
+                SELECT signal_id, run_id, symbol, date, recommendation,
+                       composite_score, confidence, alpha_3m, forward_return_3m
+                FROM read_parquet(?, hive_partitioning = true, hive_types = {'run_id': VARCHAR})
+                WHERE symbol = ?
+                ORDER BY date DESC
+                LIMIT ?
+            """, [pattern, symbol, limit])
+            columns = [d[0] for d in cursor.description]
+            rows = cursor.fetchall()
+
+        if not rows:
+            return []
+
+        # Run names live in SQLite; fetch just the runs that were hit
+        run_ids = sorted({row[1] for row in rows})
+        placeholders = ','.join('?' * len(run_ids))
+        names = {
+            _decode_run_id(row['run_id']): row['name']
+            for row in self._fetch(
+                f"SELECT run_id, name FROM backtest_runs WHERE run_id IN ({placeholders})",
+                tuple(_encode_run_id(run_id) for run_id in run_ids)
+            )
+        }
+
+        signals = []
+        for row in rows:
+            signal = dict(zip(columns, row, strict=True))
+            signal['run_name'] = names.get(signal['run_id'])
+            signal['date'] = _decode_date(signal['date'])
+            signals.append(signal)
+        return signals
 
 
 # Example usage
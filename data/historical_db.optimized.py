@@ -2,97 +2,655 @@
 Optimized Historical Database with Performance Improvements
 
 Optimizations:
-- Connection pooling for concurrent requests
+- One writer connection behind a lock plus a pool of read-only
+  connections, so reads run alongside writes under WAL
 - Prepared statements to prevent SQL injection
 - Index optimization
-- Query result caching
-- Batch operations
+- Query result caching (invalidated by per-table write versions)
+- Batch operations (idempotent on symbol + timestamp)
+- Incremental auto-vacuum instead of periodic full VACUUM
+- MessagePack-encoded companions of the score/weight/regime JSON
+  columns, read in preference to the JSON that HistoricalDatabase uses;
+  long encoded values are stored zstd-compressed
+- Optional apsw read-only pool for lower per-query overhead
 """
 
 import sqlite3
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Dict, Any, Optional
 from contextlib import contextmanager
 from pathlib import Path
-from functools import lru_cache
+from collections import OrderedDict, defaultdict
+from itertools import chain, islice
+import atexit
+import os
+import queue
 import threading
+import time
+import weakref
+import zlib
+
+# Optional MessagePack codec for the stock_analyses *_blob columns
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Optional thinner SQLite binding for the read-only pool (use_apsw=True)
+try:
+    import apsw
+    APSW_AVAILABLE = True
+except ImportError:
+    APSW_AVAILABLE = False
+
+# Optional C JSON codec: encodes when msgpack is missing, decodes JSON rows
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional zstd codec for long columns (zlib is used otherwise)
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# In-process query cache: entries expire after their TTL or as soon as a
+# table they read from is written to
+QUERY_CACHE_SIZE = 128
+HISTORY_CACHE_TTL = 300  # seconds; bounds drift of the sliding 'days' window
+STATS_CACHE_TTL = 30  # seconds; stats are for display only
+TOP_PERFORMERS_CACHE_TTL = 60  # seconds; dashboard aggregate
+
+# Tables reported by get_database_stats
+_STATS_TABLES = ('stock_analyses', 'market_regimes', 'watchlist', 'user_searches')
+
+# Leading byte of an encoded *_blob value, naming its serialization
+_CODEC_JSON = 0
+_CODEC_MSGPACK = 1
+# Compressed wrappers; the decompressed bytes are an encoded value
+_CODEC_ZSTD = 2
+_CODEC_ZLIB = 3
+
+# Encoded values at least this long are compressed when that makes them
+# smaller
+COMPRESS_MIN_BYTES = 256
+
+# (JSON TEXT column, encoded companion column) pairs on stock_analyses. The
+# JSON columns belong to HistoricalDatabase's schema and are always written
+# so both classes can share one file; reads prefer the encoded column.
+_BLOB_COLUMNS = (
+    ('agent_scores_json', 'agent_scores_blob'),
+    ('weights_json', 'weights_blob'),
+    ('market_regime_json', 'market_regime_blob'),
+)
+
+# HistoricalDatabase's stock_analyses plus the encoded companion columns
+_SQL_CREATE_STOCK_ANALYSES = """
+    CREATE TABLE IF NOT EXISTS stock_analyses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        symbol TEXT NOT NULL,
+        timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        composite_score REAL NOT NULL,
+        recommendation TEXT NOT NULL,
+        confidence REAL NOT NULL,
+        agent_scores_json TEXT NOT NULL,
+        weights_json TEXT NOT NULL,
+        market_regime_json TEXT,
+        price REAL,
+        sector TEXT,
+        narrative TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        agent_scores_blob BLOB,
+        weights_blob BLOB,
+        market_regime_blob BLOB
+    )
+"""
+
+# Planner statistics are refreshed with ANALYZE at most this often
+ANALYZE_INTERVAL = timedelta(hours=24)
+
+_ANALYSIS_INSERT_COLUMNS = """
+    symbol, timestamp, composite_score, recommendation, confidence,
+    agent_scores_json, weights_json, market_regime_json,
+    agent_scores_blob, weights_blob, market_regime_blob,
+    price, sector, narrative
+"""
+_ANALYSIS_ROW_PLACEHOLDERS = "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+# Per-connection prepared statement cache (sqlite3 default: 100). Statements
+# are looked up by SQL text, so hot queries live in the constants below and
+# repeat calls skip SQLite's parse/plan step entirely.
+STATEMENT_CACHE_SIZE = 256
+
+_SQL_STOCK_HISTORY = """
+    SELECT id, symbol, timestamp, composite_score, recommendation, confidence,
+           COALESCE(agent_scores_blob, CAST(X'00' || agent_scores_json AS BLOB))
+               AS "agent_scores [PACKED]",
+           COALESCE(weights_blob, CAST(X'00' || weights_json AS BLOB))
+               AS "weights [PACKED]",
+           COALESCE(market_regime_blob, CAST(X'00' || market_regime_json AS BLOB))
+               AS "market_regime [PACKED]",
+           price, sector, narrative
+    FROM stock_analyses
+    WHERE symbol = ?
+      AND (timestamp, id) > (?, ?)
+    ORDER BY timestamp ASC, id ASC
+    LIMIT ?
+"""
+
+_SQL_TOP_PERFORMERS = """
+    SELECT
+        symbol,
+        AVG(composite_score) as avg_score,
+        COUNT(*) as analysis_count,
+        MAX(timestamp) as latest_analysis
+    FROM stock_analyses
+    WHERE timestamp >= ?
+    GROUP BY symbol
+    HAVING COUNT(*) >= ?
+    ORDER BY avg_score DESC
+    LIMIT ?
+"""
+
+# Keyset pages pulled while streaming history; get_stock_history caps its
+# list at HISTORY_MAX_ROWS
+HISTORY_PAGE_SIZE = 200
+HISTORY_MAX_ROWS = 1000
+
+# Rows written by batch inserts (they always carry agent_scores_blob) are
+# unique per (symbol, timestamp), so a retried batch is skipped by SQLite.
+# The index is partial: HistoricalDatabase rows sharing the table keep their
+# CURRENT_TIMESTAMP semantics and are never rejected.
+_SQL_CREATE_UNIQUE_SYMBOL_TS_INDEX = """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_unique_symbol_ts
+    ON stock_analyses(symbol, timestamp)
+    WHERE agent_scores_blob IS NOT NULL
+"""
+_ANALYSIS_ON_CONFLICT = """
+    ON CONFLICT(symbol, timestamp) WHERE agent_scores_blob IS NOT NULL DO NOTHING
+"""
+
+# Analyses per multi-row INSERT; 71 x 14 params stays under the 999-variable
+# limit of older SQLite builds
+ANALYSIS_INSERT_CHUNK = 71
+_ANALYSIS_INSERT_CHUNK_SQL = (
+    f"INSERT INTO stock_analyses ({_ANALYSIS_INSERT_COLUMNS}) VALUES "
+    + ", ".join([_ANALYSIS_ROW_PLACEHOLDERS] * ANALYSIS_INSERT_CHUNK)
+    + _ANALYSIS_ON_CONFLICT
+)
+_ANALYSIS_INSERT_ROW_SQL = (
+    f"INSERT INTO stock_analyses ({_ANALYSIS_INSERT_COLUMNS}) VALUES {_ANALYSIS_ROW_PLACEHOLDERS}"
+    + _ANALYSIS_ON_CONFLICT
+)
+
+_SQL_CREATE_STOCK_AGG_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_stock_agg
+    ON stock_analyses(symbol, timestamp, composite_score)
+"""
+
+# Batches larger than this are loaded with idx_stock_agg dropped and rebuilt
+BULK_INSERT_THRESHOLD = 10000
+
+# Free pages released per incremental_vacuum call, and the freelist size
+# below which it does nothing
+INCREMENTAL_VACUUM_PAGES = 1000
+INCREMENTAL_VACUUM_MIN_FREE_PAGES = 100
+
+
+def _compress(data: bytes) -> Optional[bytes]:
+    """Codec-prefixed zstd (or zlib) form of data, or None when not worth it"""
+    if len(data) < COMPRESS_MIN_BYTES:
+        return None
+    if ZSTD_AVAILABLE:
+        codec, compressed = _CODEC_ZSTD, zstandard.ZstdCompressor(level=3).compress(data)
+    else:
+        codec, compressed = _CODEC_ZLIB, zlib.compress(data, 6)
+    if len(compressed) + 1 >= len(data):
+        return None
+    return bytes((codec,)) + compressed
+
+
+def _decompress(codec: int, payload) -> bytes:
+    """Undo _compress for a value whose prefix byte is codec"""
+    if codec == _CODEC_ZLIB:
+        return zlib.decompress(payload)
+    if not ZSTD_AVAILABLE:
+        raise ImportError("zstandard is required. Install with: pip install zstandard")
+    return zstandard.ZstdDecompressor().decompress(payload)
+
+
+def _pack(value: Any) -> bytes:
+    """Encode a column value with MessagePack (JSON if msgpack is not installed)"""
+    if MSGPACK_AVAILABLE:
+        encoded = bytes((_CODEC_MSGPACK,)) + msgpack.packb(value, use_bin_type=True)
+    elif ORJSON_AVAILABLE:
+        encoded = bytes((_CODEC_JSON,)) + orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        encoded = bytes((_CODEC_JSON,)) + json.dumps(value).encode()
+    return _compress(encoded) or encoded
+
+
+def _unpack_text(raw) -> Optional[str]:
+    """Text of a narrative that an earlier version stored as a compressed BLOB"""
+    if raw is None or isinstance(raw, str):
+        return raw
+    return _decompress(raw[0], memoryview(raw)[1:]).decode()
+
+
+def _dumps(value: Any) -> str:
+    """JSON text for a shared *_json column, as HistoricalDatabase writes it"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(value)
+
+
+def _loads(data) -> Any:
+    """Parse JSON with orjson, falling back to json for NaN/Infinity it rejects"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+
+def _unpack(raw) -> Any:
+    """Decode a value written by _pack (plain JSON text from older rows also works)"""
+    if isinstance(raw, str):
+        return _loads(raw)
+    codec, payload = raw[0], memoryview(raw)[1:]
+    if codec == _CODEC_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise ImportError("msgpack is required. Install with: pip install msgpack")
+        return msgpack.unpackb(payload, raw=False)
+    if codec == _CODEC_JSON:
+        return _loads(payload)
+    if codec in (_CODEC_ZSTD, _CODEC_ZLIB):
+        return _unpack(_decompress(codec, payload))
+    raise ValueError(f"Unknown column codec {codec}")
+
+
+def _cutoff(days: int) -> str:
+    """
+    Timestamp string for 'days ago' in CURRENT_TIMESTAMP's UTC format
+
+    Bound as a plain parameter so the planner sees ``timestamp >= ?`` and
+    can seek idx_stock_symbol_timestamp instead of evaluating datetime().
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    return cutoff.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _timestamp(value: Any) -> Optional[str]:
+    """Normalize a caller-supplied analysis timestamp to CURRENT_TIMESTAMP's format"""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+# Columns selected as "name [PACKED]" are decoded by sqlite3 itself while
+# fetching (connections use PARSE_COLNAMES)
+sqlite3.register_converter("PACKED", _unpack)
+
 
 class OptimizedHistoricalDatabase:
     """
     Optimized version of HistoricalDatabase with performance improvements
     """
 
-    def __init__(self, db_path: str = "data/analysis_history.db", pool_size: int = 5):
+    def __init__(
+        self,
+        db_path: str = "data/analysis_history.db",
+        pool_size: int = 5,
+        use_apsw: bool = False
+    ):
         """
         Initialize database with connection pooling
 
         Args:
             db_path: Path to SQLite database file
-            pool_size: Number of connections in pool
+            pool_size: Number of read-only connections in pool
+            use_apsw: Open the read-only pool with apsw instead of sqlite3
         """
+        if use_apsw and not APSW_AVAILABLE:
+            raise ImportError("apsw is required. Install with: pip install apsw")
+
         self.db_path = db_path
         self.pool_size = pool_size
-        self._local = threading.local()
+        self.use_apsw = use_apsw
+
+        # Bumped on every write to a table; cached results remember the
+        # version they were computed at
+        self._table_versions: Dict[str, int] = defaultdict(int)
+        self._query_cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
 
         # Ensure data directory exists
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
+        # Single writer; SQLite serializes writes anyway
+        self._writer_conn = self._open_connection(readonly=False)
+        self._writer_lock = threading.Lock()
+
         # Initialize database
         self._create_tables()
         self._create_indexes()
         self._optimize_database()
+
+        # Readers open read-only once the file and schema exist
+        self._reader_pool = self._open_reader_pool()
+        self._closed = False
+
+        # SQLite handles must not be used across fork(); forked workers
+        # (gunicorn/uvicorn) reopen their own. Connections are also closed
+        # at exit. Weak references keep both hooks from pinning this instance.
+        reset_ref = weakref.WeakMethod(self._reset_after_fork)
+        close_ref = weakref.WeakMethod(self.close)
+        os.register_at_fork(after_in_child=lambda: reset_ref() and reset_ref()())
+        self._atexit_hook = lambda: close_ref() and close_ref()()
+        atexit.register(self._atexit_hook)
+
         logger.info(f"Optimized database initialized at {db_path}")
 
-    def _get_connection(self):
-        """Get thread-local connection"""
-        if not hasattr(self._local, 'conn') or self._local.conn is None:
-            self._local.conn = sqlite3.connect(
+    def _open_reader_pool(self) -> queue.Queue:
+        """Fill a bounded queue with pool_size read-only connections"""
+        pool: queue.Queue = queue.Queue(maxsize=self.pool_size)
+        for _ in range(self.pool_size):
+            pool.put(self._open_connection(readonly=True))
+        return pool
+
+    def _reset_after_fork(self):
+        """
+        Give a forked child fresh connections and locks
+
+        The inherited handles are kept referenced but never used or closed:
+        closing them in the child could release the parent's file locks.
+        """
+        if self._closed:
+            return
+        self._inherited_connections = (self._writer_conn, self._reader_pool)
+        self._writer_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._writer_conn = self._open_connection(readonly=False)
+        self._reader_pool = self._open_reader_pool()
+
+    def _open_connection(self, readonly: bool):
+        """Open a connection shared across threads, with performance PRAGMAs applied"""
+        if readonly and self.use_apsw:
+            conn = apsw.Connection(
                 self.db_path,
+                flags=apsw.SQLITE_OPEN_READONLY,
+                statementcachesize=STATEMENT_CACHE_SIZE
+            )
+            conn.execute("PRAGMA cache_size=10000")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA busy_timeout=30000")
+            return conn
+
+        if readonly:
+            conn = sqlite3.connect(
+                f"{Path(self.db_path).resolve().as_uri()}?mode=ro",
+                uri=True,
                 check_same_thread=False,
-                timeout=30.0  # Increase timeout for concurrent access
+                cached_statements=STATEMENT_CACHE_SIZE,
+                detect_types=sqlite3.PARSE_COLNAMES
             )
-            self._local.conn.row_factory = sqlite3.Row
+        else:
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE,
+                detect_types=sqlite3.PARSE_COLNAMES,
+                isolation_level=None  # Transactions are opened explicitly in _get_writer
+            )
+        conn.row_factory = sqlite3.Row
 
-            # Performance optimizations
-            self._local.conn.execute("PRAGMA journal_mode=WAL")  # Write-Ahead Logging
-            self._local.conn.execute("PRAGMA synchronous=NORMAL")  # Faster writes
-            self._local.conn.execute("PRAGMA cache_size=10000")  # Larger cache
-            self._local.conn.execute("PRAGMA temp_store=MEMORY")  # Use memory for temp
-            self._local.conn.execute("PRAGMA mmap_size=268435456")  # 256MB memory-mapped I/O
+        # Performance optimizations
+        if not readonly:
+            # Only takes effect while the file is still empty, so it must
+            # precede journal_mode and the first CREATE TABLE. Existing
+            # files are converted by full_vacuum.
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")  # Write-Ahead Logging
+            conn.execute("PRAGMA synchronous=NORMAL")  # Faster writes
+            conn.execute("PRAGMA wal_autocheckpoint=2000")  # Fewer, larger checkpoints
+        conn.execute("PRAGMA cache_size=10000")  # Larger cache
+        conn.execute("PRAGMA temp_store=MEMORY")  # Use memory for temp
+        conn.execute("PRAGMA mmap_size=268435456")  # 256MB memory-mapped I/O
+        conn.execute("PRAGMA busy_timeout=30000")  # SQLite-side retry on lock contention
 
-        return self._local.conn
+        return conn
 
     @contextmanager
-    def _transaction(self):
-        """Context manager for database transactions with optimization"""
-        conn = self._get_connection()
+    def _get_writer(self, transaction: bool = True):
+        """
+        Hold the writer connection for one transaction, committing on success
+
+        The connection runs in autocommit mode; BEGIN IMMEDIATE takes SQLite's
+        write lock up front instead of upgrading a deferred read lock on the
+        first DML. Pass transaction=False for statements that must run
+        outside a transaction (VACUUM, incremental_vacuum).
+        """
+        with self._writer_lock:
+            conn = self._writer_conn
+            if not transaction:
+                yield conn
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception as e:
+                conn.execute("ROLLBACK")
+                logger.error(f"Database error: {e}")
+                raise
+
+    @contextmanager
+    def _get_reader(self):
+        """Borrow a read-only connection from the pool (blocks while all are in use)"""
+        conn = self._reader_pool.get()
         try:
             yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Database error: {e}")
-            raise
+        finally:
+            self._reader_pool.put(conn)
+
+    def _bump_table_version(self, table: str):
+        """Invalidate every cached result that read from table"""
+        with self._cache_lock:
+            self._table_versions[table] += 1
+
+    def _cache_get(self, key: tuple, table: str, ttl: float) -> Optional[Any]:
+        """Return a cached result if it is fresh and table is unchanged since"""
+        with self._cache_lock:
+            entry = self._query_cache.get(key)
+            if entry is None:
+                return None
+            stored_at, version, value = entry
+            if version != self._table_versions[table] or time.monotonic() - stored_at >= ttl:
+                del self._query_cache[key]
+                return None
+            self._query_cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, key: tuple, table: str, version: int, value: Any):
+        """Cache a result computed while table was at version"""
+        with self._cache_lock:
+            self._query_cache[key] = (time.monotonic(), version, value)
+            self._query_cache.move_to_end(key)
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
 
     def _optimize_database(self):
-        """Apply database optimizations"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        """Refresh planner statistics if the last ANALYZE is older than ANALYZE_INTERVAL"""
+        with self._get_writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS _meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            """)
+
+            row = cursor.execute("SELECT value FROM _meta WHERE key = 'last_analyzed'").fetchone()
+            if row and datetime.now() - datetime.fromisoformat(row['value']) < ANALYZE_INTERVAL:
+                logger.debug("Planner statistics are fresh, skipping ANALYZE")
+                return
+
+            cursor.execute("ANALYZE")
+            cursor.execute(
+                "INSERT OR REPLACE INTO _meta (key, value) VALUES ('last_analyzed', ?)",
+                (datetime.now().isoformat(),)
+            )
+            logger.info("Database optimizations applied")
+
+    def close(self):
+        """
+        Run PRAGMA optimize and close all connections
+
+        SQLite recommends PRAGMA optimize before closing a connection; it
+        only re-analyzes tables whose statistics have gone stale. Also runs
+        at interpreter exit if not called explicitly.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self._atexit_hook)
 
-        # Analyze tables for query optimization
-        cursor.execute("ANALYZE")
+        with self._writer_lock:
+            try:
+                self._writer_conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.warning(f"PRAGMA optimize failed: {e}")
+            finally:
+                self._writer_conn.close()
 
-        conn.commit()
-        logger.info("Database optimizations applied")
+        while not self._reader_pool.empty():
+            self._reader_pool.get_nowait().close()
+
+    def _create_tables(self):
+        """
+        Create database tables if they don't exist
+
+        Same schema as HistoricalDatabase, plus encoded *_blob companions
+        of the stock_analyses JSON columns. A file created by
+        HistoricalDatabase gains the companion columns and stays readable
+        and writable by it.
+        """
+        with self._get_writer() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(_SQL_CREATE_STOCK_ANALYSES)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS market_regimes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    regime TEXT NOT NULL,
+                    trend TEXT NOT NULL,
+                    volatility TEXT NOT NULL,
+                    weights_json TEXT NOT NULL,
+                    metrics_json TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS watchlist (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL DEFAULT 'default',
+                    symbol TEXT NOT NULL,
+                    added_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    notes TEXT,
+                    UNIQUE(user_id, symbol)
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS user_searches (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT NOT NULL,
+                    timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    source TEXT DEFAULT 'manual',
+                    user_id TEXT DEFAULT 'default'
+                )
+            """)
+
+            self._add_blob_columns(cursor)
+
+            logger.info("Database tables created successfully")
+
+    def _add_blob_columns(self, cursor: sqlite3.Cursor):
+        """
+        Bring stock_analyses to the shared layout (JSON columns plus *_blob)
+
+        Tables from HistoricalDatabase only gain the empty *_blob columns;
+        their rows keep being read from JSON. Tables whose JSON columns
+        were renamed to *_blob by an earlier version are rebuilt with the
+        JSON columns restored from the encoded values.
+        """
+        columns = {row['name'] for row in cursor.execute("PRAGMA table_info(stock_analyses)")}
+        if 'agent_scores_json' not in columns:
+            self._restore_json_columns(cursor)
+            return
+
+        for _, blob_column in _BLOB_COLUMNS:
+            if blob_column not in columns:
+                cursor.execute(f"ALTER TABLE stock_analyses ADD COLUMN {blob_column} BLOB")
+
+    def _restore_json_columns(self, cursor: sqlite3.Cursor):
+        """
+        Rebuild a blob-only stock_analyses table in the shared layout
+
+        Narratives that were stored as compressed BLOBs become TEXT again.
+        """
+        def as_json(raw) -> Optional[str]:
+            value = _unpack(raw) if raw is not None else None
+            return _dumps(value) if value is not None else None
+
+        # Rebuilt rather than altered: the old *_blob columns are NOT NULL,
+        # which would reject rows written by HistoricalDatabase
+        cursor.execute("ALTER TABLE stock_analyses RENAME TO stock_analyses_blob_only")
+        cursor.execute(_SQL_CREATE_STOCK_ANALYSES)
+
+        rows = cursor.execute("""
+            SELECT id, symbol, timestamp, composite_score, recommendation, confidence,
+                   agent_scores_blob, weights_blob, market_regime_blob,
+                   price, sector, narrative, created_at
+            FROM stock_analyses_blob_only
+        """).fetchall()
+        cursor.executemany(
+            """
+            INSERT INTO stock_analyses (
+                id, symbol, timestamp, composite_score, recommendation, confidence,
+                agent_scores_json, weights_json, market_regime_json,
+                agent_scores_blob, weights_blob, market_regime_blob,
+                price, sector, narrative, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                tuple(row[:6])
+                + (as_json(row[6]) or '{}', as_json(row[7]) or '{}', as_json(row[8]))
+                + tuple(row[6:11]) + (_unpack_text(row[11]), row[12])
+                for row in rows
+            )
+        )
+        cursor.execute("DROP TABLE stock_analyses_blob_only")
+        logger.info(f"Restored JSON columns for {len(rows)} stock_analyses rows")
 
     def _create_indexes(self):
         """Create optimized indexes"""
-        with self._transaction() as conn:
+        with self._get_writer() as conn:
             cursor = conn.cursor()
 
             # Composite indexes for common queries
@@ -101,10 +659,32 @@ class OptimizedHistoricalDatabase:
                 ON stock_analyses(symbol, timestamp DESC)
             """)
 
+            # Covers the top-performers aggregate (symbol groups, timestamp
+            # filter, score average) without touching table rows
+            cursor.execute(_SQL_CREATE_STOCK_AGG_INDEX)
+
+            # Superseded by idx_stock_agg; no query orders by score alone
+            cursor.execute("DROP INDEX IF EXISTS idx_stock_score")
+
+            # Batch rows duplicated before the unique index existed would
+            # make its creation fail; keep the first copy of each
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_stock_score
-                ON stock_analyses(composite_score DESC, timestamp DESC)
+                SELECT 1 FROM sqlite_master
+                WHERE type = 'index' AND name = 'idx_unique_symbol_ts'
             """)
+            if cursor.fetchone() is None:
+                cursor.execute("""
+                    DELETE FROM stock_analyses
+                    WHERE agent_scores_blob IS NOT NULL
+                    AND id NOT IN (
+                        SELECT MIN(id) FROM stock_analyses
+                        WHERE agent_scores_blob IS NOT NULL
+                        GROUP BY symbol, timestamp
+                    )
+                """)
+                if cursor.rowcount > 0:
+                    logger.warning(f"Removed {cursor.rowcount} duplicate analyses before adding idx_unique_symbol_ts")
+            cursor.execute(_SQL_CREATE_UNIQUE_SYMBOL_TS_INDEX)
 
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_regime_timestamp
@@ -118,49 +698,96 @@ class OptimizedHistoricalDatabase:
 
             logger.info("Optimized indexes created successfully")
 
-    @lru_cache(maxsize=128)
     def get_stock_history_cached(
         self,
         symbol: str,
-        days: int = 30,
-        cache_key: str = None
+        days: int = 30
     ) -> List[Dict[str, Any]]:
         """
         Cached version of get_stock_history for frequently accessed data
 
+        Results are served from memory until HISTORY_CACHE_TTL passes or
+        stock_analyses is written to. The returned list is shared between
+        callers and must not be modified.
+
         Args:
             symbol: Stock symbol
             days: Number of days of history
-            cache_key: Optional cache key (timestamp for cache invalidation)
 
         Returns:
             List of historical analysis records
         """
-        return self.get_stock_history(symbol, days)
+        key = ('stock_history', symbol, days)
+        cached = self._cache_get(key, 'stock_analyses', HISTORY_CACHE_TTL)
+        if cached is not None:
+            return cached
+
+        # Read the version first so a write racing the query can only
+        # make this entry stale, never hide the write
+        version = self._table_versions['stock_analyses']
+        history = self.get_stock_history(symbol, days)
+        self._cache_put(key, 'stock_analyses', version, history)
+        return history
 
     def get_stock_history(
         self,
         symbol: str,
-        days: int = 30
+        days: int = 30,
+        max_rows: Optional[int] = HISTORY_MAX_ROWS
     ) -> List[Dict[str, Any]]:
         """
         Optimized query with LIMIT and indexed lookups
+
+        Args:
+            symbol: Stock symbol
+            days: Number of days of history
+            max_rows: Oldest-first row cap (None returns the whole window)
         """
-        with self._transaction() as conn:
-            cursor = conn.cursor()
+        return list(islice(self.iter_stock_history(symbol, days), max_rows))
 
-            # Use prepared statement
-            cursor.execute("""
-                SELECT *
-                FROM stock_analyses
-                WHERE symbol = ?
-                  AND timestamp >= datetime('now', ? || ' days')
-                ORDER BY timestamp ASC
-                LIMIT 1000
-            """, (symbol, -days))
+    def iter_stock_history(
+        self,
+        symbol: str,
+        days: int = 30,
+        page_size: int = HISTORY_PAGE_SIZE,
+        after_ts: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a symbol's analysis history, oldest first
 
-            rows = cursor.fetchall()
-            return [self._parse_stock_analysis_row(row) for row in rows]
+        Pages are read by keyset on (timestamp, id), so each page is an
+        index seek and a reader is only borrowed while a page is fetched.
+        Encoded columns are decoded by sqlite3's converters.
+
+        Args:
+            symbol: Stock symbol
+            days: Number of days of history
+            page_size: Rows fetched per query
+            after_ts: Only yield analyses strictly newer than this timestamp
+        """
+        # Last (timestamp, id) seen; id -1 admits rows at the cutoff itself,
+        # the maximum rowid excludes every row at after_ts
+        cutoff = _cutoff(days)
+        if after_ts is not None and after_ts >= cutoff:
+            key = (after_ts, 2 ** 63 - 1)
+        else:
+            key = (cutoff, -1)
+
+        parse = None
+        while True:
+            with self._get_reader() as conn:
+                # Use prepared statement
+                description, rows = self._read_rows(
+                    conn, _SQL_STOCK_HISTORY, (symbol, *key, page_size)
+                )
+            if parse is None and rows:
+                parse, key_of = self._stock_analysis_row_parser(description)
+
+            for row in rows:
+                yield parse(row)
+            if len(rows) < page_size:
+                return
+            key = key_of(rows[-1])
 
     def get_top_performers_optimized(
         self,
@@ -171,26 +798,50 @@ class OptimizedHistoricalDatabase:
         """
         Optimized query using aggregation and indexes
 
-        Returns top performing stocks with efficient query
+        Returns top performing stocks with efficient query. Results are
+        cached for TOP_PERFORMERS_CACHE_TTL or until stock_analyses is
+        written to; the returned list is shared and must not be modified.
+        """
+        key = ('top_performers', days, limit, min_analyses)
+        cached = self._cache_get(key, 'stock_analyses', TOP_PERFORMERS_CACHE_TTL)
+        if cached is not None:
+            return cached
+
+        version = self._table_versions['stock_analyses']
+        with self._get_reader() as conn:
+            description, rows = self._read_rows(
+                conn, _SQL_TOP_PERFORMERS, (_cutoff(days), min_analyses, limit)
+            )
+
+        names = [column[0] for column in description]
+        performers = [dict(zip(names, row, strict=True)) for row in rows]
+        self._cache_put(key, 'stock_analyses', version, performers)
+        return performers
+
+    @staticmethod
+    def _read_rows(conn, sql: str, params: tuple) -> tuple:
         """
-        with self._transaction() as conn:
+        Run a query on a pooled reader, returning (description, row tuples)
+
+        Works for sqlite3 and apsw readers; apsw statements are prepared
+        with SQLITE_PREPARE_PERSISTENT. The description is empty when no
+        rows match.
+        """
+        if isinstance(conn, sqlite3.Connection):
             cursor = conn.cursor()
+            # Plain tuples; names are taken from the description
+            cursor.row_factory = None
+            cursor.execute(sql, params)
+            return cursor.description or (), cursor.fetchall()
 
-            cursor.execute("""
-                SELECT
-                    symbol,
-                    AVG(composite_score) as avg_score,
-                    COUNT(*) as analysis_count,
-                    MAX(timestamp) as latest_analysis
-                FROM stock_analyses
-                WHERE timestamp >= datetime('now', ? || ' days')
-                GROUP BY symbol
-                HAVING COUNT(*) >= ?
-                ORDER BY avg_score DESC
-                LIMIT ?
-            """, (-days, min_analyses, limit))
-
-            return [dict(row) for row in cursor.fetchall()]
+        cursor = conn.cursor()
+        cursor.execute(sql, params, prepare_flags=apsw.SQLITE_PREPARE_PERSISTENT)
+        try:
+            # Only available while rows are pending
+            description = cursor.get_description()
+        except apsw.ExecutionCompleteError:
+            return (), []
+        return description, cursor.fetchall()
 
     def batch_insert_analyses(
         self,
@@ -199,105 +850,222 @@ class OptimizedHistoricalDatabase:
         """
         Batch insert for better performance
 
+        Inserts are idempotent: an analysis whose (symbol, timestamp) was
+        already written by a batch insert is skipped. Analyses without a
+        'timestamp' share one timestamp for the whole batch.
+
         Args:
             analyses: List of analysis dictionaries
 
         Returns:
-            Number of records inserted
+            Number of records inserted (duplicates excluded)
         """
         if not analyses:
             return 0
 
-        with self._transaction() as conn:
+        # Encode before taking the writer lock so other writers only wait
+        # on SQLite, not on serialization
+        batch_data = self._encode_analyses(analyses)
+
+        with self._get_writer() as conn:
+            inserted = self._insert_analysis_rows(conn.cursor(), batch_data)
+
+        if inserted:
+            self._bump_table_version('stock_analyses')
+        return inserted
+
+    def batch_insert_analyses_bulk(
+        self,
+        analyses: List[Dict[str, Any]],
+        drop_indexes_threshold: int = BULK_INSERT_THRESHOLD
+    ) -> int:
+        """
+        Batch insert for very large loads
+
+        Above drop_indexes_threshold rows, idx_stock_agg is dropped, the rows
+        are inserted and the index is rebuilt in one sorted pass, all in the
+        same transaction. idx_stock_symbol_timestamp and idx_unique_symbol_ts
+        are kept. Because the
+        drop is never committed on its own, WAL readers such as
+        get_top_performers_optimized keep using the old index until the
+        load commits. Smaller batches take the batch_insert_analyses path.
+
+        Args:
+            analyses: List of analysis dictionaries
+            drop_indexes_threshold: Row count above which the index is rebuilt
+
+        Returns:
+            Number of records inserted (duplicates excluded)
+        """
+        if len(analyses) <= drop_indexes_threshold:
+            return self.batch_insert_analyses(analyses)
+
+        batch_data = self._encode_analyses(analyses)
+
+        with self._get_writer() as conn:
             cursor = conn.cursor()
+            cursor.execute("DROP INDEX IF EXISTS idx_stock_agg")
+            inserted = self._insert_analysis_rows(cursor, batch_data)
+            cursor.execute(_SQL_CREATE_STOCK_AGG_INDEX)
 
-            # Prepare batch data
-            batch_data = [
-                (
-                    a['symbol'],
-                    a['composite_score'],
-                    a['recommendation'],
-                    a['confidence'],
-                    json.dumps(a['agent_scores']),
-                    json.dumps(a['weights']),
-                    json.dumps(a.get('market_regime')),
-                    a.get('price'),
-                    a.get('sector'),
-                    a.get('narrative'),
-                )
-                for a in analyses
-            ]
-
-            # Batch insert
-            cursor.executemany("""
-                INSERT INTO stock_analyses (
-                    symbol, composite_score, recommendation, confidence,
-                    agent_scores_json, weights_json, market_regime_json,
-                    price, sector, narrative
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, batch_data)
-
-            return len(batch_data)
-
-    def _parse_stock_analysis_row(self, row: sqlite3.Row) -> Dict[str, Any]:
-        """Optimized row parsing with error handling"""
+        if inserted:
+            self._bump_table_version('stock_analyses')
+        return inserted
+
+    @staticmethod
+    def _encode_analyses(analyses: List[Dict[str, Any]]) -> List[tuple]:
+        """Build stock_analyses insert rows: shared JSON columns plus encoded companions"""
+        # Same format as CURRENT_TIMESTAMP so rows from both writers sort together
+        batch_ts = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        return [
+            (
+                a['symbol'],
+                _timestamp(a.get('timestamp')) or batch_ts,
+                a['composite_score'],
+                a['recommendation'],
+                a['confidence'],
+                _dumps(a['agent_scores']),
+                _dumps(a['weights']),
+                _dumps(a['market_regime']) if a.get('market_regime') else None,
+                _pack(a['agent_scores']),
+                _pack(a['weights']),
+                _pack(a.get('market_regime')),
+                a.get('price'),
+                a.get('sector'),
+                a.get('narrative'),
+            )
+            for a in analyses
+        ]
+
+    @staticmethod
+    def _insert_analysis_rows(cursor: sqlite3.Cursor, batch_data: List[tuple]) -> int:
+        """Insert encoded rows inside the caller's transaction; returns rows actually inserted"""
+        inserted = 0
+        # Full chunks go in as one multi-row INSERT each; the trailing
+        # partial chunk uses executemany so the chunk SQL never varies
+        full = len(batch_data) - len(batch_data) % ANALYSIS_INSERT_CHUNK
+        for start in range(0, full, ANALYSIS_INSERT_CHUNK):
+            chunk = batch_data[start:start + ANALYSIS_INSERT_CHUNK]
+            cursor.execute(_ANALYSIS_INSERT_CHUNK_SQL, tuple(chain.from_iterable(chunk)))
+            inserted += cursor.rowcount
+        if full < len(batch_data):
+            cursor.executemany(_ANALYSIS_INSERT_ROW_SQL, batch_data[full:])
+            inserted += cursor.rowcount
+        return inserted
+
+    @staticmethod
+    def _stock_analysis_row_parser(description) -> tuple:
+        """
+        Build row functions for one stock history query
+
+        Column positions are resolved once from the cursor description and
+        bound into closures, so each row costs tuple indexing only. sqlite3
+        readers decode "[PACKED]" columns with the converters; apsw readers
+        report the raw alias and those columns are unpacked here.
+
+        Returns:
+            (parse, key_of): row tuple -> record dict, and row tuple ->
+            (timestamp, id) keyset position
+        """
+        names = []
+        packed_at = []
+        for position, column in enumerate(description):
+            name = column[0]
+            if name.endswith(' [PACKED]'):
+                name = name[:-len(' [PACKED]')]
+                packed_at.append(position)
+            names.append(name)
+        names = tuple(names)
+        id_at = names.index('id')
+        timestamp_at = names.index('timestamp')
+        scores_at = names.index('agent_scores')
+        weights_at = names.index('weights')
+
+        def parse(row: tuple) -> Dict[str, Any]:
+            if packed_at:
+                row = list(row)
+                for position in packed_at:
+                    if row[position] is not None:
+                        row[position] = _unpack(row[position])
+            record = dict(zip(names, row, strict=True))
+            if not row[scores_at]:
+                record['agent_scores'] = {}
+            if not row[weights_at]:
+                record['weights'] = {}
+            return record
+
+        def key_of(row: tuple) -> tuple:
+            return (row[timestamp_at], row[id_at])
+
+        return parse, key_of
+
+    def incremental_vacuum(
+        self,
+        pages: int = INCREMENTAL_VACUUM_PAGES,
+        min_free_pages: int = INCREMENTAL_VACUUM_MIN_FREE_PAGES
+    ) -> int:
+        """
+        Return up to `pages` free pages to the filesystem
+
+        Cheap enough to run often: only free pages are moved, and nothing
+        happens while the freelist is below min_free_pages. Requires
+        auto_vacuum=INCREMENTAL, which new files get at creation; files
+        created earlier need one full_vacuum first.
+
+        Returns:
+            Number of pages released
+        """
         try:
-            return {
-                'id': row['id'],
-                'symbol': row['symbol'],
-                'timestamp': row['timestamp'],
-                'composite_score': row['composite_score'],
-                'recommendation': row['recommendation'],
-                'confidence': row['confidence'],
-                'agent_scores': json.loads(row['agent_scores_json']) if row['agent_scores_json'] else {},
-                'weights': json.loads(row['weights_json']) if row['weights_json'] else {},
-                'market_regime': json.loads(row['market_regime_json']) if row['market_regime_json'] else None,
-                'price': row['price'],
-                'sector': row['sector'],
-                'narrative': row['narrative'],
-            }
+            with self._get_writer(transaction=False) as conn:
+                free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if free_before < min_free_pages:
+                    return 0
+                # Each step of the pragma frees one page; execute() only
+                # steps once, executescript() runs it to completion
+                conn.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+                released = free_before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+            logger.info(f"Incremental vacuum released {released} pages")
+            return released
         except Exception as e:
-            logger.error(f"Error parsing row: {e}")
-            return {}
+            logger.error(f"Incremental vacuum failed: {e}")
+            return 0
 
-    def vacuum_database(self):
+    def full_vacuum(self):
         """
-        Vacuum database outside of transaction
-        Should be called periodically (e.g., weekly)
+        Rewrite the whole database file outside of transaction
+
+        Blocks writers and needs free disk space for a full copy, so reserve
+        it for occasional (e.g., monthly) maintenance. Also switches files
+        created before auto_vacuum=INCREMENTAL to incremental mode.
         """
         try:
-            conn = self._get_connection()
-            conn.isolation_level = None  # Autocommit mode
-            conn.execute("VACUUM")
-            conn.isolation_level = ''  # Reset
+            with self._get_writer(transaction=False) as conn:
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
             logger.info("Database vacuumed successfully")
         except Exception as e:
             logger.error(f"Vacuum failed: {e}")
 
     def get_database_stats(self) -> Dict[str, Any]:
-        """Get database performance statistics"""
-        with self._transaction() as conn:
-            cursor = conn.cursor()
-
-            # Get table sizes
-            cursor.execute("""
-                SELECT name, COUNT(*) as count
-                FROM (
-                    SELECT 'stock_analyses' as name FROM stock_analyses
-                    UNION ALL
-                    SELECT 'market_regimes' FROM market_regimes
-                    UNION ALL
-                    SELECT 'watchlist' FROM watchlist
-                    UNION ALL
-                    SELECT 'user_searches' FROM user_searches
-                )
-                GROUP BY name
-            """)
+        """Get database performance statistics (cached for STATS_CACHE_TTL)"""
+        key = ('database_stats',)
+        cached = self._cache_get(key, 'stock_analyses', STATS_CACHE_TTL)
+        if cached is not None:
+            return cached
 
-            stats = {
-                'tables': {row['name']: row['count'] for row in cursor.fetchall()},
-                'db_size_mb': Path(self.db_path).stat().st_size / (1024 * 1024),
-                'optimizations_applied': True
+        version = self._table_versions['stock_analyses']
+        with self._get_reader() as conn:
+            # Plain COUNT(*) per table lets SQLite count B-tree entries
+            # (using the smallest index) rather than materializing rows
+            tables = {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in _STATS_TABLES
             }
 
-            return stats
+        stats = {
+            'tables': tables,
+            'db_size_mb': Path(self.db_path).stat().st_size / (1024 * 1024),
+            'optimizations_applied': True
+        }
+        self._cache_put(key, 'stock_analyses', version, stats)
+        return stats
@@ -17,46 +17,340 @@ Tables:
 import sqlite3
 import json
 import logging
-from datetime import datetime, timedelta
+import atexit
+import functools
+import math
+import os
+import queue
+import threading
+import time
+import weakref
 from typing import List, Dict, Any, Optional, Tuple
 from contextlib import contextmanager
 from pathlib import Path
 
 from core.exceptions import DatabaseException
 
+# Optional C JSON codec for the stock_analyses JSON columns
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# How long get_current_regime serves its cached row
+REGIME_CACHE_TTL = 60  # seconds
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+
+# get_top_performers calls with min_score at or above this narrow their
+# candidate symbols through the partial idx_stock_analyses_hot index
+HOT_SCORE_THRESHOLD = 60
+
+# cleanup_old_data deletes at most this many rows per committed
+# transaction, then returns up to CLEANUP_VACUUM_PAGES free pages
+CLEANUP_BATCH_SIZE = 5000
+CLEANUP_VACUUM_PAGES = 1000
+
+# track_search rows are written by a background thread, at most this
+# many per transaction
+SEARCH_FLUSH_BATCH_SIZE = 1000
+
+# Oldest rows first, one batch at a time; the IN (... LIMIT) form works
+# without SQLITE_ENABLE_UPDATE_DELETE_LIMIT
+_SQL_DELETE_OLD_BATCH = {
+    table: f"""
+        DELETE FROM {table}
+        WHERE id IN (
+            SELECT id FROM {table}
+            WHERE timestamp < datetime('now', ?)
+            ORDER BY timestamp
+            LIMIT ?
+        )
+    """
+    for table in ('stock_analyses', 'market_regimes', 'user_searches')
+}
+
+# Rows come back as plain tuples; queries select these columns explicitly
+# and the _parse_*_row helpers unpack them in this order
+_STOCK_ANALYSIS_COLUMNS = (
+    "id, symbol, timestamp, composite_score, recommendation, confidence, "
+    "agent_scores_json, weights_json, market_regime_json, price, sector, "
+    "narrative, created_at"
+)
+_REGIME_COLUMNS = (
+    "id, timestamp, regime, trend, volatility, weights_json, metrics_json, "
+    "created_at"
+)
+# lite=True reads skip the JSON columns (and their decoding) entirely
+_STOCK_ANALYSIS_LITE_FIELDS = (
+    'id', 'symbol', 'timestamp', 'composite_score', 'recommendation',
+    'confidence', 'price', 'sector'
+)
+_STOCK_ANALYSIS_LITE_COLUMNS = ", ".join(_STOCK_ANALYSIS_LITE_FIELDS)
+_SUMMARY_FIELDS = ('symbol', 'timestamp', 'composite_score', 'recommendation', 'sector')
+
+# Symbols with a qualifying score in the window; a superset of those whose
+# latest analysis qualifies. The literal threshold lets the planner use the
+# partial index (it cannot match a bound parameter against its WHERE).
+_SQL_HOT_SYMBOLS_FILTER = f"""
+                        AND symbol IN (
+                            SELECT symbol FROM stock_analyses
+                            WHERE composite_score >= {HOT_SCORE_THRESHOLD}
+                                AND composite_score >= ?2
+                                AND timestamp >= datetime('now', ?1)
+                        )"""
+
+# Built once per variant, so every call passes the statement cache an
+# equal SQL string. LIMIT is bound (-1 means no limit).
+_SQL_STOCK_HISTORY = {
+    lite: f"""
+                SELECT {columns} FROM stock_analyses
+                WHERE symbol = ? AND timestamp >= datetime('now', ?)
+                ORDER BY timestamp DESC
+                LIMIT ?
+            """
+    for lite, columns in ((False, _STOCK_ANALYSIS_COLUMNS), (True, _STOCK_ANALYSIS_LITE_COLUMNS))
+}
+
+# Keyed by (lite, hot); a NULL ?2 disables the score filter
+_SQL_TOP_PERFORMERS = {
+    (lite, hot): f"""
+                SELECT {columns} FROM (
+                    SELECT *, ROW_NUMBER() OVER (
+                        PARTITION BY symbol ORDER BY timestamp DESC, id DESC
+                    ) AS rn
+                    FROM stock_analyses
+                    WHERE timestamp >= datetime('now', ?1){_SQL_HOT_SYMBOLS_FILTER if hot else ""}
+                )
+                WHERE rn = 1 AND composite_score >= COALESCE(?2, -1e9)
+                ORDER BY composite_score DESC
+                LIMIT ?3
+            """
+    for lite, columns in ((False, _STOCK_ANALYSIS_COLUMNS), (True, _STOCK_ANALYSIS_LITE_COLUMNS))
+    for hot in (False, True)
+}
+
+# Tables and indexes, created by _init_schema in one script/transaction
+_SCHEMA_SQL = f"""
+BEGIN IMMEDIATE;
+
+CREATE TABLE IF NOT EXISTS stock_analyses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL COLLATE NOCASE,
+    timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    composite_score REAL NOT NULL,
+    recommendation TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    agent_scores_json TEXT NOT NULL,
+    weights_json TEXT NOT NULL,
+    market_regime_json TEXT,
+    price REAL,
+    sector TEXT,
+    narrative TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS market_regimes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    regime TEXT NOT NULL,
+    trend TEXT NOT NULL,
+    volatility TEXT NOT NULL,
+    weights_json TEXT NOT NULL,
+    metrics_json TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS watchlist (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL DEFAULT 'default',
+    symbol TEXT NOT NULL COLLATE NOCASE,
+    added_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    notes TEXT,
+    UNIQUE(user_id, symbol)
+);
+
+CREATE TABLE IF NOT EXISTS user_searches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL COLLATE NOCASE,
+    timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    source TEXT DEFAULT 'manual',
+    user_id TEXT DEFAULT 'default'
+);
+
+-- Indexes for stock_analyses
+CREATE INDEX IF NOT EXISTS idx_stock_analyses_symbol
+    ON stock_analyses(symbol);
+CREATE INDEX IF NOT EXISTS idx_stock_analyses_timestamp
+    ON stock_analyses(timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_stock_analyses_composite_score
+    ON stock_analyses(composite_score DESC);
+CREATE INDEX IF NOT EXISTS idx_stock_analyses_symbol_timestamp
+    ON stock_analyses(symbol, timestamp DESC);
+
+-- Covers get_top_performers_summary: ranking reads only index pages and
+-- never the JSON columns
+CREATE INDEX IF NOT EXISTS idx_stock_analyses_cover
+    ON stock_analyses(symbol, timestamp DESC, composite_score, recommendation, sector);
+
+-- Only the recent high scorers dashboards ask for; symbol is included so
+-- _SQL_HOT_SYMBOLS_FILTER never reads the table
+CREATE INDEX IF NOT EXISTS idx_stock_analyses_hot
+    ON stock_analyses(composite_score DESC, timestamp DESC, symbol)
+    WHERE composite_score >= {HOT_SCORE_THRESHOLD};
+
+-- Indexes for market_regimes
+CREATE INDEX IF NOT EXISTS idx_market_regimes_timestamp
+    ON market_regimes(timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_market_regimes_regime
+    ON market_regimes(regime);
+
+-- Indexes for watchlist
+CREATE INDEX IF NOT EXISTS idx_watchlist_user_id
+    ON watchlist(user_id);
+CREATE INDEX IF NOT EXISTS idx_watchlist_symbol
+    ON watchlist(symbol);
+
+-- Indexes for user_searches
+CREATE INDEX IF NOT EXISTS idx_user_searches_timestamp
+    ON user_searches(timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_user_searches_symbol
+    ON user_searches(symbol);
+
+COMMIT;
+"""
+
+
+def _has_non_finite(value: Any) -> bool:
+    """True if value holds a NaN or infinite float anywhere"""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(v) for v in value)
+    if hasattr(value, 'tolist'):  # numpy arrays and scalars
+        return _has_non_finite(value.tolist())
+    return False
+
+
+def _json_default(value: Any) -> Any:
+    """json.dumps hook for the numpy values orjson serializes natively"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value: Any) -> str:
+    """
+    JSON text for a *_json column; orjson when available, json otherwise
+
+    orjson writes NaN and Infinity as null, so payloads holding them go
+    through json.dumps, which keeps them as NaN/Infinity for _loads.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            encoded = orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+            if b'null' not in encoded or not _has_non_finite(value):
+                return encoded.decode()
+        except TypeError:
+            pass  # e.g. non-string dict keys, which json.dumps coerces
+    return json.dumps(value, default=_json_default)
+
+
+def _loads(data: str) -> Any:
+    """Parse a *_json column, falling back to json for NaN/Infinity orjson rejects"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
 
 class HistoricalDatabase:
-    """Manages historical data storage in SQLite"""
+    """
+    Manages historical data storage in SQLite
+
+    Connections live as long as the instance, so PRAGMAs run once and each
+    connection keeps a warm page cache. SQLite allows one writer at a
+    time, so a single writer connection is shared behind a lock; reads
+    borrow from a pool of read-only connections that WAL lets run
+    alongside the writer.
+    """
 
-    def __init__(self, db_path: str = "data/analysis_history.db"):
+    def __init__(self, db_path: str = "data/analysis_history.db", pool_size: int = 4):
         """
         Initialize database connection and create tables if needed
 
         Args:
             db_path: Path to SQLite database file
+            pool_size: Number of read-only connections in the pool
         """
         self.db_path = db_path
+        self.pool_size = pool_size
+
+        # Per-instance caches for lookups made on every request but rarely
+        # changed; this instance's writes invalidate them
+        self._watchlist_contains = functools.lru_cache(maxsize=4096)(self._query_watchlist_contains)
+        self._watchlist_rows = functools.lru_cache(maxsize=256)(self._query_watchlist)
+        self._regime_cache: Dict[str, Tuple[Optional[Dict[str, Any]], float]] = {}
+
+        # Write-behind queue for track_search; the writer thread starts on
+        # the first search
+        self._search_queue: queue.Queue = queue.Queue()
+        self._search_thread: Optional[threading.Thread] = None
+        self._search_thread_lock = threading.Lock()
 
         # Ensure data directory exists
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
+        self._writer_conn = self._open_connection(readonly=False)
+        self._writer_lock = threading.Lock()
+
         # Initialize database
-        self._create_tables()
-        self._create_indexes()
+        self._init_schema()
+
+        # Readers open read-only once the file and schema exist
+        self._reader_pool = self._open_reader_pool()
+        self._closed = False
+
+        # SQLite handles must not be used across fork(); forked workers
+        # reopen their own. Weak references keep both hooks from pinning
+        # this instance.
+        reset_ref = weakref.WeakMethod(self._reset_after_fork)
+        close_ref = weakref.WeakMethod(self.close)
+        os.register_at_fork(after_in_child=lambda: reset_ref() and reset_ref()())
+        self._atexit_hook = lambda: close_ref() and close_ref()()
+        atexit.register(self._atexit_hook)
+
         logger.info(f"Historical database initialized at {db_path}")
 
-    @contextmanager
-    def _get_connection(self):
-        """
-        Context manager with proper transaction support and error handling
+    def _open_connection(self, readonly: bool) -> sqlite3.Connection:
+        """Open a long-lived connection shared across threads, with PRAGMAs applied"""
+        if readonly:
+            conn = sqlite3.connect(
+                f"{Path(self.db_path).resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=STATEMENT_CACHE_SIZE
+            )
+        else:
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                isolation_level=None,  # Transactions are opened explicitly in _get_connection
+                cached_statements=STATEMENT_CACHE_SIZE
+            )
 
-        Provides ACID compliance with automatic commit/rollback
-        """
-        conn = None
-        try:
-            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            # Lets cleanup_old_data free pages without a full VACUUM. Only
+            # takes effect on a new, empty file, so it precedes journal_mode.
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
 
             # Enable Write-Ahead Logging for better concurrency
             conn.execute("PRAGMA journal_mode=WAL")
@@ -67,160 +361,172 @@ class HistoricalDatabase:
             # Enable foreign keys
             conn.execute("PRAGMA foreign_keys=ON")
 
-            # Enable column access by name
-            conn.row_factory = sqlite3.Row
+            # Truncate the WAL back to ~6MB after checkpoints
+            conn.execute("PRAGMA journal_size_limit=6144000")
 
-            yield conn
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")  # 64MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")  # 256MB memory-mapped I/O
+
+        # Lock contention is retried inside SQLite for up to 30s (the
+        # previous connect timeout), instead of failing with SQLITE_BUSY
+        conn.execute("PRAGMA busy_timeout=30000")
+
+        return conn
+
+    def _open_reader_pool(self) -> queue.Queue:
+        """Fill a bounded queue with pool_size read-only connections"""
+        pool: queue.Queue = queue.Queue(maxsize=self.pool_size)
+        for _ in range(self.pool_size):
+            pool.put(self._open_connection(readonly=True))
+        return pool
+
+    def _reset_after_fork(self):
+        """
+        Give a forked child fresh connections and locks
 
-            # Commit on success
-            conn.commit()
-            logger.debug("Database transaction committed")
+        The inherited handles are kept referenced but never used or closed:
+        closing them in the child could release the parent's file locks.
+        """
+        if self._closed:
+            return
+        self._inherited_connections = (self._writer_conn, self._reader_pool)
+        self._writer_lock = threading.Lock()
+        self._writer_conn = self._open_connection(readonly=False)
+        self._reader_pool = self._open_reader_pool()
+
+        # The parent's search writer thread does not exist in the child;
+        # searches still queued there are the parent's to write
+        self._search_queue = queue.Queue()
+        self._search_thread = None
+        self._search_thread_lock = threading.Lock()
+
+    def close(self):
+        """
+        Write queued searches, then close the writer and every pooled reader
+
+        Safe to call more than once.
+        """
+        # Under the search lock, so no search is queued behind the sentinel
+        with self._search_thread_lock:
+            if self._closed:
+                return
+            self._closed = True
+        atexit.unregister(self._atexit_hook)
+        if self._search_thread is not None:
+            self._search_queue.put(None)  # Stops the writer after pending searches
+            self._search_thread.join()
+        with self._writer_lock:
+            self._writer_conn.close()
+        while True:
+            try:
+                self._reader_pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    @contextmanager
+    def _translate_errors(self, conn: sqlite3.Connection):
+        """
+        Roll back an open transaction and raise DatabaseException on failure
+        """
+        try:
+            yield
 
         except sqlite3.IntegrityError as e:
-            if conn:
-                conn.rollback()
+            self._rollback(conn)
             logger.error(f"Database integrity error: {e}", exc_info=True)
             raise DatabaseException(f"Data integrity violation: {e}") from e
 
         except sqlite3.OperationalError as e:
-            if conn:
-                conn.rollback()
+            self._rollback(conn)
             logger.error(f"Database operational error: {e}", exc_info=True)
             raise DatabaseException(f"Database operation failed: {e}") from e
 
         except sqlite3.DatabaseError as e:
-            if conn:
-                conn.rollback()
+            self._rollback(conn)
             logger.error(f"Database error: {e}", exc_info=True)
             raise DatabaseException(f"Database error: {e}") from e
 
         except Exception as e:
-            if conn:
-                conn.rollback()
+            self._rollback(conn)
             logger.error(f"Unexpected database error: {e}", exc_info=True)
             raise DatabaseException(f"Unexpected database error: {e}") from e
 
-        finally:
-            if conn:
-                conn.close()
-
-    def _create_tables(self):
-        """Create database tables if they don't exist"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Stock analyses table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS stock_analyses (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    symbol TEXT NOT NULL,
-                    timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    composite_score REAL NOT NULL,
-                    recommendation TEXT NOT NULL,
-                    confidence REAL NOT NULL,
-                    agent_scores_json TEXT NOT NULL,
-                    weights_json TEXT NOT NULL,
-                    market_regime_json TEXT,
-                    price REAL,
-                    sector TEXT,
-                    narrative TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Market regimes table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS market_regimes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    regime TEXT NOT NULL,
-                    trend TEXT NOT NULL,
-                    volatility TEXT NOT NULL,
-                    weights_json TEXT NOT NULL,
-                    metrics_json TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Watchlist table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS watchlist (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT NOT NULL DEFAULT 'default',
-                    symbol TEXT NOT NULL,
-                    added_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    notes TEXT,
-                    UNIQUE(user_id, symbol)
-                )
-            """)
-
-            # User searches table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS user_searches (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    symbol TEXT NOT NULL,
-                    timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    source TEXT DEFAULT 'manual',
-                    user_id TEXT DEFAULT 'default'
-                )
-            """)
-
-            logger.info("Database tables created successfully")
+    @staticmethod
+    def _rollback(conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
 
-    def _create_indexes(self):
-        """Create database indexes for performance"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
+    @contextmanager
+    def _get_connection(self):
+        """
+        Hold the writer connection for one transaction
 
-            # Indexes for stock_analyses
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_stock_analyses_symbol
-                ON stock_analyses(symbol)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_stock_analyses_timestamp
-                ON stock_analyses(timestamp DESC)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_stock_analyses_composite_score
-                ON stock_analyses(composite_score DESC)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_stock_analyses_symbol_timestamp
-                ON stock_analyses(symbol, timestamp DESC)
-            """)
+        Provides ACID compliance with automatic commit/rollback
+        """
+        with self._writer_transaction("BEGIN") as conn:
+            yield conn
 
-            # Indexes for market_regimes
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_market_regimes_timestamp
-                ON market_regimes(timestamp DESC)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_market_regimes_regime
-                ON market_regimes(regime)
-            """)
+    @contextmanager
+    def _get_write_connection(self):
+        """
+        Like _get_connection, but takes SQLite's write lock up front
 
-            # Indexes for watchlist
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_watchlist_user_id
-                ON watchlist(user_id)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_watchlist_symbol
-                ON watchlist(symbol)
-            """)
+        BEGIN IMMEDIATE waits (up to busy_timeout) for other processes'
+        writers at the start. A deferred transaction would instead fail
+        with SQLITE_BUSY when its read lock cannot be upgraded at the
+        first write, which busy_timeout does not retry.
+        """
+        with self._writer_transaction("BEGIN IMMEDIATE") as conn:
+            yield conn
 
-            # Indexes for user_searches
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_user_searches_timestamp
-                ON user_searches(timestamp DESC)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_user_searches_symbol
-                ON user_searches(symbol)
-            """)
+    @contextmanager
+    def _writer_transaction(self, begin: str):
+        """Run one transaction on the writer connection, opened with `begin`"""
+        with self._writer_lock:
+            conn = self._writer_conn
+            with self._translate_errors(conn):
+                conn.execute(begin)
+                yield conn
+
+                # Commit on success
+                conn.execute("COMMIT")
+                logger.debug("Database transaction committed")
 
-            logger.info("Database indexes created successfully")
+    @contextmanager
+    def _get_reader(self):
+        """Borrow a read-only connection from the pool (blocks while all are in use)"""
+        conn = self._reader_pool.get()
+        try:
+            with self._translate_errors(conn):
+                yield conn
+        finally:
+            self._reader_pool.put(conn)
+
+    def _init_schema(self):
+        """Create database tables and indexes if they don't exist"""
+        # One executescript call: a single parse-and-run pass and one
+        # transaction instead of a round trip per CREATE statement
+        with self._writer_lock:
+            conn = self._writer_conn
+            with self._translate_errors(conn):
+                conn.executescript(_SCHEMA_SQL)
+
+                # Files created before symbol columns were COLLATE NOCASE
+                # keep IF NOT EXISTS tables; lookups there still upper()
+                legacy = conn.execute("""
+                    SELECT COUNT(*) FROM sqlite_master
+                    WHERE type = 'table'
+                        AND name IN ('stock_analyses', 'watchlist', 'user_searches')
+                        AND sql NOT LIKE '%symbol TEXT NOT NULL COLLATE NOCASE%'
+                """).fetchone()[0]
+        self._symbol_nocase = not legacy
+
+        logger.info("Database schema initialized successfully")
+
+    def _lookup_symbol(self, symbol: str) -> str:
+        """Symbol as bound in WHERE clauses (NOCASE columns compare it as-is)"""
+        return symbol if self._symbol_nocase else symbol.upper()
 
     # ========================================================================
     # Stock Analysis CRUD Operations
@@ -257,33 +563,71 @@ class HistoricalDatabase:
         Returns:
             ID of inserted record
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+        return self._insert_stock_analyses([{
+            'symbol': symbol,
+            'composite_score': composite_score,
+            'recommendation': recommendation,
+            'confidence': confidence,
+            'agent_scores': agent_scores,
+            'weights': weights,
+            'market_regime': market_regime,
+            'price': price,
+            'sector': sector,
+            'narrative': narrative
+        }])
+
+    def save_stock_analyses_bulk(self, analyses: List[Dict[str, Any]]) -> int:
+        """
+        Save many stock analyses in one transaction
+
+        Use this for screening sweeps instead of calling save_stock_analysis
+        per symbol: the rows share one prepared statement and one commit.
+
+        Args:
+            analyses: Dictionaries with the keyword arguments of
+                save_stock_analysis (market_regime, price, sector and
+                narrative may be omitted)
+
+        Returns:
+            Number of records inserted
+        """
+        if not analyses:
+            return 0
+        self._insert_stock_analyses(analyses)
+        return len(analyses)
+
+    def _insert_stock_analyses(self, analyses: List[Dict[str, Any]]) -> int:
+        """Insert analyses with executemany; returns the ID of the last row"""
+        # Serialize before taking the writer lock
+        rows = [(
+            a['symbol'].upper(),
+            a['composite_score'],
+            a['recommendation'],
+            a['confidence'],
+            _dumps(a['agent_scores']),
+            _dumps(a['weights']),
+            _dumps(a['market_regime']) if a.get('market_regime') else None,
+            a.get('price'),
+            a.get('sector'),
+            a.get('narrative')
+        ) for a in analyses]
+
+        with self._get_write_connection() as conn:
+            conn.executemany("""
                 INSERT INTO stock_analyses (
                     symbol, composite_score, recommendation, confidence,
                     agent_scores_json, weights_json, market_regime_json,
                     price, sector, narrative
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                symbol.upper(),
-                composite_score,
-                recommendation,
-                confidence,
-                json.dumps(agent_scores),
-                json.dumps(weights),
-                json.dumps(market_regime) if market_regime else None,
-                price,
-                sector,
-                narrative
-            ))
-            return cursor.lastrowid
+            """, rows)
+            return conn.execute("SELECT last_insert_rowid()").fetchone()[0]
 
     def get_stock_history(
         self,
         symbol: str,
         days: int = 30,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        lite: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Get historical analysis for a stock
@@ -292,28 +636,21 @@ class HistoricalDatabase:
             symbol: Stock symbol
             days: Number of days to look back
             limit: Maximum number of records to return
+            lite: Return only _STOCK_ANALYSIS_LITE_FIELDS (no agent_scores,
+                weights, market_regime or narrative)
 
         Returns:
             List of historical analyses
         """
-        with self._get_connection() as conn:
+        with self._get_reader() as conn:
             cursor = conn.cursor()
-
-            cutoff_date = datetime.now() - timedelta(days=days)
-
-            query = """
-                SELECT * FROM stock_analyses
-                WHERE symbol = ? AND timestamp >= ?
-                ORDER BY timestamp DESC
-            """
-
-            if limit:
-                query += f" LIMIT {limit}"
-
-            cursor.execute(query, (symbol.upper(), cutoff_date))
+            cursor.execute(
+                _SQL_STOCK_HISTORY[lite],
+                (self._lookup_symbol(symbol), f"-{days} days", limit or -1)
+            )
             rows = cursor.fetchall()
 
-            return [self._parse_stock_analysis_row(row) for row in rows]
+            return self._parse_stock_analysis_rows(rows, lite)
 
     def get_latest_stock_analysis(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
@@ -325,14 +662,22 @@ class HistoricalDatabase:
         Returns:
             Latest analysis or None
         """
-        history = self.get_stock_history(symbol, days=365, limit=1)
-        return history[0] if history else None
+        # One descent of idx_stock_analyses_symbol_timestamp, no date window
+        with self._get_reader() as conn:
+            row = conn.execute(f"""
+                SELECT {_STOCK_ANALYSIS_COLUMNS} FROM stock_analyses
+                WHERE symbol = ?
+                ORDER BY timestamp DESC, id DESC
+                LIMIT 1
+            """, (self._lookup_symbol(symbol),)).fetchone()
+        return self._parse_stock_analysis_row(row) if row else None
 
     def get_top_performers(
         self,
         days: int = 7,
         limit: int = 20,
-        min_score: Optional[float] = None
+        min_score: Optional[float] = None,
+        lite: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Get top performing stocks by composite score
@@ -341,38 +686,68 @@ class HistoricalDatabase:
             days: Number of days to look back
             limit: Maximum number of stocks to return
             min_score: Minimum composite score filter
+            lite: Return only _STOCK_ANALYSIS_LITE_FIELDS (no agent_scores,
+                weights, market_regime or narrative)
 
         Returns:
             List of top performing stocks
         """
-        with self._get_connection() as conn:
+        hot = min_score is not None and min_score >= HOT_SCORE_THRESHOLD
+        with self._get_reader() as conn:
             cursor = conn.cursor()
 
-            cutoff_date = datetime.now() - timedelta(days=days)
+            # Latest analysis for each symbol in the time window, picked in
+            # one walk of idx_stock_analyses_symbol_timestamp (partitions
+            # arrive in index order, so no join back to the table). The
+            # score filter and LIMIT are bound parameters (a NULL min_score
+            # disables the filter) so each statement is compiled once.
+            cursor.execute(
+                _SQL_TOP_PERFORMERS[lite, hot],
+                (f"-{days} days", min_score, limit)
+            )
+            rows = cursor.fetchall()
+
+            return self._parse_stock_analysis_rows(rows, lite)
 
-            # Get latest analysis for each symbol in the time window
-            query = """
-                WITH LatestAnalyses AS (
-                    SELECT symbol, MAX(timestamp) as max_timestamp
-                    FROM stock_analyses
-                    WHERE timestamp >= ?
-                    GROUP BY symbol
-                )
-                SELECT sa.* FROM stock_analyses sa
-                INNER JOIN LatestAnalyses la
-                    ON sa.symbol = la.symbol AND sa.timestamp = la.max_timestamp
-            """
+    def get_top_performers_summary(
+        self,
+        days: int = 7,
+        limit: int = 20,
+        min_score: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get top performing stocks without their scores/weights detail
 
-            if min_score:
-                query += f" WHERE sa.composite_score >= {min_score}"
+        Same selection as get_top_performers, but only symbol, timestamp,
+        composite_score, recommendation and sector are returned, all read
+        from idx_stock_analyses_cover.
 
-            query += " ORDER BY sa.composite_score DESC"
-            query += f" LIMIT {limit}"
+        Args:
+            days: Number of days to look back
+            limit: Maximum number of stocks to return
+            min_score: Minimum composite score filter
 
-            cursor.execute(query, (cutoff_date,))
-            rows = cursor.fetchall()
+        Returns:
+            List of top performing stocks
+        """
+        with self._get_reader() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT symbol, timestamp, composite_score, recommendation, sector FROM (
+                    SELECT symbol, timestamp, composite_score, recommendation, sector,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY symbol ORDER BY timestamp DESC, id DESC
+                        ) AS rn
+                    FROM stock_analyses
+                    WHERE timestamp >= datetime('now', ?)
+                )
+                WHERE rn = 1 AND composite_score >= COALESCE(?, -1e9)
+                ORDER BY composite_score DESC
+                LIMIT ?
+            """, (f"-{days} days", min_score, limit))
 
-            return [self._parse_stock_analysis_row(row) for row in rows]
+            return [dict(zip(_SUMMARY_FIELDS, row, strict=True)) for row in cursor.fetchall()]
 
     def get_score_trend(
         self,
@@ -389,9 +764,23 @@ class HistoricalDatabase:
         Returns:
             Trend statistics (avg, min, max, direction)
         """
-        history = self.get_stock_history(symbol, days=days)
+        # Aggregated in SQLite: one indexed range scan, no rows or JSON
+        # decoded in Python
+        with self._get_reader() as conn:
+            avg_score, min_score, max_score, count, recent_score, older_score = conn.execute("""
+                SELECT
+                    AVG(composite_score), MIN(composite_score), MAX(composite_score), COUNT(*),
+                    (SELECT composite_score FROM stock_analyses
+                     WHERE symbol = ?1 AND timestamp >= datetime('now', ?2)
+                     ORDER BY timestamp DESC, id DESC LIMIT 1),
+                    (SELECT composite_score FROM stock_analyses
+                     WHERE symbol = ?1 AND timestamp >= datetime('now', ?2)
+                     ORDER BY timestamp ASC, id ASC LIMIT 1)
+                FROM stock_analyses
+                WHERE symbol = ?1 AND timestamp >= datetime('now', ?2)
+            """, (self._lookup_symbol(symbol), f"-{days} days")).fetchone()
 
-        if not history or len(history) < 2:
+        if count < 2:
             return {
                 'trend': 'INSUFFICIENT_DATA',
                 'avg_score': None,
@@ -400,10 +789,6 @@ class HistoricalDatabase:
                 'change': None
             }
 
-        scores = [h['composite_score'] for h in history]
-        recent_score = history[0]['composite_score']
-        older_score = history[-1]['composite_score']
-
         change = recent_score - older_score
 
         if change > 5:
@@ -415,29 +800,38 @@ class HistoricalDatabase:
 
         return {
             'trend': trend,
-            'avg_score': sum(scores) / len(scores),
-            'min_score': min(scores),
-            'max_score': max(scores),
+            'avg_score': avg_score,
+            'min_score': min_score,
+            'max_score': max_score,
             'change': change,
-            'data_points': len(history)
+            'data_points': count
         }
 
-    def _parse_stock_analysis_row(self, row: sqlite3.Row) -> Dict[str, Any]:
+    def _parse_stock_analysis_rows(self, rows: List[Tuple], lite: bool) -> List[Dict[str, Any]]:
+        """Parse full or lite stock_analyses rows into dictionaries"""
+        if lite:
+            return [dict(zip(_STOCK_ANALYSIS_LITE_FIELDS, row, strict=True)) for row in rows]
+        return [self._parse_stock_analysis_row(row) for row in rows]
+
+    def _parse_stock_analysis_row(self, row: Tuple) -> Dict[str, Any]:
         """Parse database row into dictionary"""
+        (id_, symbol, timestamp, composite_score, recommendation, confidence,
+         agent_scores_json, weights_json, market_regime_json, price, sector,
+         narrative, created_at) = row
         return {
-            'id': row['id'],
-            'symbol': row['symbol'],
-            'timestamp': row['timestamp'],
-            'composite_score': row['composite_score'],
-            'recommendation': row['recommendation'],
-            'confidence': row['confidence'],
-            'agent_scores': json.loads(row['agent_scores_json']),
-            'weights': json.loads(row['weights_json']),
-            'market_regime': json.loads(row['market_regime_json']) if row['market_regime_json'] else None,
-            'price': row['price'],
-            'sector': row['sector'],
-            'narrative': row['narrative'],
-            'created_at': row['created_at']
+            'id': id_,
+            'symbol': symbol,
+            'timestamp': timestamp,
+            'composite_score': composite_score,
+            'recommendation': recommendation,
+            'confidence': confidence,
+            'agent_scores': _loads(agent_scores_json),
+            'weights': _loads(weights_json),
+            'market_regime': _loads(market_regime_json) if market_regime_json else None,
+            'price': price,
+            'sector': sector,
+            'narrative': narrative,
+            'created_at': created_at
         }
 
     # ========================================================================
@@ -465,7 +859,7 @@ class HistoricalDatabase:
         Returns:
             ID of inserted record
         """
-        with self._get_connection() as conn:
+        with self._get_write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO market_regimes (
@@ -475,10 +869,14 @@ class HistoricalDatabase:
                 regime,
                 trend,
                 volatility,
-                json.dumps(weights),
-                json.dumps(metrics) if metrics else None
+                _dumps(weights),
+                _dumps(metrics) if metrics else None
             ))
-            return cursor.lastrowid
+            regime_id = cursor.lastrowid
+
+        # A new regime replaces the cached current one
+        self._regime_cache.clear()
+        return regime_id
 
     def get_regime_history(
         self,
@@ -493,34 +891,49 @@ class HistoricalDatabase:
         Returns:
             List of market regime records
         """
-        with self._get_connection() as conn:
+        with self._get_reader() as conn:
             cursor = conn.cursor()
 
-            cutoff_date = datetime.now() - timedelta(days=days)
-
-            cursor.execute("""
-                SELECT * FROM market_regimes
-                WHERE timestamp >= ?
+            cursor.execute(f"""
+                SELECT {_REGIME_COLUMNS} FROM market_regimes
+                WHERE timestamp >= datetime('now', ?)
                 ORDER BY timestamp DESC
-            """, (cutoff_date,))
+            """, (f"-{days} days",))
 
             rows = cursor.fetchall()
 
-            return [{
-                'id': row['id'],
-                'timestamp': row['timestamp'],
-                'regime': row['regime'],
-                'trend': row['trend'],
-                'volatility': row['volatility'],
-                'weights': json.loads(row['weights_json']),
-                'metrics': json.loads(row['metrics_json']) if row['metrics_json'] else None,
-                'created_at': row['created_at']
-            } for row in rows]
+            return [self._parse_regime_row(row) for row in rows]
 
     def get_current_regime(self) -> Optional[Dict[str, Any]]:
-        """Get most recent market regime"""
-        history = self.get_regime_history(days=7)
-        return history[0] if history else None
+        """Get most recent market regime (cached for REGIME_CACHE_TTL)"""
+        cached = self._regime_cache.get('current')
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
+
+        with self._get_reader() as conn:
+            row = conn.execute(f"""
+                SELECT {_REGIME_COLUMNS} FROM market_regimes
+                ORDER BY timestamp DESC, id DESC
+                LIMIT 1
+            """).fetchone()
+        regime = self._parse_regime_row(row) if row else None
+        self._regime_cache['current'] = (regime, time.monotonic() + REGIME_CACHE_TTL)
+        return regime
+
+    def _parse_regime_row(self, row: Tuple) -> Dict[str, Any]:
+        """Parse market_regimes row (_REGIME_COLUMNS order) into dictionary"""
+        (id_, timestamp, regime, trend, volatility, weights_json, metrics_json,
+         created_at) = row
+        return {
+            'id': id_,
+            'timestamp': timestamp,
+            'regime': regime,
+            'trend': trend,
+            'volatility': volatility,
+            'weights': _loads(weights_json),
+            'metrics': _loads(metrics_json) if metrics_json else None,
+            'created_at': created_at
+        }
 
     # ========================================================================
     # Watchlist CRUD Operations
@@ -544,17 +957,19 @@ class HistoricalDatabase:
             True if added, False if already exists
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_write_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO watchlist (user_id, symbol, notes)
                     VALUES (?, ?, ?)
                 """, (user_id, symbol.upper(), notes))
-                return True
         except (sqlite3.IntegrityError, DatabaseException):
             logger.warning(f"Stock {symbol} already in watchlist for user {user_id}")
             return False
 
+        self._clear_watchlist_caches()
+        return True
+
     def remove_from_watchlist(
         self,
         symbol: str,
@@ -570,13 +985,17 @@ class HistoricalDatabase:
         Returns:
             True if removed, False if not found
         """
-        with self._get_connection() as conn:
+        with self._get_write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 DELETE FROM watchlist
                 WHERE user_id = ? AND symbol = ?
-            """, (user_id, symbol.upper()))
-            return cursor.rowcount > 0
+            """, (user_id, self._lookup_symbol(symbol)))
+            removed = cursor.rowcount > 0
+
+        if removed:
+            self._clear_watchlist_caches()
+        return removed
 
     def get_watchlist(self, user_id: str = 'default') -> List[Dict[str, Any]]:
         """
@@ -588,22 +1007,27 @@ class HistoricalDatabase:
         Returns:
             List of watchlist stocks
         """
-        with self._get_connection() as conn:
+        # Copies, so callers cannot modify the cached entries
+        return [dict(item) for item in self._watchlist_rows(user_id)]
+
+    def _query_watchlist(self, user_id: str) -> Tuple[Dict[str, Any], ...]:
+        """Uncached body of get_watchlist"""
+        with self._get_reader() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT * FROM watchlist
+                SELECT id, symbol, added_at, notes FROM watchlist
                 WHERE user_id = ?
                 ORDER BY added_at DESC
             """, (user_id,))
 
             rows = cursor.fetchall()
 
-            return [{
-                'id': row['id'],
-                'symbol': row['symbol'],
-                'added_at': row['added_at'],
-                'notes': row['notes']
-            } for row in rows]
+            return tuple({
+                'id': id_,
+                'symbol': symbol,
+                'added_at': added_at,
+                'notes': notes
+            } for id_, symbol, added_at, notes in rows)
 
     def is_in_watchlist(
         self,
@@ -611,13 +1035,25 @@ class HistoricalDatabase:
         user_id: str = 'default'
     ) -> bool:
         """Check if stock is in watchlist"""
-        with self._get_connection() as conn:
+        return self._watchlist_contains(user_id, symbol.upper())
+
+    def _query_watchlist_contains(self, user_id: str, symbol: str) -> bool:
+        """Uncached body of is_in_watchlist"""
+        with self._get_reader() as conn:
             cursor = conn.cursor()
+            # Stops at the first hit of the UNIQUE(user_id, symbol) index
+            # instead of aggregating
             cursor.execute("""
-                SELECT COUNT(*) FROM watchlist
+                SELECT 1 FROM watchlist
                 WHERE user_id = ? AND symbol = ?
-            """, (user_id, symbol.upper()))
-            return cursor.fetchone()[0] > 0
+                LIMIT 1
+            """, (user_id, symbol))
+            return cursor.fetchone() is not None
+
+    def _clear_watchlist_caches(self):
+        """Drop cached watchlist lookups after a watchlist write"""
+        self._watchlist_contains.cache_clear()
+        self._watchlist_rows.cache_clear()
 
     # ========================================================================
     # User Search Tracking
@@ -629,13 +1065,69 @@ class HistoricalDatabase:
         source: str = 'manual',
         user_id: str = 'default'
     ):
-        """Track user search behavior"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO user_searches (symbol, source, user_id)
-                VALUES (?, ?, ?)
-            """, (symbol.upper(), source, user_id))
+        """
+        Track user search behavior
+
+        Returns immediately: the search is queued and written in batches
+        by a background thread. Call flush_searches to wait for it.
+        Searches tracked after close() are dropped.
+        """
+        with self._search_thread_lock:
+            if self._closed:
+                logger.warning(f"Database closed; search for {symbol} not recorded")
+                return
+            self._search_queue.put((symbol.upper(), source, user_id))
+            if self._search_thread is None:
+                # Only a weak reference to self, so an abandoned
+                # instance can still be collected and its thread exits
+                self._search_thread = threading.Thread(
+                    target=self._write_searches,
+                    args=(self._search_queue, weakref.ref(self)),
+                    name='search-writer',
+                    daemon=True
+                )
+                self._search_thread.start()
+
+    def flush_searches(self):
+        """Block until every search queued by track_search is written"""
+        thread = self._search_thread
+        if thread is not None and thread.is_alive():
+            self._search_queue.join()
+
+    @staticmethod
+    def _write_searches(search_queue: queue.Queue, db_ref: weakref.ref):
+        """Background loop: drain queued searches and insert them in batches"""
+        while True:
+            try:
+                batch = [search_queue.get(timeout=1.0)]
+            except queue.Empty:
+                if db_ref() is None:
+                    return
+                continue
+
+            while len(batch) < SEARCH_FLUSH_BATCH_SIZE:
+                try:
+                    batch.append(search_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            rows = [item for item in batch if item is not None]
+            db = db_ref()
+            if rows and db is not None:
+                try:
+                    with db._get_write_connection() as conn:
+                        conn.executemany("""
+                            INSERT INTO user_searches (symbol, source, user_id)
+                            VALUES (?, ?, ?)
+                        """, rows)
+                except Exception as e:
+                    logger.error(f"Failed to record {len(rows)} searches: {e}")
+            del db
+
+            for _ in batch:
+                search_queue.task_done()
+            if len(rows) < len(batch):
+                return  # close() asked the writer to stop
 
     def get_recent_searches(
         self,
@@ -643,7 +1135,8 @@ class HistoricalDatabase:
         limit: int = 10
     ) -> List[str]:
         """Get recent search symbols"""
-        with self._get_connection() as conn:
+        self.flush_searches()
+        with self._get_reader() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT DISTINCT symbol FROM user_searches
@@ -651,7 +1144,7 @@ class HistoricalDatabase:
                 ORDER BY timestamp DESC
                 LIMIT ?
             """, (user_id, limit))
-            return [row['symbol'] for row in cursor.fetchall()]
+            return [row[0] for row in cursor.fetchall()]
 
     # ========================================================================
     # Data Maintenance
@@ -664,75 +1157,96 @@ class HistoricalDatabase:
         Args:
             retention_days: Days to retain data
         """
-        cutoff_date = datetime.now() - timedelta(days=retention_days)
-
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Clean stock analyses
-            cursor.execute("""
-                DELETE FROM stock_analyses
-                WHERE timestamp < ?
-            """, (cutoff_date,))
-            analyses_deleted = cursor.rowcount
-
-            # Clean market regimes
-            cursor.execute("""
-                DELETE FROM market_regimes
-                WHERE timestamp < ?
-            """, (cutoff_date,))
-            regimes_deleted = cursor.rowcount
-
-            # Clean user searches (keep only 90 days)
-            search_cutoff = datetime.now() - timedelta(days=90)
-            cursor.execute("""
-                DELETE FROM user_searches
-                WHERE timestamp < ?
-            """, (search_cutoff,))
-            searches_deleted = cursor.rowcount
-
-            logger.info(
-                f"Cleaned up old data: {analyses_deleted} analyses, "
-                f"{regimes_deleted} regimes, {searches_deleted} searches"
-            )
+        cutoff = f"-{retention_days} days"
+
+        analyses_deleted = self._delete_old_rows('stock_analyses', cutoff)
+        regimes_deleted = self._delete_old_rows('market_regimes', cutoff)
+        self._regime_cache.clear()
+
+        # Clean user searches (keep only 90 days)
+        searches_deleted = self._delete_old_rows('user_searches', "-90 days")
+
+        logger.info(
+            f"Cleaned up old data: {analyses_deleted} analyses, "
+            f"{regimes_deleted} regimes, {searches_deleted} searches"
+        )
+
+        # Return a bounded number of free pages to the filesystem instead
+        # of rewriting the whole file with VACUUM. Files created before
+        # auto_vacuum=INCREMENTAL keep their free pages for reuse.
+        with self._writer_lock:
+            conn = self._writer_conn
+            with self._translate_errors(conn):
+                # executescript steps the pragma to completion; execute()
+                # would free a single page
+                conn.executescript(f"PRAGMA incremental_vacuum({CLEANUP_VACUUM_PAGES})")
+
+    def _delete_old_rows(self, table: str, cutoff: str) -> int:
+        """
+        Delete rows older than cutoff in CLEANUP_BATCH_SIZE batches
 
-            # Vacuum database to reclaim space
-            cursor.execute("VACUUM")
+        Each batch commits on its own, so the writer lock is released
+        between batches and other writes can get in.
+        """
+        deleted = 0
+        while True:
+            with self._get_write_connection() as conn:
+                cursor = conn.execute(_SQL_DELETE_OLD_BATCH[table], (cutoff, CLEANUP_BATCH_SIZE))
+            deleted += cursor.rowcount
+            if cursor.rowcount < CLEANUP_BATCH_SIZE:
+                return deleted
 
     def get_database_stats(self) -> Dict[str, Any]:
         """Get database statistics"""
-        with self._get_connection() as conn:
+        self.flush_searches()  # So user_searches_count includes queued searches
+        with self._get_reader() as conn:
             cursor = conn.cursor()
 
-            stats = {}
-
-            # Count records in each table
-            for table in ['stock_analyses', 'market_regimes', 'watchlist', 'user_searches']:
-                cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                stats[f'{table}_count'] = cursor.fetchone()[0]
+            # Record counts and the analysis date range in one statement
+            cursor.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM stock_analyses),
+                    (SELECT COUNT(*) FROM market_regimes),
+                    (SELECT COUNT(*) FROM watchlist),
+                    (SELECT COUNT(*) FROM user_searches),
+                    (SELECT MIN(timestamp) FROM stock_analyses),
+                    (SELECT MAX(timestamp) FROM stock_analyses)
+            """)
+            (stock_analyses, market_regimes, watchlist, user_searches,
+             oldest, newest) = cursor.fetchone()
+
+            stats = {
+                'stock_analyses_count': stock_analyses,
+                'market_regimes_count': market_regimes,
+                'watchlist_count': watchlist,
+                'user_searches_count': user_searches,
+            }
 
             # Get database file size
             db_size = Path(self.db_path).stat().st_size / (1024 * 1024)  # MB
             stats['database_size_mb'] = round(db_size, 2)
 
-            # Get date range
-            cursor.execute("""
-                SELECT MIN(timestamp) as oldest, MAX(timestamp) as newest
-                FROM stock_analyses
-            """)
-            row = cursor.fetchone()
-            stats['oldest_analysis'] = row['oldest']
-            stats['newest_analysis'] = row['newest']
+            stats['oldest_analysis'] = oldest
+            stats['newest_analysis'] = newest
 
             return stats
 
-    def backup_database(self, backup_path: str):
+    def backup_database(self, backup_path: str, pages: int = 500):
         """
         Create database backup
 
+        Uses SQLite's online backup API, so the copy is a consistent
+        snapshot that includes committed WAL content, and writers keep
+        running while pages are copied in steps.
+
         Args:
             backup_path: Path for backup file
+            pages: Pages copied per step (the source is unlocked between steps)
         """
-        import shutil
-        shutil.copy2(self.db_path, backup_path)
+        dst = sqlite3.connect(backup_path)
+        try:
+            with self._get_reader() as src:
+                src.backup(dst, pages=pages)
+        finally:
+            dst.close()
         logger.info(f"Database backed up to {backup_path}")
@@ -4,20 +4,112 @@ Primary provider with intelligent fallback and circuit breaker protection
 Supports parallel batch fetching for improved performance
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, Optional, List
-from datetime import datetime
+from typing import Dict, Optional, List, Tuple
+from datetime import datetime, timedelta
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import pickle
+import time
+import weakref
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
 import threading
 
 from data.base_provider import BaseDataProvider
 from data.nse_provider import NSEProvider
-from data.yahoo_provider import YahooFinanceProvider
+from data.yahoo_provider import YahooFinanceProvider, create_http_session
 from utils.circuit_breaker import CircuitBreaker, CircuitBreakerError
 
+# Optional zstd codec for cached comprehensive data (stored uncompressed otherwise)
+try:
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# A provider that just failed for a symbol is not retried for this long
+NEGATIVE_CACHE_TTL = 60  # seconds
+# Expired negative-cache entries are purged once it grows past this size
+NEGATIVE_CACHE_MAX_ENTRIES = 10_000
+
+# Yahoo info fields copied into NSE data by _enrich_data: what the
+# fundamentals, sentiment and quality agents read (other Yahoo fields,
+# including its prices, are left out)
+_YAHOO_ENRICHMENT_KEYS = (
+    # Fundamentals
+    'returnOnEquity', 'returnOnAssets', 'trailingPE', 'forwardPE', 'pegRatio',
+    'priceToBook', 'bookValue', 'enterpriseValue', 'enterpriseToEbitda',
+    'revenueGrowth', 'earningsGrowth', 'earningsQuarterlyGrowth',
+    'profitMargins', 'grossMargins', 'operatingMargins',
+    'debtToEquity', 'currentRatio', 'quickRatio',
+    'freeCashflow', 'operatingCashflow',
+    'dividendYield', 'fiveYearAvgDividendYield', 'payoutRatio',
+    'heldPercentInsiders', 'insiderOwnership', 'marketCap',
+    # Analyst sentiment
+    'recommendationKey', 'recommendationMean', 'recommendationTrend',
+    'targetMeanPrice', 'targetHighPrice', 'targetLowPrice',
+    'numberOfAnalystOpinions',
+    # Classification
+    'sector', 'industry',
+)
+
+# Price fields the sentiment agent reads for target upside; merged only when
+# the primary provider has no value of its own
+_YAHOO_PRICE_KEYS = ('currentPrice', 'regularMarketPrice')
+
+# Callers waiting on another thread's fetch of the same symbol give up
+# after this long and fetch it themselves
+INFLIGHT_WAIT_TIMEOUT = 30  # seconds
+
+# How often buffered cache writes are compressed into the cache
+WRITE_BEHIND_INTERVAL = 0.5  # seconds
+
+# zstd level for cached payloads; low levels keep the hit path cheap
+CACHE_COMPRESSION_LEVEL = 3
+
+# OHLCV columns narrowed inside compressed cache entries; float32 holds
+# rupee prices to well under a paisa, so rounding to paise restores them
+_PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Adj Close')
+_PRICE_DECIMALS = 2
+_UINT32_MAX = np.iinfo(np.uint32).max
+
+
+def _downcast_ohlcv(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, np.dtype]]:
+    """
+    Narrow price columns to float32 and volume to uint32
+
+    Returns the narrowed frame and the original dtypes of the columns that
+    changed. A price column is narrowed only if _widen_ohlcv restores it
+    exactly, i.e. it holds whole paise within float32 precision; volume is
+    left alone if it has negatives, NaNs or values past uint32.
+    """
+    targets = {}
+    for col in _PRICE_COLUMNS:
+        if df.dtypes.get(col) != np.float64:
+            continue
+        prices = df[col].to_numpy()
+        restored = np.round(prices.astype(np.float32).astype(np.float64), _PRICE_DECIMALS)
+        if np.array_equal(restored, prices, equal_nan=True):
+            targets[col] = np.float32
+    if 'Volume' in df.columns:
+        volume = df['Volume'].to_numpy()
+        if (volume.dtype.kind in 'iu' and len(volume)
+                and volume.min() >= 0 and volume.max() <= _UINT32_MAX):
+            targets['Volume'] = np.uint32
+    if not targets:
+        return df, {}
+    original = {col: df.dtypes[col] for col in targets}
+    return df.astype(targets), original
+
+
+def _widen_ohlcv(df: pd.DataFrame, dtypes: Dict[str, np.dtype]) -> pd.DataFrame:
+    """Undo _downcast_ohlcv: restore dtypes and round prices back to paise"""
+    prices = {col: _PRICE_DECIMALS for col in dtypes if col in _PRICE_COLUMNS}
+    return df.astype(dtypes).round(prices)
+
 
 class HybridDataProvider(BaseDataProvider):
     """
@@ -41,7 +133,8 @@ class HybridDataProvider(BaseDataProvider):
         self,
         cache_duration: int = 1200,
         enable_yfinance_fallback: bool = True,
-        prefer_provider: str = "nse"  # "nse" or "yahoo"
+        prefer_provider: str = "nse",  # "nse" or "yahoo"
+        stale_window: int = 600
     ):
         """
         Initialize hybrid provider
@@ -50,28 +143,26 @@ class HybridDataProvider(BaseDataProvider):
             cache_duration: Cache TTL in seconds (default: 1200 = 20 min)
             enable_yfinance_fallback: Enable Yahoo Finance as fallback (default: True)
             prefer_provider: Preferred provider - "nse" or "yahoo" (default: "nse")
+            stale_window: Seconds past the TTL during which comprehensive data is
+                served stale while it refreshes in the background (default: 600)
         """
         super().__init__(cache_duration)
 
         self.enable_yfinance_fallback = enable_yfinance_fallback
         self.prefer_provider = prefer_provider
+        self.stale_window = stale_window
 
-        # Initialize providers
-        try:
-            self.nse_provider = NSEProvider(cache_duration=cache_duration)
-            self.nse_available = True
-            logger.info("NSE provider initialized successfully")
-        except Exception as e:
-            self.nse_available = False
-            logger.warning(f"NSE provider not available: {e}")
+        # Providers are constructed on first use (see the nse_provider /
+        # yahoo_provider properties); None means not attempted yet
+        self._nse_provider: Optional[NSEProvider] = None
+        self._nse_available: Optional[bool] = None
+        self._yahoo_provider: Optional[YahooFinanceProvider] = None
+        self._yahoo_available: Optional[bool] = None
+        self._provider_lock = threading.Lock()
 
-        try:
-            self.yahoo_provider = YahooFinanceProvider(cache_duration=cache_duration)
-            self.yahoo_available = True
-            logger.info("Yahoo Finance provider initialized successfully")
-        except Exception as e:
-            self.yahoo_available = False
-            logger.warning(f"Yahoo Finance provider not available: {e}")
+        # One keep-alive session for every Yahoo call, so concurrent fetches
+        # reuse pooled connections instead of new TCP+TLS handshakes
+        self._http_session = create_http_session()
 
         # Circuit breakers for each provider
         self.nse_circuit_breaker = CircuitBreaker(
@@ -85,15 +176,36 @@ class HybridDataProvider(BaseDataProvider):
             name="YahooFinance"
         )
 
-        # Track usage stats
-        self.stats = {
+        # provider name -> (is available, get provider, circuit breaker, display name),
+        # resolved once here so _try_provider has a single path for every provider.
+        # Availability and the provider go through the lazy properties.
+        self._provider_dispatch = {
+            'nse': (lambda: self.nse_available, lambda: self.nse_provider,
+                    self.nse_circuit_breaker, 'NSE'),
+            'yahoo': (lambda: self.yahoo_available, lambda: self.yahoo_provider,
+                      self.yahoo_circuit_breaker, 'Yahoo Finance'),
+        }
+
+        # Track usage stats. Batch fetches update them from several worker
+        # threads, so all reads and writes go through _stats_lock.
+        self.stats = Counter({
             'nse_success': 0,
             'nse_failure': 0,
             'yahoo_success': 0,
             'yahoo_failure': 0,
             'fallback_used': 0,
             'total_requests': 0
-        }
+        })
+        self._stats_lock = threading.Lock()
+        # Success rate per provider (percent), kept current by _record_outcome
+        self._success_rates: Dict[str, float] = {'nse': 0.0, 'yahoo': 0.0}
+
+        # (symbol, provider) -> monotonic expiry of a recent failure
+        self._neg_cache: Dict[Tuple[str, str], float] = {}
+
+        # Single-flight: symbol -> Future of the fetch already under way
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
 
         # Thread pool for parallel data fetching
         self.executor = ThreadPoolExecutor(
@@ -102,11 +214,120 @@ class HybridDataProvider(BaseDataProvider):
         )
         self._executor_lock = threading.Lock()
 
+        # Write-behind: freshly fetched data waits here (symbol -> (data, expiry))
+        # and a background thread compresses it into the cache, keeping that
+        # work off the request path. Reads check this buffer first.
+        self._write_buffer: Dict[str, Tuple[Dict, datetime]] = {}
+        self._write_lock = threading.Lock()
+        self._writer_stop = threading.Event()
+        # Only a weak reference to self, so an abandoned provider can still
+        # be collected and its writer thread exits
+        self._writer_thread = threading.Thread(
+            target=self._write_behind_loop,
+            args=(self._writer_stop, weakref.ref(self)),
+            name='hybrid-cache-writer',
+            daemon=True
+        )
+        self._writer_thread.start()
+
+    @property
+    def nse_provider(self) -> Optional[NSEProvider]:
+        """NSE provider, constructed on first access (None if unavailable)"""
+        if self._nse_available is None:
+            self._init_nse_provider()
+        return self._nse_provider
+
+    @nse_provider.setter
+    def nse_provider(self, provider: NSEProvider):
+        self._nse_provider = provider
+
+    @property
+    def nse_available(self) -> bool:
+        """Whether the NSE provider could be constructed"""
+        if self._nse_available is None:
+            self._init_nse_provider()
+        return self._nse_available
+
+    @nse_available.setter
+    def nse_available(self, available: bool):
+        self._nse_available = available
+
+    @property
+    def yahoo_provider(self) -> Optional[YahooFinanceProvider]:
+        """Yahoo Finance provider, constructed on first access (None if unavailable)"""
+        if self._yahoo_available is None:
+            self._init_yahoo_provider()
+        return self._yahoo_provider
+
+    @yahoo_provider.setter
+    def yahoo_provider(self, provider: YahooFinanceProvider):
+        self._yahoo_provider = provider
+
+    @property
+    def yahoo_available(self) -> bool:
+        """Whether the Yahoo Finance provider could be constructed"""
+        if self._yahoo_available is None:
+            self._init_yahoo_provider()
+        return self._yahoo_available
+
+    @yahoo_available.setter
+    def yahoo_available(self, available: bool):
+        self._yahoo_available = available
+
+    def _init_nse_provider(self):
+        """Construct the NSE provider once, recording whether it is available"""
+        with self._provider_lock:
+            if self._nse_available is not None:
+                return
+            try:
+                self._nse_provider = NSEProvider(cache_duration=self.cache_duration)
+                self._nse_available = True
+                logger.info("NSE provider initialized successfully")
+            except Exception as e:
+                self._nse_available = False
+                logger.warning(f"NSE provider not available: {e}")
+
+    def _init_yahoo_provider(self):
+        """Construct the Yahoo Finance provider once, recording whether it is available"""
+        with self._provider_lock:
+            if self._yahoo_available is not None:
+                return
+            try:
+                self._yahoo_provider = YahooFinanceProvider(
+                    cache_duration=self.cache_duration,
+                    session=self._http_session
+                )
+                self._yahoo_available = True
+                logger.info("Yahoo Finance provider initialized successfully")
+            except Exception as e:
+                self._yahoo_available = False
+                logger.warning(f"Yahoo Finance provider not available: {e}")
+
+    def _increment_stat(self, key: str):
+        """Increment a usage counter (safe across fetch threads)"""
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _record_outcome(self, provider: str, success: bool):
+        """Count a provider fetch outcome and refresh that provider's success rate"""
+        success_key = f'{provider}_success'
+        failure_key = f'{provider}_failure'
+        with self._stats_lock:
+            self.stats[success_key if success else failure_key] += 1
+            successes = self.stats[success_key]
+            self._success_rates[provider] = successes / (successes + self.stats[failure_key]) * 100
+
+    def _stats_snapshot(self) -> Dict[str, int]:
+        """Consistent copy of the usage counters"""
+        with self._stats_lock:
+            return dict(self.stats)
+
     def get_stock_data(self, symbol: str) -> Dict:
         """Fetch basic stock data with fallback"""
         data = self._fetch_with_fallback(
             symbol,
-            lambda provider: provider.get_stock_data(symbol)
+            lambda provider: provider.get_stock_data(symbol),
+            empty={}
         )
 
         # If we got data but no sector, try to enrich from Yahoo
@@ -136,7 +357,8 @@ class HybridDataProvider(BaseDataProvider):
         """Fetch historical data with fallback"""
         return self._fetch_with_fallback(
             symbol,
-            lambda provider: provider.get_historical_data(symbol, period, start_date, end_date)
+            lambda provider: provider.get_historical_data(symbol, period, start_date, end_date),
+            empty=pd.DataFrame()
         )
 
     def get_technical_indicators(self, historical_data: pd.DataFrame) -> Dict:
@@ -156,13 +378,153 @@ class HybridDataProvider(BaseDataProvider):
         2. Try preferred provider (NSE by default)
         3. Fall back to secondary provider if primary fails
         4. Merge data from both sources if available
+
+        Concurrent misses for the same symbol share one upstream fetch.
+        Entries less than stale_window past their TTL are returned as-is
+        while a background refresh replaces them (stale-while-revalidate).
         """
         # Check cache first
         cached = self._get_cached_data(symbol)
         if cached:
             return cached
 
-        self.stats['total_requests'] += 1
+        stale = self._get_stale_data(symbol)
+
+        with self._inflight_lock:
+            future = self._inflight.get(symbol)
+            leader = future is None
+            if leader:
+                future = self._inflight[symbol] = Future()
+
+        if stale is not None:
+            if leader:
+                logger.debug(f"Serving stale data for {symbol} while refreshing")
+                try:
+                    self.executor.submit(self._lead_fetch, symbol, future)
+                except RuntimeError:  # executor shut down
+                    self._lead_fetch(symbol, future)
+            return stale
+
+        if not leader:
+            try:
+                return future.result(timeout=INFLIGHT_WAIT_TIMEOUT)
+            except FutureTimeoutError:
+                logger.warning(f"Timed out waiting for in-flight fetch of {symbol}, fetching directly")
+                return self._fetch_comprehensive_data(symbol)
+
+        return self._lead_fetch(symbol, future)
+
+    def _lead_fetch(self, symbol: str, future: Future) -> Dict:
+        """Run the single in-flight fetch for symbol and publish it to waiters"""
+        try:
+            # A fetch that finished since the caller's cache check has cached its result
+            data = self._get_cached_data(symbol) or self._fetch_comprehensive_data(symbol)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(symbol, None)
+
+    def _get_stale_data(self, symbol: str) -> Optional[Dict]:
+        """Cached data past its TTL but still within stale_window, else None"""
+        expiry = self.cache_expiry.get(symbol)
+        if expiry is None or datetime.now() >= expiry + timedelta(seconds=self.stale_window):
+            return None
+        return self._decode_cache_entry(self.cache.get(symbol))
+
+    def _cache_data(self, symbol: str, data: Dict):
+        """
+        Queue data for the cache; the writer thread stores it within
+        WRITE_BEHIND_INTERVAL. Buffered entries are served by
+        _get_cached_data, and lost on a crash (they are just refetched).
+        """
+        expiry = datetime.now() + timedelta(seconds=self.cache_duration)
+        with self._write_lock:
+            self._write_buffer[symbol] = (data, expiry)
+
+    @staticmethod
+    def _write_behind_loop(stop: threading.Event, provider_ref: weakref.ref):
+        """Writer thread: flush buffered cache writes until shutdown"""
+        while not stop.wait(WRITE_BEHIND_INTERVAL):
+            provider = provider_ref()
+            if provider is None:
+                return
+            try:
+                provider._flush_cache_writes()
+            except Exception as e:
+                logger.error(f"Write-behind cache flush failed: {e}")
+            del provider
+
+    def _flush_cache_writes(self):
+        """Store every buffered entry in the cache"""
+        with self._write_lock:
+            pending = list(self._write_buffer.items())
+
+        for symbol, (data, expiry) in pending:
+            self._store_cache_entry(symbol, data, expiry)
+
+        # Drop entries only once stored, and only if no newer write replaced them
+        with self._write_lock:
+            for symbol, entry in pending:
+                if self._write_buffer.get(symbol) is entry:
+                    del self._write_buffer[symbol]
+
+    def _store_cache_entry(self, symbol: str, data: Dict, expiry: datetime):
+        """
+        Store data in the cache, zstd-compressed when zstandard is installed
+
+        Pickling keeps the DataFrames intact; compressing them cuts the
+        memory held by hundreds of cached symbols several-fold. OHLCV
+        columns that fit are stored as float32/uint32 and restored exactly
+        on read, so a cache hit sees the same prices as a miss.
+        """
+        if ZSTANDARD_AVAILABLE:
+            historical = data.get('historical_data')
+            dtypes = {}
+            if isinstance(historical, pd.DataFrame):
+                historical, dtypes = _downcast_ohlcv(historical)
+                data = {**data, 'historical_data': historical}
+            # Compressor objects are not thread-safe, so each call builds its own
+            data = zstandard.ZstdCompressor(level=CACHE_COMPRESSION_LEVEL).compress(
+                pickle.dumps((data, dtypes), protocol=pickle.HIGHEST_PROTOCOL)
+            )
+        self.cache[symbol] = data
+        self.cache_expiry[symbol] = expiry
+
+    def _get_cached_data(self, symbol: str) -> Optional[Dict]:
+        """Get cached data if fresh, from the write buffer or the decompressed cache"""
+        pending = self._write_buffer.get(symbol)
+        if pending is not None and datetime.now() < pending[1]:
+            return pending[0]
+        return self._decode_cache_entry(super()._get_cached_data(symbol))
+
+    def clear_cache(self, symbol: Optional[str] = None):
+        """Clear cache for a symbol or all symbols, including buffered writes"""
+        with self._write_lock:
+            if symbol:
+                self._write_buffer.pop(symbol, None)
+            else:
+                self._write_buffer.clear()
+        super().clear_cache(symbol)
+
+    @staticmethod
+    def _decode_cache_entry(entry) -> Optional[Dict]:
+        """Turn a cache entry back into its data dict (a fresh copy for compressed entries)"""
+        if isinstance(entry, bytes):
+            data, dtypes = pickle.loads(zstandard.ZstdDecompressor().decompress(entry))
+            if dtypes:
+                # Indicator code (TA-Lib) and the agents work in float64
+                data['historical_data'] = _widen_ohlcv(data['historical_data'], dtypes)
+            return data
+        return entry
+
+    def _fetch_comprehensive_data(self, symbol: str) -> Dict:
+        """Fetch, fall back, enrich and cache comprehensive data (cache miss path)"""
+        self._increment_stat('total_requests')
 
         logger.info(f"Fetching comprehensive data for {symbol} (hybrid mode)")
 
@@ -176,65 +538,71 @@ class HybridDataProvider(BaseDataProvider):
 
         # Try primary provider
         data = self._try_provider(symbol, primary_provider)
+        # Evaluated once per provider result; enrichment never changes it
+        empty = self._is_empty_data(data)
 
         # Fall back to secondary if needed
-        if self._is_empty_data(data) and self.enable_yfinance_fallback:
+        if empty and self.enable_yfinance_fallback:
             logger.info(f"Primary provider ({primary_provider}) failed, trying fallback ({secondary_provider})")
-            self.stats['fallback_used'] += 1
+            self._increment_stat('fallback_used')
             data = self._try_provider(symbol, secondary_provider)
+            empty = self._is_empty_data(data)
 
-        # If we have partial data, try to enrich from other provider
-        if not self._is_empty_data(data):
+        if not empty:
+            # If we have partial data, try to enrich from other provider
             data = self._enrich_data(symbol, data)
 
-        # Cache result
-        if not self._is_empty_data(data):
+            # Cache result
             self._cache_data(symbol, data)
 
         return data
 
     def _try_provider(self, symbol: str, provider_name: str) -> Dict:
         """Try fetching data from a specific provider with circuit breaker"""
-        if provider_name == "nse" and self.nse_available:
-            try:
-                data = self.nse_circuit_breaker.call(
-                    self.nse_provider.get_comprehensive_data,
-                    symbol
-                )
-                self.stats['nse_success'] += 1
-                logger.info(f"Successfully fetched data from NSE for {symbol}")
-                return data
-            except CircuitBreakerError as e:
-                logger.warning(f"NSE circuit breaker is open: {e}")
-                self.stats['nse_failure'] += 1
-                return self._create_empty_data(symbol, str(e))
-            except Exception as e:
-                logger.error(f"NSE provider failed for {symbol}: {e}")
-                self.stats['nse_failure'] += 1
-                return self._create_empty_data(symbol, str(e))
+        key = (symbol, provider_name)
+        if self._neg_cache.get(key, 0) > time.monotonic():
+            logger.debug(f"Skipping {provider_name} for {symbol}: failed in the last {NEGATIVE_CACHE_TTL}s")
+            return self._create_empty_data(symbol, f"{provider_name} recently failed for {symbol}")
 
-        elif provider_name == "yahoo" and self.yahoo_available:
-            try:
-                data = self.yahoo_circuit_breaker.call(
-                    self.yahoo_provider.get_comprehensive_data,
-                    symbol
-                )
-                self.stats['yahoo_success'] += 1
-                logger.info(f"Successfully fetched data from Yahoo Finance for {symbol}")
-                return data
-            except CircuitBreakerError as e:
-                logger.warning(f"Yahoo Finance circuit breaker is open: {e}")
-                self.stats['yahoo_failure'] += 1
-                return self._create_empty_data(symbol, str(e))
-            except Exception as e:
-                logger.error(f"Yahoo Finance provider failed for {symbol}: {e}")
-                self.stats['yahoo_failure'] += 1
-                return self._create_empty_data(symbol, str(e))
+        entry = self._provider_dispatch.get(provider_name)
+        if entry is None or not entry[0]():
+            return self._create_empty_data(symbol, f"Provider '{provider_name}' not available")
+        _, get_provider, circuit_breaker, label = entry
 
-        return self._create_empty_data(symbol, f"Provider '{provider_name}' not available")
+        try:
+            data = circuit_breaker.call(get_provider().get_comprehensive_data, symbol)
+            self._record_outcome(provider_name, True)
+            self._neg_cache.pop(key, None)
+            logger.info(f"Successfully fetched data from {label} for {symbol}")
+            return data
+        except CircuitBreakerError as e:
+            logger.warning(f"{label} circuit breaker is open: {e}")
+            error = e
+        except Exception as e:
+            logger.error(f"{label} provider failed for {symbol}: {e}")
+            error = e
+
+        self._record_outcome(provider_name, False)
+        self._remember_failure(key)
+        return self._create_empty_data(symbol, str(error))
+
+    def _remember_failure(self, key: Tuple[str, str]):
+        """Negative-cache a failed (symbol, provider) fetch for NEGATIVE_CACHE_TTL"""
+        now = time.monotonic()
+        if len(self._neg_cache) > NEGATIVE_CACHE_MAX_ENTRIES:
+            # Rebinding (not clearing in place) keeps concurrent readers safe
+            self._neg_cache = {k: exp for k, exp in list(self._neg_cache.items()) if exp > now}
+        self._neg_cache[key] = now + NEGATIVE_CACHE_TTL
+
+    def _fetch_with_fallback(self, symbol: str, fetch_func, empty):
+        """
+        Generic fetch with fallback logic
 
-    def _fetch_with_fallback(self, symbol: str, fetch_func):
-        """Generic fetch with fallback logic"""
+        Args:
+            symbol: Stock symbol
+            fetch_func: Called with a provider, returns its result
+            empty: Returned when no provider succeeds ({} or an empty DataFrame)
+        """
         # Try NSE first
         if self.nse_available:
             try:
@@ -252,7 +620,7 @@ class HybridDataProvider(BaseDataProvider):
             except Exception as e:
                 logger.warning(f"Yahoo Finance fetch failed: {e}")
 
-        return {} if isinstance(fetch_func(self.nse_provider), dict) else pd.DataFrame()
+        return empty
 
     def _is_empty_data(self, data: Dict) -> bool:
         """Check if data is empty/invalid"""
@@ -260,9 +628,9 @@ class HybridDataProvider(BaseDataProvider):
             return True
         if 'error' in data:
             return True
-        if data.get('historical_data') is None or (
-            isinstance(data.get('historical_data'), pd.DataFrame) and
-            data.get('historical_data').empty
+        historical = data.get('historical_data')
+        if historical is None or (
+            isinstance(historical, pd.DataFrame) and historical.empty
         ):
             return True
         return False
@@ -278,7 +646,8 @@ class HybridDataProvider(BaseDataProvider):
         """
         # If financials are missing, try to enrich from Yahoo regardless of which provider
         # was used. NSE never provides financials; Yahoo sometimes returns empty info too.
-        if self.yahoo_available and not data['data_completeness'].get('has_financials'):
+        # (has_financials is checked first so Yahoo is only constructed when needed)
+        if not data['data_completeness'].get('has_financials') and self.yahoo_available:
             # Skip if Yahoo was already the primary provider AND info already has financial keys
             FINANCIAL_KEYS = ['returnOnEquity', 'trailingPE', 'priceToBook',
                               'revenueGrowth', 'debtToEquity', 'profitMargins']
@@ -293,8 +662,19 @@ class HybridDataProvider(BaseDataProvider):
                     if not self._is_empty_data(yahoo_data):
                         data['financials'] = yahoo_data.get('financials', pd.DataFrame())
                         data['quarterly_financials'] = yahoo_data.get('quarterly_financials', pd.DataFrame())
-                        data.setdefault('info', {})
-                        data['info'].update(yahoo_data.get('info', {}))
+                        info = data.setdefault('info', {})
+                        yahoo_info = yahoo_data.get('info') or {}
+                        for key in _YAHOO_ENRICHMENT_KEYS:
+                            value = yahoo_info.get(key)
+                            if value is not None:
+                                info[key] = value
+                        # NSE reports its price as snake-case current_price
+                        nse_price = info.get('current_price')
+                        if info.get('currentPrice') is None and nse_price is not None:
+                            info['currentPrice'] = nse_price
+                        for key in _YAHOO_PRICE_KEYS:
+                            if info.get(key) is None and yahoo_info.get(key) is not None:
+                                info[key] = yahoo_info[key]
                         data['data_completeness']['has_financials'] = not yahoo_data.get('financials', pd.DataFrame()).empty
                         data['data_completeness']['has_quarterly'] = not yahoo_data.get('quarterly_financials', pd.DataFrame()).empty
                         provider_tag = data.get('provider', 'Unknown')
@@ -310,7 +690,7 @@ class HybridDataProvider(BaseDataProvider):
     def get_provider_stats(self) -> Dict:
         """Get usage statistics"""
         return {
-            **self.stats,
+            **self._stats_snapshot(),
             'nse_circuit_breaker': self.nse_circuit_breaker.get_state(),
             'yahoo_circuit_breaker': self.yahoo_circuit_breaker.get_state(),
             'cache_stats': self.get_cache_stats()
@@ -324,6 +704,7 @@ class HybridDataProvider(BaseDataProvider):
 
     def get_health_status(self) -> Dict:
         """Get health status of all providers"""
+        stats = self._stats_snapshot()
         return {
             'hybrid_provider': 'healthy',
             'nse_provider': {
@@ -336,15 +717,12 @@ class HybridDataProvider(BaseDataProvider):
                 'circuit_breaker_state': self.yahoo_circuit_breaker.state.value,
                 'success_rate': self._calculate_success_rate('yahoo')
             },
-            'stats': self.stats
+            'stats': stats
         }
 
     def _calculate_success_rate(self, provider: str) -> float:
-        """Calculate success rate for a provider"""
-        success = self.stats.get(f'{provider}_success', 0)
-        failure = self.stats.get(f'{provider}_failure', 0)
-        total = success + failure
-        return (success / total * 100) if total > 0 else 0.0
+        """Success rate for a provider (maintained as outcomes are recorded)"""
+        return self._success_rates.get(provider, 0.0)
 
     def get_batch_data(
         self,
@@ -360,7 +738,8 @@ class HybridDataProvider(BaseDataProvider):
 
         Args:
             symbols: List of stock symbols to fetch
-            max_workers: Maximum number of parallel workers (default: None = use pool default)
+            max_workers: Maximum number of parallel workers (default: None = use the
+                shared pool of 5; otherwise a dedicated pool of this size)
             timeout: Timeout in seconds for the entire batch operation (default: 60s)
 
         Returns:
@@ -378,20 +757,66 @@ class HybridDataProvider(BaseDataProvider):
         results = {}
         future_to_symbol = {}
 
-        # Submit all fetch tasks
-        with self._executor_lock:
-            for symbol in symbols:
-                future = self.executor.submit(self.get_comprehensive_data, symbol)
-                future_to_symbol[future] = symbol
+        # Serve fresh cache hits directly so workers only go to the network
+        to_fetch = []
+        for symbol in symbols:
+            cached = self._get_cached_data(symbol)
+            if cached:
+                results[symbol] = cached
+            else:
+                to_fetch.append(symbol)
+        completed = len(results)
+
+        if not to_fetch:
+            logger.info(f"Batch fetch served all {len(symbols)} symbols from cache")
+            return results
+
+        if max_workers is None:
+            executor = self.executor
+            own_executor = False
+        else:
+            executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix='data-fetch-batch'
+            )
+            own_executor = True
+
+        try:
+            # Submit all fetch tasks
+            with self._executor_lock:
+                for symbol in to_fetch:
+                    future = executor.submit(self.get_comprehensive_data, symbol)
+                    future_to_symbol[future] = symbol
+
+            # Collect results as they complete
+            results.update(self._collect_batch_results(future_to_symbol, len(symbols), completed, timeout))
+        finally:
+            if own_executor:
+                executor.shutdown(wait=False)
+
+        elapsed = (datetime.now() - start_time).total_seconds()
+        logger.info(
+            f"Batch fetch completed: {len(results)}/{len(symbols)} symbols in {elapsed:.2f}s "
+            f"({elapsed/len(symbols):.2f}s avg per symbol)"
+        )
+
+        return results
 
-        # Collect results as they complete
-        completed = 0
+    def _collect_batch_results(
+        self,
+        future_to_symbol: Dict,
+        total: int,
+        completed: int,
+        timeout: float
+    ) -> Dict[str, Dict]:
+        """Gather get_batch_data futures as they finish, recording failures as error dicts"""
+        results = {}
         for future in as_completed(future_to_symbol, timeout=timeout):
             symbol = future_to_symbol[future]
             try:
                 results[symbol] = future.result(timeout=30)
                 completed += 1
-                logger.debug(f"Completed {completed}/{len(symbols)}: {symbol}")
+                logger.debug(f"Completed {completed}/{total}: {symbol}")
             except Exception as e:
                 logger.error(f"Failed to fetch {symbol}: {e}")
                 results[symbol] = {
@@ -401,12 +826,6 @@ class HybridDataProvider(BaseDataProvider):
                 }
                 completed += 1
 
-        elapsed = (datetime.now() - start_time).total_seconds()
-        logger.info(
-            f"Batch fetch completed: {completed}/{len(symbols)} symbols in {elapsed:.2f}s "
-            f"({elapsed/len(symbols):.2f}s avg per symbol)"
-        )
-
         return results
 
     def shutdown(self):
@@ -418,11 +837,16 @@ class HybridDataProvider(BaseDataProvider):
         """
         logger.info("Shutting down hybrid provider thread pool")
         self.executor.shutdown(wait=True)
+        self._writer_stop.set()
+        self._writer_thread.join()
+        self._flush_cache_writes()
+        self._http_session.close()
 
     def __del__(self):
         """Cleanup executor on deletion"""
         try:
             self.executor.shutdown(wait=False)
+            self._writer_stop.set()
         except Exception:
             pass  # Ignore errors during cleanup
 
@@ -443,12 +867,14 @@ if __name__ == "__main__":
     # Test with multiple stocks
     test_symbols = ["TCS", "INFY", "RELIANCE"]
 
+    batch = provider.get_batch_data(test_symbols)
+
     for symbol in test_symbols:
         print(f"\n{'='*60}")
         print(f"Analyzing: {symbol}")
         print('='*60)
 
-        data = provider.get_comprehensive_data(symbol)
+        data = batch[symbol]
 
         print(f"Symbol: {data['symbol']}")
         print(f"Provider: {data.get('provider', 'Unknown')}")
@@ -457,7 +883,7 @@ if __name__ == "__main__":
         print(f"Market Cap: ₹{data['market_cap']/1e7:.2f} Cr" if data.get('market_cap') else "N/A")
         print(f"Sector: {data.get('sector', 'N/A')}")
         print(f"\nData Completeness:")
-        for key, value in data['data_completeness'].items():
+        for key, value in data.get('data_completeness', {}).items():
             print(f"  {key}: {value}")
         print(f"\nTechnical Indicators: {len(data.get('technical_data', {}))}")
 
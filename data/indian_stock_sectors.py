@@ -8,6 +8,12 @@ Data source: NSE sector classifications
 Last updated: 2026-02-09
 """
 
+import functools
+import sys
+import types
+from collections import defaultdict
+from typing import Dict, FrozenSet
+
 # Sector mapping for Indian stocks (Symbol -> Sector)
 INDIAN_STOCK_SECTORS = {
     # Financial Services
@@ -140,28 +146,53 @@ INDIAN_STOCK_SECTORS = {
     'ABFRL': 'Retail',
 }
 
+# Read-only at runtime; each sector name is one shared (interned) string
+INDIAN_STOCK_SECTORS = types.MappingProxyType({
+    symbol: sys.intern(sector) for symbol, sector in INDIAN_STOCK_SECTORS.items()
+})
+
+
+def _build_sector_index() -> Dict[str, FrozenSet[str]]:
+    """Group INDIAN_STOCK_SECTORS symbols by sector"""
+    index = defaultdict(list)
+    for symbol, sector in INDIAN_STOCK_SECTORS.items():
+        index[sector].append(symbol)
+    return {sector: frozenset(symbols) for sector, symbols in index.items()}
+
+
+# Reverse index built once at import: sector -> symbols. Frozensets give
+# callers O(1) membership tests on the shared, immutable result.
+_STOCKS_BY_SECTOR: Dict[str, FrozenSet[str]] = _build_sector_index()
+_ALL_SECTORS: FrozenSet[str] = frozenset(_STOCKS_BY_SECTOR)
+
 
+@functools.lru_cache(maxsize=4096)
 def get_sector(symbol: str) -> str:
     """
     Get sector for an Indian stock symbol.
 
     Args:
-        symbol: Stock symbol (with or without .NS suffix)
+        symbol: Stock symbol (with or without .NS/.BO suffix); results
+            are memoized
 
     Returns:
         Sector name or 'Unknown' if not found
     """
-    # Remove .NS suffix if present
-    clean_symbol = symbol.replace('.NS', '').replace('.BO', '').upper()
+    # Strip an exchange suffix and upper-case only when needed, so the
+    # common bare upper-case symbol allocates nothing
+    if symbol.endswith(('.NS', '.BO')):
+        symbol = symbol[:-3]
+    if not symbol.isupper():
+        symbol = symbol.upper()
 
-    return INDIAN_STOCK_SECTORS.get(clean_symbol, 'Unknown')
+    return INDIAN_STOCK_SECTORS.get(symbol, 'Unknown')
 
 
-def get_all_sectors() -> set:
-    """Get list of all unique sectors"""
-    return set(INDIAN_STOCK_SECTORS.values())
+def get_all_sectors() -> FrozenSet[str]:
+    """Get all unique sectors"""
+    return _ALL_SECTORS
 
 
-def get_stocks_by_sector(sector: str) -> list:
-    """Get all stocks in a given sector"""
-    return [symbol for symbol, sec in INDIAN_STOCK_SECTORS.items() if sec == sector]
+def get_stocks_by_sector(sector: str) -> FrozenSet[str]:
+    """Get all stocks in a given sector (empty set for an unknown sector)"""
+    return _STOCKS_BY_SECTOR.get(sector, frozenset())
@@ -18,9 +18,13 @@ Data includes:
 Data source: NSE India (as of Jan 2025)
 """
 
-from typing import Dict, List
+import sys
+import types
+from typing import Dict, List, Mapping, Tuple
 from datetime import datetime
 
+import numpy as np
+
 # Last update timestamp
 LAST_UPDATED = "2025-01-31"
 
@@ -646,57 +650,124 @@ NIFTY_FMCG = {
 }
 
 
+# ============================================================================
+# Freeze the index tables: the category strings are interned (one shared
+# object per distinct value) and each table becomes a read-only view
+# ============================================================================
+
+def _freeze_index(index_data: Dict[str, Dict]) -> Mapping[str, Mapping]:
+    """
+    Intern an index table's category strings and wrap it, and each stock's
+    row, read-only. Rows are shared by reference, so callers that need a
+    mutable record copy it ({**row} or dict(row)).
+    """
+    for symbol, data in index_data.items():
+        for field in ('sector', 'industry', 'market_cap'):
+            data[field] = sys.intern(data[field])
+        index_data[symbol] = types.MappingProxyType(data)
+    return types.MappingProxyType(index_data)
+
+
+NIFTY_50 = _freeze_index(NIFTY_50)
+NIFTY_BANK = _freeze_index(NIFTY_BANK)
+NIFTY_IT = _freeze_index(NIFTY_IT)
+NIFTY_AUTO = _freeze_index(NIFTY_AUTO)
+NIFTY_PHARMA = _freeze_index(NIFTY_PHARMA)
+NIFTY_FMCG = _freeze_index(NIFTY_FMCG)
+
+_ALL_INDICES: Mapping[str, Mapping[str, Mapping]] = types.MappingProxyType({
+    'NIFTY_50': NIFTY_50,
+    'NIFTY_BANK': NIFTY_BANK,
+    'NIFTY_IT': NIFTY_IT,
+    'NIFTY_AUTO': NIFTY_AUTO,
+    'NIFTY_PHARMA': NIFTY_PHARMA,
+    'NIFTY_FMCG': NIFTY_FMCG,
+})
+
+
+def _build_symbol_index() -> Tuple[Dict[str, Tuple[str, ...]], Dict[str, Mapping]]:
+    """Map each symbol to the indices listing it, and to its first listing's data"""
+    indices: Dict[str, List[str]] = {}
+    data_by_symbol: Dict[str, Mapping] = {}
+    for index_name, index_data in _ALL_INDICES.items():
+        for symbol, data in index_data.items():
+            indices.setdefault(symbol, []).append(index_name)
+            data_by_symbol.setdefault(symbol, data)
+    return {symbol: tuple(names) for symbol, names in indices.items()}, data_by_symbol
+
+
+# Reverse index built once at import: symbol -> indices containing it
+_SYMBOL_TO_INDICES, _SYMBOL_DATA = _build_symbol_index()
+
+
+# ============================================================================
+# NIFTY 50 column arrays (row i is the i-th NIFTY_50 entry), built once so
+# weight analytics run as numpy reductions instead of per-stock dict lookups
+# ============================================================================
+
+_SYMBOLS = np.array(list(NIFTY_50))
+_WEIGHTS = np.array([data['weight'] for data in NIFTY_50.values()], dtype=np.float64)
+_SECTORS = np.array([data['sector'] for data in NIFTY_50.values()])
+# Sorted unique sectors, and each row's position in that list
+_SECTOR_NAMES, _SECTOR_CODES = np.unique(_SECTORS, return_inverse=True)
+_SECTORS_SORTED: Tuple[str, ...] = tuple(_SECTOR_NAMES.tolist())
+
+
+def _build_sector_index() -> Dict[str, Tuple[str, ...]]:
+    """Group NIFTY 50 symbols by lower-cased sector (listing order)"""
+    index: Dict[str, List[str]] = {}
+    for symbol, data in NIFTY_50.items():
+        index.setdefault(data['sector'].lower(), []).append(symbol)
+    return {sector: tuple(symbols) for sector, symbols in index.items()}
+
+
+# Lower-cased sector -> NIFTY 50 symbols, for case-insensitive sector lookups
+_SECTOR_TO_SYMBOLS = _build_sector_index()
+
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
-def get_all_indices() -> Dict[str, Dict]:
-    """Get all available indices"""
-    return {
-        'NIFTY_50': NIFTY_50,
-        'NIFTY_BANK': NIFTY_BANK,
-        'NIFTY_IT': NIFTY_IT,
-        'NIFTY_AUTO': NIFTY_AUTO,
-        'NIFTY_PHARMA': NIFTY_PHARMA,
-        'NIFTY_FMCG': NIFTY_FMCG,
-    }
+def get_all_indices() -> Mapping[str, Mapping[str, Mapping]]:
+    """Get all available indices (read-only)"""
+    return _ALL_INDICES
 
 
 def get_symbols_by_index(index_name: str) -> List[str]:
     """Get list of symbols for an index"""
-    indices = get_all_indices()
-    index_data = indices.get(index_name.upper(), {})
+    index_data = _ALL_INDICES.get(index_name.upper(), {})
     return list(index_data.keys())
 
 
 def get_symbols_by_sector(sector: str) -> List[str]:
-    """Get all symbols in a sector"""
-    symbols = []
-    for symbol, data in NIFTY_50.items():
-        if data['sector'].lower() == sector.lower():
-            symbols.append(symbol)
-    return symbols
+    """Get all NIFTY 50 symbols in a sector (case-insensitive)"""
+    return list(_SECTOR_TO_SYMBOLS.get(sector.lower(), ()))
 
 
 def get_stock_info(symbol: str) -> Dict:
-    """Get stock information"""
-    # Check all indices
-    all_indices = get_all_indices()
-    for index_name, index_data in all_indices.items():
-        if symbol in index_data:
-            info = index_data[symbol].copy()
-            info['symbol'] = symbol
-            info['indices'] = [index_name]
-            return info
-    return {}
+    """Get stock information, listing every index that contains it"""
+    data = _SYMBOL_DATA.get(symbol)
+    if data is None:
+        return {}
+    return {**data, 'symbol': symbol, 'indices': list(_SYMBOL_TO_INDICES[symbol])}
 
 
 def get_sectors() -> List[str]:
     """Get all unique sectors"""
-    sectors = set()
-    for data in NIFTY_50.values():
-        sectors.add(data['sector'])
-    return sorted(list(sectors))
+    return list(_SECTORS_SORTED)
+
+
+def weights_by_sector() -> Dict[str, float]:
+    """Get total NIFTY 50 index weight per sector"""
+    totals = np.bincount(_SECTOR_CODES, weights=_WEIGHTS)
+    return dict(zip(_SECTOR_NAMES.tolist(), totals.tolist(), strict=True))
+
+
+def get_top_symbols_by_weight(limit: int = 10) -> List[str]:
+    """Get NIFTY 50 symbols with the largest index weights (ties keep listing order)"""
+    order = np.argsort(-_WEIGHTS, kind='stable')[:limit]
+    return _SYMBOLS[order].tolist()
 
 
 def get_market_cap_categories() -> List[str]:
@@ -726,10 +797,15 @@ if __name__ == "__main__":
 
     # Show top 10 by weight
     print(f"\n{'Top 10 by Weight':-^60}")
-    sorted_stocks = sorted(NIFTY_50.items(), key=lambda x: x[1]['weight'], reverse=True)
-    for symbol, data in sorted_stocks[:10]:
+    for symbol in get_top_symbols_by_weight(10):
+        data = NIFTY_50[symbol]
         print(f"  {symbol:12} {data['name']:30} {data['weight']:5.1f}%")
 
+    # Index weight per sector
+    print(f"\n{'Weight by Sector':-^60}")
+    for sector, weight in sorted(weights_by_sector().items(), key=lambda x: x[1], reverse=True):
+        print(f"  {sector:25} {weight:5.1f}%")
+
     # Show all indices
     print(f"\n{'Available Indices':-^60}")
     all_indices = get_all_indices()
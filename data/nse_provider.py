@@ -5,10 +5,13 @@ Primary data source for Indian stocks
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
+import functools
 import logging
-import time
+import math
+import re
 
 try:
     from nsepy import get_history
@@ -27,10 +30,38 @@ except ImportError:
 from data.base_provider import BaseDataProvider
 from core.exceptions import DataFetchException, DataValidationException
 from utils.math_helpers import safe_divide, safe_percentage_change
-from core.cache_manager import TechnicalIndicatorCache, get_cache_manager
+from core.cache_manager import TechnicalIndicatorCache, get_cache_manager, get_indicator_disk_cache
+from utils.rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Calendar days fetched for each supported period string
+_PERIOD_DAYS = {
+    '1mo': 30, '3mo': 90, '6mo': 180,
+    '1y': 365, '2y': 730, '5y': 1825
+}
+
+# Index symbols start with '^' or name NIFTY / SENSEX / CNX
+_INDEX_SYMBOL_RE = re.compile(r'\A\^|NIFTY|SENSEX|CNX', re.IGNORECASE)
+
+
+# Indicators returned as full arrays for trend analysis; every other
+# indicator is reported as its latest value
+_FULL_SERIES_INDICATORS = frozenset({'obv', 'ad'})
+
+
+def _latest_value(values: np.ndarray) -> Optional[float]:
+    """Last element of an indicator series, None while it is still NaN"""
+    latest = float(values[-1])
+    return None if math.isnan(latest) else latest
+
+
+@functools.lru_cache(maxsize=512)
+def _classify_symbol(symbol: str) -> Tuple[str, bool]:
+    """Return (symbol as NSEpy expects it, whether it is an index); memoized"""
+    # NSEpy doesn't use ^ prefix for symbols
+    return symbol.replace('^', ''), _INDEX_SYMBOL_RE.search(symbol) is not None
+
 
 class NSEProvider(BaseDataProvider):
     """
@@ -50,27 +81,29 @@ class NSEProvider(BaseDataProvider):
 
         Args:
             cache_duration: Cache TTL in seconds (default: 1200 = 20 min)
-            rate_limit_delay: Delay between requests in seconds (default: 0.5)
+            rate_limit_delay: Minimum spacing between requests in seconds,
+                across all threads sharing this provider (default: 0.5)
         """
         super().__init__(cache_duration)
         self.rate_limit_delay = rate_limit_delay
-        self.last_request_time = 0
+        # Concurrent fetches (e.g. HybridDataProvider.get_batch_data) share one
+        # bucket, so they overlap their network time but not the request rate
+        self._rate_limiter = TokenBucket(rate=1 / rate_limit_delay) if rate_limit_delay > 0 else None
 
         # Initialize technical indicator cache for incremental updates
         self.indicator_cache = TechnicalIndicatorCache(
             cache_manager=get_cache_manager(),
-            max_incremental_bars=5
+            max_incremental_bars=5,
+            disk_cache=get_indicator_disk_cache()
         )
 
         if not NSEPY_AVAILABLE:
             raise ImportError("NSEpy is required. Install with: pip install nsepy")
 
     def _rate_limit(self):
-        """Apply rate limiting between requests"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - elapsed)
-        self.last_request_time = time.time()
+        """Wait for this provider's next request slot"""
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
 
     def get_stock_data(self, symbol: str) -> Dict:
         """Fetch basic stock info from NSE"""
@@ -147,20 +180,12 @@ class NSEProvider(BaseDataProvider):
                 end_date = datetime.now()
             if start_date is None:
                 # Parse period string
-                period_map = {
-                    '1mo': 30, '3mo': 90, '6mo': 180,
-                    '1y': 365, '2y': 730, '5y': 1825
-                }
-                days = period_map.get(period, 730)
+                days = _PERIOD_DAYS.get(period, 730)
                 start_date = end_date - timedelta(days=days)
 
             logger.info(f"Fetching historical data for {symbol} from {start_date.date()} to {end_date.date()}")
 
-            # Detect if symbol is an index
-            is_index = symbol.startswith('^') or 'NIFTY' in symbol.upper() or 'SENSEX' in symbol.upper() or 'CNX' in symbol.upper()
-
-            # NSEpy doesn't use ^ prefix for symbols
-            clean_symbol = symbol.replace('^', '')
+            clean_symbol, is_index = _classify_symbol(symbol)
 
             logger.info(f"Fetching {'index' if is_index else 'stock'} data for {clean_symbol}")
 
@@ -176,16 +201,6 @@ class NSEProvider(BaseDataProvider):
                 logger.warning(f"No historical data found for {symbol}")
                 raise DataValidationException(f"No historical NSE data for {symbol}")
 
-            # Standardize column names
-            df = df.rename(columns={
-                'Date': 'Date',
-                'Open': 'Open',
-                'High': 'High',
-                'Low': 'Low',
-                'Close': 'Close',
-                'Volume': 'Volume'
-            })
-
             # Ensure numeric types
             for col in ['Open', 'High', 'Low', 'Close', 'Volume']:
                 if col in df.columns:
@@ -234,7 +249,7 @@ class NSEProvider(BaseDataProvider):
             return self.indicator_cache.get_indicators(
                 symbol=symbol,
                 price_data=historical_data,
-                calculator_func=lambda data: self._calculate_indicators(data)
+                calculator_func=self._calculate_indicators
             )
 
         # Direct calculation without cache
@@ -251,11 +266,12 @@ class NSEProvider(BaseDataProvider):
             Dictionary of technical indicators
         """
         try:
-            # Convert to numpy arrays
-            close = historical_data['Close'].values.astype(np.float64)
-            high = historical_data['High'].values.astype(np.float64)
-            low = historical_data['Low'].values.astype(np.float64)
-            volume = historical_data['Volume'].values.astype(np.float64)
+            # One column-major float64 buffer: each column is a contiguous
+            # view that every TA-Lib call reads without further copies
+            ohlcv = np.asfortranarray(
+                historical_data[['High', 'Low', 'Close', 'Volume']].to_numpy(dtype=np.float64)
+            )
+            high, low, close, volume = ohlcv.T
 
             indicators = {}
 
@@ -267,8 +283,12 @@ class NSEProvider(BaseDataProvider):
             indicators['roc'] = talib.ROC(close, timeperiod=10)
             indicators['momentum'] = talib.MOM(close, timeperiod=10)
 
-            # Trend Indicators
-            indicators['sma_20'] = talib.SMA(close, timeperiod=20)
+            # Bollinger Bands
+            indicators['bb_upper'], indicators['bb_middle'], indicators['bb_lower'] = \
+                talib.BBANDS(close, timeperiod=20, nbdevup=2, nbdevdn=2)
+
+            # Trend Indicators (the default BBANDS middle band is the 20-bar SMA)
+            indicators['sma_20'] = indicators['bb_middle']
             indicators['sma_50'] = talib.SMA(close, timeperiod=50)
             indicators['sma_200'] = talib.SMA(close, timeperiod=200)
             indicators['ema_12'] = talib.EMA(close, timeperiod=12)
@@ -280,16 +300,13 @@ class NSEProvider(BaseDataProvider):
             indicators['macd'], indicators['macd_signal'], indicators['macd_histogram'] = \
                 talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
 
-            # Bollinger Bands
-            indicators['bb_upper'], indicators['bb_middle'], indicators['bb_lower'] = \
-                talib.BBANDS(close, timeperiod=20, nbdevup=2, nbdevdn=2)
-
             # ADX
             indicators['adx'] = talib.ADX(high, low, close, timeperiod=14)
 
             # Volatility Indicators
             indicators['atr'] = talib.ATR(high, low, close, timeperiod=14)
-            indicators['natr'] = talib.NATR(high, low, close, timeperiod=14)
+            # NATR is ATR as a percentage of close; derive it rather than rerun ATR
+            indicators['natr'] = indicators['atr'] / close * 100
 
             # Volume Indicators (Critical for Institutional Flow Agent)
             indicators['obv'] = talib.OBV(close, volume)
@@ -304,15 +321,10 @@ class NSEProvider(BaseDataProvider):
             indicators['volume_zscore'] = self._calculate_volume_zscore(volume)
 
             # Extract latest values for scalar indicators
-            result = {}
-            for key, value in indicators.items():
-                if isinstance(value, np.ndarray):
-                    if key in ['obv', 'ad']:  # Keep full arrays for trend analysis
-                        result[key] = value
-                    else:
-                        result[key] = float(value[-1]) if not np.isnan(value[-1]) else None
-                else:
-                    result[key] = value
+            result = {
+                key: values if key in _FULL_SERIES_INDICATORS else _latest_value(values)
+                for key, values in indicators.items()
+            }
 
             logger.info(f"Calculated {len(result)} technical indicators")
             return result
@@ -324,35 +336,58 @@ class NSEProvider(BaseDataProvider):
     def _calculate_vwap(self, high, low, close, volume, window: int = 50) -> np.ndarray:
         """Calculate Volume Weighted Average Price using rolling window"""
         try:
-            # Convert to pandas Series for rolling operations
-            high_series = pd.Series(high)
-            low_series = pd.Series(low)
-            close_series = pd.Series(close)
-            volume_series = pd.Series(volume)
-
             # Calculate typical price
-            typical_price = (high_series + low_series + close_series) / 3
-
-            # Use rolling window instead of cumsum to prevent overflow
-            tp_volume = typical_price * volume_series
-            vwap = tp_volume.rolling(window=window).sum() / volume_series.rolling(window=window).sum()
-
-            # Fill initial NaN values with typical price
-            vwap = vwap.fillna(typical_price)
-
-            return vwap.values
+            typical_price = (high + low + close) / 3.0
+
+            # Rolling window sums as differences of prefix sums (window
+            # totals, not running cumulative VWAP, so old bars drop out)
+            tpv_sums = np.concatenate(([0.0], np.cumsum(typical_price * volume)))
+            volume_sums = np.concatenate(([0.0], np.cumsum(volume)))
+
+            # Bars before the first full window (and zero-volume windows)
+            # fall back to the typical price
+            vwap = typical_price.copy()
+            if len(vwap) >= window:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    rolling = (
+                        (tpv_sums[window:] - tpv_sums[:-window])
+                        / (volume_sums[window:] - volume_sums[:-window])
+                    )
+                full = vwap[window - 1:]
+                np.copyto(full, rolling, where=~np.isnan(rolling))
+
+            return vwap
         except Exception as e:
             logger.error(f"Failed to calculate VWAP: {e}")
             return np.array([])
 
     def _calculate_volume_zscore(self, volume, window: int = 20) -> np.ndarray:
-        """Calculate volume Z-score for spike detection"""
+        """
+        Calculate volume Z-score for spike detection
+
+        Computed in float32: about 7 significant digits is ample for a
+        spike score and halves the bytes each window pass reads. (VWAP
+        stays float64, since its prefix sums would lose that precision.)
+        """
         try:
-            volume_series = pd.Series(volume)
-            rolling_mean = volume_series.rolling(window=window).mean()
-            rolling_std = volume_series.rolling(window=window).std()
-            zscore = (volume_series - rolling_mean) / rolling_std
-            return zscore.fillna(0).values
+            zscore = np.zeros(len(volume), dtype=np.float32)
+            if len(volume) < window:
+                return zscore
+
+            volume = np.asarray(volume, dtype=np.float32)
+            # (bars - window + 1, window) strided view, no copy; each row's
+            # two-pass std avoids the cancellation of sum-of-squares formulas
+            windows = sliding_window_view(volume, window)
+            rolling_mean = windows.mean(axis=1)
+            rolling_std = windows.std(axis=1, ddof=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                zscore[window - 1:] = (volume[window - 1:] - rolling_mean) / rolling_std
+
+            # Flat windows score 0; tested exactly, since float32 rounding
+            # can leave them a tiny nonzero std
+            flat = np.ptp(windows, axis=1) == 0
+            zscore[window - 1:][flat] = 0.0
+            return np.nan_to_num(zscore, nan=0.0, copy=False)
         except Exception as e:
             logger.error(f"Failed to calculate volume Z-score: {e}")
             return np.zeros_like(volume)
@@ -360,23 +395,32 @@ class NSEProvider(BaseDataProvider):
     def _get_basic_indicators(self, historical_data: pd.DataFrame) -> Dict:
         """Calculate basic indicators without TA-Lib"""
         try:
-            close = historical_data['Close']
+            close = historical_data['Close'].to_numpy(dtype=np.float64)
+
+            # Only the latest value of each rolling mean is reported, so
+            # average the trailing window directly
+            def trailing_mean(values: np.ndarray, window: int) -> Optional[float]:
+                if len(values) < window:
+                    return None
+                mean = float(values[-window:].mean())
+                return None if np.isnan(mean) else mean
 
             # Simple Moving Averages
-            sma_20 = close.rolling(window=20).mean().iloc[-1]
-            sma_50 = close.rolling(window=50).mean().iloc[-1]
+            sma_20 = trailing_mean(close, 20)
+            sma_50 = trailing_mean(close, 50)
 
-            # Basic RSI
-            delta = close.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
+            # Basic RSI (simple-average gains and losses over 14 bars)
+            delta = np.diff(close[-15:])
+            gain = trailing_mean(np.where(delta > 0, delta, 0.0), 14)
+            loss = trailing_mean(np.where(delta < 0, -delta, 0.0), 14)
+            rsi = None
+            if gain is not None and loss is not None and (gain or loss):
+                rsi = 100.0 if loss == 0 else 100 - (100 / (1 + gain / loss))
 
             return {
-                'sma_20': float(sma_20) if not pd.isna(sma_20) else None,
-                'sma_50': float(sma_50) if not pd.isna(sma_50) else None,
-                'rsi': float(rsi.iloc[-1]) if not pd.isna(rsi.iloc[-1]) else None,
+                'sma_20': sma_20,
+                'sma_50': sma_50,
+                'rsi': rsi,
             }
         except Exception as e:
             logger.error(f"Failed to calculate basic indicators: {e}")
@@ -409,9 +453,9 @@ class NSEProvider(BaseDataProvider):
             week_52_high = None
             week_52_low = None
             if not historical_data.empty:
-                last_year = historical_data.iloc[-252:] if len(historical_data) >= 252 else historical_data
-                week_52_high = float(last_year['High'].max())
-                week_52_low = float(last_year['Low'].min())
+                # Last 252 trading days, reduced on the raw column arrays
+                week_52_high = float(np.nanmax(historical_data['High'].to_numpy()[-252:]))
+                week_52_low = float(np.nanmin(historical_data['Low'].to_numpy()[-252:]))
 
             # Assemble comprehensive data
             comprehensive_data = {
@@ -154,13 +154,14 @@ class StockUniverse:
             logger.warning(f"Symbol not found: {symbol}")
             return {}
 
-        # Get from first index that contains it
-        first_index = self._symbol_to_indices[symbol][0]
-        info = self.indices[first_index][symbol].copy()
-        info['symbol'] = symbol
-        info['indices'] = self._symbol_to_indices[symbol]
-
-        return info
+        # Get from first index that contains it (index rows are read-only,
+        # so build the caller's dict in one go)
+        indices = self._symbol_to_indices[symbol]
+        return {
+            **self.indices[indices[0]][symbol],
+            'symbol': symbol,
+            'indices': list(indices),
+        }
 
     def get_stocks_by_sector(self, sector: str, index: str = 'NIFTY_50') -> List[Dict]:
         """
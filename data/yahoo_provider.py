@@ -9,6 +9,9 @@ from typing import Dict, Optional
 from datetime import datetime, timedelta
 import logging
 import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 try:
     import yfinance as yf
@@ -23,12 +26,54 @@ try:
 except ImportError:
     TALIB_AVAILABLE = False
 
+# Recent yfinance talks to Yahoo through curl_cffi (browser TLS fingerprint);
+# a plain requests.Session gets rate-limited there, so shared sessions use it too
+try:
+    from curl_cffi import requests as curl_requests
+    CURL_CFFI_AVAILABLE = True
+except ImportError:
+    CURL_CFFI_AVAILABLE = False
+
 from data.base_provider import BaseDataProvider
-from core.cache_manager import TechnicalIndicatorCache, get_cache_manager
+from core.cache_manager import TechnicalIndicatorCache, get_cache_manager, get_indicator_disk_cache
 
 logger = logging.getLogger(__name__)
 
 
+def create_http_session(pool_maxsize: int = 64):
+    """
+    Create a keep-alive HTTP session to share across Yahoo Finance calls
+
+    Uses a curl_cffi session (the kind yfinance itself creates) when
+    curl_cffi is installed, otherwise a requests.Session with a pooled,
+    retrying HTTPAdapter.
+
+    Args:
+        pool_maxsize: Connections kept open per host (requests backend)
+
+    Returns:
+        Session object accepted by yf.Ticker / yf.download
+    """
+    if CURL_CFFI_AVAILABLE:
+        return curl_requests.Session(impersonate="chrome")
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=("GET", "HEAD")
+        )
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
 class YahooFinanceProvider(BaseDataProvider):
     """
     Data provider for Indian stocks using Yahoo Finance
@@ -45,7 +90,8 @@ class YahooFinanceProvider(BaseDataProvider):
         self,
         cache_duration: int = 1200,
         timeout: int = 15,
-        exchange: str = "NS"  # NS for NSE, BO for BSE
+        exchange: str = "NS",  # NS for NSE, BO for BSE
+        session=None
     ):
         """
         Initialize Yahoo Finance provider
@@ -54,15 +100,19 @@ class YahooFinanceProvider(BaseDataProvider):
             cache_duration: Cache TTL in seconds (default: 1200 = 20 min)
             timeout: Request timeout in seconds (default: 15)
             exchange: NSE (NS) or BSE (BO) - default: NS
+            session: Shared HTTP session (see create_http_session); None
+                lets yfinance use its own
         """
         super().__init__(cache_duration)
         self.timeout = timeout
         self.exchange = exchange
+        self.session = session
 
         # Initialize technical indicator cache for incremental updates
         self.indicator_cache = TechnicalIndicatorCache(
             cache_manager=get_cache_manager(),
-            max_incremental_bars=5
+            max_incremental_bars=5,
+            disk_cache=get_indicator_disk_cache()
         )
 
         if not YFINANCE_AVAILABLE:
@@ -91,7 +141,7 @@ class YahooFinanceProvider(BaseDataProvider):
         """Fetch basic stock info from Yahoo Finance"""
         try:
             symbol_with_suffix = self._add_exchange_suffix(symbol)
-            ticker = yf.Ticker(symbol_with_suffix)
+            ticker = yf.Ticker(symbol_with_suffix, session=self.session)
 
             # Get info (sometimes slow or incomplete)
             info = ticker.info
@@ -144,14 +194,16 @@ class YahooFinanceProvider(BaseDataProvider):
                     start=start_date,
                     end=end_date,
                     progress=False,
-                    timeout=self.timeout
+                    timeout=self.timeout,
+                    session=self.session
                 )
             else:
                 df = yf.download(
                     symbol_with_suffix,
                     period=period,
                     progress=False,
-                    timeout=self.timeout
+                    timeout=self.timeout,
+                    session=self.session
                 )
 
             if df.empty:
@@ -212,7 +264,7 @@ class YahooFinanceProvider(BaseDataProvider):
             return self.indicator_cache.get_indicators(
                 symbol=symbol,
                 price_data=historical_data,
-                calculator_func=lambda data: self._calculate_indicators(data)
+                calculator_func=self._calculate_indicators
             )
 
         # Direct calculation without cache
@@ -293,7 +345,7 @@ class YahooFinanceProvider(BaseDataProvider):
         """Get financial statements from Yahoo Finance"""
         try:
             symbol_with_suffix = self._add_exchange_suffix(symbol)
-            ticker = yf.Ticker(symbol_with_suffix)
+            ticker = yf.Ticker(symbol_with_suffix, session=self.session)
 
             return {
                 'financials': ticker.financials,
@@ -326,7 +378,7 @@ class YahooFinanceProvider(BaseDataProvider):
 
         try:
             symbol_with_suffix = self._add_exchange_suffix(symbol)
-            ticker = yf.Ticker(symbol_with_suffix)
+            ticker = yf.Ticker(symbol_with_suffix, session=self.session)
 
             # Get historical data (2 years)
             historical_data = self.get_historical_data(symbol, period="2y")
@@ -353,9 +405,9 @@ class YahooFinanceProvider(BaseDataProvider):
             week_52_high = info.get('fiftyTwoWeekHigh')
             week_52_low = info.get('fiftyTwoWeekLow')
             if (week_52_high is None or week_52_low is None) and not historical_data.empty:
-                last_year = historical_data.iloc[-252:] if len(historical_data) >= 252 else historical_data
-                week_52_high = week_52_high or float(last_year['High'].max())
-                week_52_low = week_52_low or float(last_year['Low'].min())
+                # Last 252 trading days, reduced on the raw column arrays
+                week_52_high = week_52_high or float(np.nanmax(historical_data['High'].to_numpy()[-252:]))
+                week_52_low = week_52_low or float(np.nanmin(historical_data['Low'].to_numpy()[-252:]))
 
             # Assemble comprehensive data
             comprehensive_data = {
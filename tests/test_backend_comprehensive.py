@@ -129,6 +129,160 @@ class TestHistoricalDatabase:
         assert all(h["symbol"] == sample_stock_data["symbol"] for h in history)
         assert history[0]["composite_score"] < history[-1]["composite_score"]  # Oldest first (ascending order by timestamp)
 
+    def test_save_stock_analyses_bulk(self, test_db, sample_stock_data):
+        """Test saving a batch of analyses in one transaction"""
+        analyses = [
+            {**sample_stock_data, "symbol": symbol, "composite_score": 60.0 + i}
+            for i, symbol in enumerate(["tcs", "INFY", "WIPRO"])
+        ]
+
+        assert test_db.save_stock_analyses_bulk(analyses) == 3
+        assert test_db.save_stock_analyses_bulk([]) == 0
+
+        latest = test_db.get_latest_stock_analysis("TCS")
+        assert latest["symbol"] == "TCS"
+        assert latest["agent_scores"] == sample_stock_data["agent_scores"]
+        assert latest["market_regime"] == sample_stock_data["market_regime"]
+
+    def test_get_top_performers_filters(self, test_db, sample_stock_data):
+        """Test min_score and limit on top performers"""
+        test_db.save_stock_analyses_bulk([
+            {**sample_stock_data, "symbol": f"S{i}", "composite_score": 50.0 + 10 * i}
+            for i in range(4)
+        ])
+
+        assert [p["symbol"] for p in test_db.get_top_performers()] == ["S3", "S2", "S1", "S0"]
+        assert [p["symbol"] for p in test_db.get_top_performers(min_score=65)] == ["S3", "S2"]
+        assert [p["symbol"] for p in test_db.get_top_performers(limit=1)] == ["S3"]
+        assert len(test_db.get_stock_history("S0", limit=None)) == 1
+
+        # Only each symbol's latest analysis counts, even within one second
+        test_db.save_stock_analysis(**{**sample_stock_data, "symbol": "S3", "composite_score": 40.0})
+        assert [p["symbol"] for p in test_db.get_top_performers()] == ["S2", "S1", "S0", "S3"]
+        # The hot-index path (min_score >= 60) still ranks latest analyses only
+        assert [p["symbol"] for p in test_db.get_top_performers(min_score=60)] == ["S2", "S1"]
+
+    def test_get_top_performers_summary(self, test_db, sample_stock_data):
+        """Test that the summary ranks like get_top_performers from the covering index"""
+        test_db.save_stock_analyses_bulk([
+            {**sample_stock_data, "symbol": f"S{i}", "composite_score": 50.0 + 10 * i}
+            for i in range(3)
+        ])
+
+        summary = test_db.get_top_performers_summary(min_score=55)
+        assert summary == [
+            {k: p[k] for k in ("symbol", "timestamp", "composite_score", "recommendation", "sector")}
+            for p in test_db.get_top_performers(min_score=55)
+        ]
+
+        with test_db._get_reader() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT symbol, timestamp, composite_score, recommendation, sector "
+                "FROM stock_analyses WHERE timestamp >= ? ORDER BY symbol, timestamp DESC",
+                ("2020-01-01",)
+            ).fetchall()
+        assert any("COVERING INDEX idx_stock_analyses_cover" in row[3] for row in plan)
+
+    def test_lite_reads_skip_json_columns(self, test_db, sample_stock_data):
+        """Test that lite=True reads return only the listing columns"""
+        test_db.save_stock_analysis(**sample_stock_data)
+        lite_fields = {'id', 'symbol', 'timestamp', 'composite_score', 'recommendation',
+                       'confidence', 'price', 'sector'}
+
+        full = test_db.get_stock_history("TEST")[0]
+        lite = test_db.get_stock_history("TEST", lite=True)[0]
+        assert set(lite) == lite_fields
+        assert lite == {k: full[k] for k in lite_fields}
+
+        top = test_db.get_top_performers(lite=True)
+        assert top == [lite]
+
+    def test_symbol_lookups_are_case_insensitive(self, test_db, sample_stock_data):
+        """Test that symbol columns compare case-insensitively (COLLATE NOCASE)"""
+        test_db.save_stock_analysis(**{**sample_stock_data, "symbol": "tcs"})
+        assert test_db._symbol_nocase
+        assert test_db.get_latest_stock_analysis("Tcs")["symbol"] == "TCS"
+        assert len(test_db.get_stock_history("tcs")) == 1
+
+        test_db.add_to_watchlist("infy")
+        with test_db._get_connection() as conn:
+            conn.execute("INSERT OR IGNORE INTO watchlist (symbol) VALUES ('Infy')")
+        assert len(test_db.get_watchlist()) == 1
+        assert test_db.remove_from_watchlist("Infy")
+
+    def test_symbol_lookups_on_legacy_schema(self, tmp_path, sample_stock_data):
+        """Test that files without NOCASE symbol columns still match any case"""
+        import sqlite3
+        db_path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE stock_analyses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                symbol TEXT NOT NULL,
+                timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                composite_score REAL NOT NULL,
+                recommendation TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                agent_scores_json TEXT NOT NULL,
+                weights_json TEXT NOT NULL,
+                market_regime_json TEXT,
+                price REAL,
+                sector TEXT,
+                narrative TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.close()
+
+        db = HistoricalDatabase(db_path=str(db_path))
+        try:
+            assert not db._symbol_nocase
+            db.save_stock_analysis(**sample_stock_data)
+            assert db.get_latest_stock_analysis("test")["symbol"] == "TEST"
+        finally:
+            db.close()
+
+    def test_json_columns_round_trip(self, test_db, sample_stock_data):
+        """Test that score/weight JSON survives values orjson cannot encode natively"""
+        agent_scores = {1: 70.0, "momentum": {"score": 65.5, "reasoning": "ok"}}
+        test_db.save_stock_analysis(**{**sample_stock_data, "agent_scores": agent_scores})
+        with test_db._get_connection() as conn:
+            conn.execute("UPDATE stock_analyses SET weights_json = '{\"momentum\": NaN}'")
+
+        latest = test_db.get_latest_stock_analysis("TEST")
+        assert latest["agent_scores"] == {"1": 70.0, "momentum": {"score": 65.5, "reasoning": "ok"}}
+        assert latest["weights"]["momentum"] != latest["weights"]["momentum"]
+
+    def test_non_finite_scores_are_kept(self, test_db, sample_stock_data):
+        """Test that NaN and infinite scores are stored as such, not as null"""
+        agent_scores = {"momentum": float("nan"), "quality": float("inf")}
+        test_db.save_stock_analysis(**{**sample_stock_data, "agent_scores": agent_scores})
+
+        latest = test_db.get_latest_stock_analysis("TEST")
+        assert latest["agent_scores"]["momentum"] != latest["agent_scores"]["momentum"]
+        assert latest["agent_scores"]["quality"] == float("inf")
+
+    def test_day_windows_use_utc_timestamps(self, test_db, sample_stock_data):
+        """Test that day windows compare against SQLite's UTC CURRENT_TIMESTAMP"""
+        test_db.save_stock_analysis(**sample_stock_data)
+        test_db.save_stock_analysis(**{**sample_stock_data, "symbol": "OLD"})
+        with test_db._get_connection() as conn:
+            conn.execute(
+                "UPDATE stock_analyses SET timestamp = datetime('now', '-8 days') WHERE symbol = 'OLD'"
+            )
+
+        assert [p["symbol"] for p in test_db.get_top_performers(days=7)] == ["TEST"]
+        assert len(test_db.get_stock_history("OLD", days=7)) == 0
+        assert len(test_db.get_stock_history("OLD", days=9)) == 1
+
+        with test_db._get_reader() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM stock_analyses "
+                "WHERE symbol = ? AND timestamp >= datetime('now', ?)",
+                ("TEST", "-7 days")
+            ).fetchall()
+        assert any("symbol=? AND timestamp>?" in row[3] for row in plan)
+
     def test_get_score_trend(self, test_db, sample_stock_data):
         """Test getting score trend"""
         # Save multiple analyses with different scores
@@ -153,6 +307,16 @@ class TestHistoricalDatabase:
         elif isinstance(trend, list):
             assert len(trend) == 5
 
+        assert trend == {
+            "trend": "IMPROVING",
+            "avg_score": 80.0,
+            "min_score": 70.0,
+            "max_score": 90.0,
+            "change": 20.0,
+            "data_points": 5
+        }
+        assert test_db.get_score_trend("NONE")["trend"] == "INSUFFICIENT_DATA"
+
     def test_watchlist_operations(self, test_db):
         """Test watchlist add, get, and remove operations"""
         # Add to watchlist
@@ -173,6 +337,33 @@ class TestHistoricalDatabase:
         watchlist = test_db.get_watchlist()
         assert len(watchlist) == 0
 
+    def test_watchlist_cache_invalidation(self, test_db):
+        """Test that cached watchlist lookups follow watchlist writes"""
+        assert test_db.is_in_watchlist("tcs") is False
+        assert test_db.get_watchlist() == []
+
+        test_db.add_to_watchlist("TCS")
+        assert test_db.is_in_watchlist("tcs") is True
+        watchlist = test_db.get_watchlist()
+        assert [w["symbol"] for w in watchlist] == ["TCS"]
+
+        # Returned entries are copies of the cached ones
+        watchlist[0]["symbol"] = "CHANGED"
+        assert test_db.get_watchlist()[0]["symbol"] == "TCS"
+
+        test_db.remove_from_watchlist("TCS")
+        assert test_db.is_in_watchlist("TCS") is False
+        assert test_db.get_watchlist() == []
+
+    def test_current_regime_cache_invalidation(self, test_db):
+        """Test that saving a regime replaces the cached current regime"""
+        test_db.save_market_regime("BULL", "BULL", "NORMAL", weights={})
+        assert test_db.get_current_regime()["regime"] == "BULL"
+        assert test_db.get_current_regime() is test_db.get_current_regime()
+
+        test_db.save_market_regime("BEAR", "BEAR", "HIGH", weights={})
+        assert test_db.get_current_regime()["regime"] == "BEAR"
+
     def test_duplicate_watchlist_entry(self, test_db):
         """Test that duplicate watchlist entries are prevented"""
         # Add same symbol twice
@@ -196,6 +387,22 @@ class TestHistoricalDatabase:
         assert isinstance(regime_id, int)
         assert regime_id > 0
 
+    def test_regime_json_round_trip(self, test_db):
+        """Test that regime weights/metrics round-trip, including numpy scalars"""
+        np = pytest.importorskip("numpy")
+        pytest.importorskip("orjson")
+        test_db.save_market_regime(
+            regime="BULL",
+            trend="BULL",
+            volatility="NORMAL",
+            weights={"momentum": np.float64(0.2)},
+            metrics={"breadth": np.int64(42), "vix": 14.5}
+        )
+
+        regime = test_db.get_current_regime()
+        assert regime["weights"] == {"momentum": 0.2}
+        assert regime["metrics"] == {"breadth": 42, "vix": 14.5}
+
     def test_get_regime_history(self, test_db):
         """Test retrieving regime history"""
         # Save multiple regime entries
@@ -215,12 +422,29 @@ class TestHistoricalDatabase:
         assert len(history) == 4
         assert history[0]["regime"] == "BULL"  # Latest first
 
+    def test_latest_analysis_and_current_regime(self, test_db, sample_stock_data):
+        """Test that the newest rows are returned regardless of age"""
+        assert test_db.get_latest_stock_analysis("TEST") is None
+        assert test_db.get_current_regime() is None
+
+        analysis_id = test_db.save_stock_analysis(**sample_stock_data)
+        test_db.save_market_regime("BEAR", "BEAR", "HIGH", weights={"momentum": 0.3})
+        with test_db._get_connection() as conn:
+            conn.execute("UPDATE stock_analyses SET timestamp = datetime('now', '-400 days')")
+            conn.execute("UPDATE market_regimes SET timestamp = datetime('now', '-30 days')")
+
+        assert test_db.get_latest_stock_analysis("test")["id"] == analysis_id
+        assert test_db.get_current_regime()["weights"] == {"momentum": 0.3}
+
     def test_track_search(self, test_db):
         """Test tracking user searches"""
         test_db.track_search("TCS", source="api")
         test_db.track_search("INFY", source="api")
         test_db.track_search("TCS", source="api")  # Duplicate
 
+        # Searches are written in the background
+        test_db.flush_searches()
+
         # Should have 3 entries (duplicates allowed for search tracking)
         with test_db._get_connection() as conn:
             cursor = conn.cursor()
@@ -228,6 +452,89 @@ class TestHistoricalDatabase:
             count = cursor.fetchone()[0]
             assert count == 3
 
+    def test_connections_are_reused(self, test_db):
+        """Test that calls share pooled connections instead of reconnecting"""
+        with test_db._get_connection() as first:
+            pass
+        with test_db._get_connection() as second:
+            pass
+        assert first is second
+
+        readers = {id(conn) for conn in test_db._reader_pool.queue}
+        test_db.get_watchlist()
+        assert {id(conn) for conn in test_db._reader_pool.queue} == readers
+
+        test_db.close()
+        test_db.close()
+        assert test_db._reader_pool.empty()
+
+    def test_cleanup_old_data(self, test_db, sample_stock_data, monkeypatch):
+        """Test batched cleanup and incremental vacuum"""
+        import data.historical_db as historical_db
+        monkeypatch.setattr(historical_db, "CLEANUP_BATCH_SIZE", 3)
+
+        test_db.save_stock_analyses_bulk([
+            {**sample_stock_data, "symbol": f"S{i}", "narrative": "x" * 4000} for i in range(10)
+        ])
+        test_db.track_search("TCS")
+        test_db.flush_searches()
+        with test_db._get_connection() as conn:
+            conn.execute("UPDATE stock_analyses SET timestamp = datetime('now', '-400 days') WHERE id <= 7")
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+        test_db.cleanup_old_data(retention_days=365)
+
+        with test_db._get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM stock_analyses").fetchone()[0] == 3
+            assert conn.execute("SELECT COUNT(*) FROM user_searches").fetchone()[0] == 1
+            assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+    def test_get_database_stats(self, test_db, sample_stock_data):
+        """Test record counts and the analysis date range"""
+        test_db.save_stock_analysis(**sample_stock_data)
+        test_db.save_market_regime("BULL", "BULL", "NORMAL", weights={})
+        test_db.add_to_watchlist("TCS")
+        test_db.track_search("TCS")
+
+        stats = test_db.get_database_stats()
+        assert stats['stock_analyses_count'] == 1
+        assert stats['market_regimes_count'] == 1
+        assert stats['watchlist_count'] == 1
+        assert stats['user_searches_count'] == 1
+        assert stats['oldest_analysis'] == stats['newest_analysis'] is not None
+        assert stats['database_size_mb'] >= 0
+
+    def test_backup_database(self, test_db, sample_stock_data, tmp_path):
+        """Test that the backup holds committed rows still in the WAL"""
+        test_db.save_stock_analysis(**sample_stock_data)
+        backup_path = str(tmp_path / "backup.db")
+
+        test_db.backup_database(backup_path, pages=1)
+
+        backup = HistoricalDatabase(db_path=backup_path)
+        assert backup.get_latest_stock_analysis("TEST")["narrative"] == "Test narrative"
+        backup.close()
+
+    def test_close_writes_queued_searches(self, test_db):
+        """Test that searches queued before close are not lost"""
+        for i in range(25):
+            test_db.track_search(f"S{i}")
+        test_db.close()
+
+        reopened = HistoricalDatabase(db_path=test_db.db_path)
+        assert len(reopened.get_recent_searches(limit=100)) == 25
+        reopened.close()
+
+    def test_track_search_after_close(self, test_db):
+        """Test that searches tracked after close are dropped instead of hanging flushes"""
+        test_db.track_search("TCS")
+        test_db.close()
+
+        test_db.track_search("INFY")
+        test_db.flush_searches()
+
+        assert test_db._search_queue.empty()
+
     def test_cleanup_method_exists(self, test_db):
         """Test that cleanup_old_data method exists"""
         # Note: VACUUM operation fails within transactions (context manager)
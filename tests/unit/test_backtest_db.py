@@ -0,0 +1,593 @@
+"""
+Unit tests for BacktestDatabase.
+
+Tests run persistence, retrieval, listing, deletion and query plans.
+"""
+
+import json
+import pytest
+import sqlite3
+import threading
+import time
+import uuid
+import numpy as np
+from datetime import datetime
+
+from core.backtester import BacktestResult, BacktestSummary
+import data.backtest_db as backtest_db
+from data.backtest_db import BacktestDatabase, APSW_AVAILABLE, COLUMNAR_AVAILABLE
+
+
+def _make_result(symbol: str, day: int, alpha: float = 1.5) -> BacktestResult:
+    return BacktestResult(
+        symbol=symbol,
+        date=datetime(2024, 1, day),
+        recommendation='BUY',
+        composite_score=72.5,
+        confidence=0.8,
+        entry_price=100.0,
+        exit_price=110.0,
+        forward_return_1m=2.0,
+        forward_return_3m=5.0,
+        forward_return_6m=None,
+        benchmark_return_1m=1.0,
+        benchmark_return_3m=3.5,
+        benchmark_return_6m=None,
+        alpha_1m=1.0,
+        alpha_3m=alpha,
+        alpha_6m=None,
+        agent_scores={'fundamentals': 70.0, 'momentum': 65.0},
+        market_regime='BULL',
+    )
+
+
+def _make_summary(total: int) -> BacktestSummary:
+    return BacktestSummary(
+        total_signals=total, total_buys=total, total_sells=0,
+        hit_rate_1m=60.0, hit_rate_3m=65.0, hit_rate_6m=0.0,
+        avg_return_1m=2.0, avg_return_3m=5.0, avg_return_6m=0.0,
+        avg_alpha_1m=1.0, avg_alpha_3m=1.5, avg_alpha_6m=0.0,
+        sharpe_ratio_1m=0.9, sharpe_ratio_3m=1.2, sharpe_ratio_6m=0.0,
+        max_drawdown=-8.0, win_rate=62.0, avg_win=4.0, avg_loss=-2.0,
+        win_loss_ratio=2.0,
+        performance_by_recommendation={'BUY': {'count': total}},
+        agent_correlations={'fundamentals': 0.3},
+        performance_by_regime={'BULL': {'count': total}},
+    )
+
+
+@pytest.fixture(params=[
+    pytest.param(True, id='apsw', marks=pytest.mark.skipif(not APSW_AVAILABLE, reason="apsw not installed")),
+    pytest.param(False, id='sqlite3'),
+])
+def db(request, tmp_path, monkeypatch):
+    monkeypatch.setattr(backtest_db, 'APSW_AVAILABLE', request.param)
+    return BacktestDatabase(db_path=str(tmp_path / 'backtest.db'))
+
+
+def _save(db, name='run', results=None):
+    results = results if results is not None else [_make_result('TCS', 1), _make_result('INFY', 2)]
+    return db.save_backtest_run(
+        name=name,
+        results=results,
+        summary=_make_summary(len(results)),
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 6, 30),
+        symbols=sorted({r.symbol for r in results}),
+        metadata={'source': 'test'},
+    )
+
+
+class TestBacktestDatabase:
+    """Test suite for BacktestDatabase"""
+
+    def test_save_and_get_run(self, db):
+        run_id = _save(db)
+        run = db.get_backtest_run(run_id)
+
+        assert run['run_id'] == run_id
+        assert run['total_signals'] == 2
+        assert run['summary']['hit_rate_3m'] == 65.0
+        assert run['metadata'] == {'source': 'test'}
+        assert [s['symbol'] for s in run['signals']] == ['TCS', 'INFY']
+        assert run['signals'][0]['agent_scores'] == {'fundamentals': 70.0, 'momentum': 65.0}
+
+    def test_get_missing_run_returns_none(self, db):
+        assert db.get_backtest_run('does-not-exist') is None
+
+    def test_list_runs_newest_first(self, db):
+        first = _save(db, name='first')
+        second = _save(db, name='second')
+
+        runs = db.list_backtest_runs(limit=10)
+        assert [r['run_id'] for r in runs] == [second, first]
+        assert db.list_backtest_runs(limit=1)[0]['name'] == 'second'
+
+    def test_list_runs_uses_created_at_index(self, db):
+        conn = sqlite3.connect(db.db_path)
+        plan = conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT run_id FROM backtest_runs
+            ORDER BY created_at DESC LIMIT 10
+        """).fetchall()
+        conn.close()
+
+        assert any('idx_runs_created_at' in row[-1] for row in plan)
+
+    def test_delete_run_removes_signals(self, db):
+        run_id = _save(db)
+
+        assert db.delete_backtest_run(run_id) is True
+        assert db.get_backtest_run(run_id) is None
+        assert db.get_signals_by_symbol('TCS') == []
+        assert db.delete_backtest_run(run_id) is False
+
+    def test_migrates_v3_signals_table(self, db):
+        run_id = _save(db)
+        # Rebuild the v3 layout: agent_scores inline, no cascade, no side tables
+        conn = sqlite3.connect(db.db_path)
+        conn.executescript("""
+            DROP TABLE backtest_agent_scores;
+            DROP TABLE backtest_agents;
+            ALTER TABLE backtest_signals RENAME TO signals_copy;
+            CREATE TABLE backtest_signals (
+                signal_id INTEGER PRIMARY KEY AUTOINCREMENT, run_id BLOB NOT NULL,
+                symbol TEXT NOT NULL, date INTEGER NOT NULL, recommendation TEXT NOT NULL,
+                composite_score REAL NOT NULL, confidence REAL NOT NULL,
+                entry_price REAL NOT NULL, exit_price REAL,
+                forward_return_1m REAL, forward_return_3m REAL, forward_return_6m REAL,
+                benchmark_return_1m REAL, benchmark_return_3m REAL, benchmark_return_6m REAL,
+                alpha_1m REAL, alpha_3m REAL, alpha_6m REAL,
+                agent_scores BLOB NOT NULL, market_regime TEXT,
+                FOREIGN KEY (run_id) REFERENCES backtest_runs(run_id)
+            );
+            INSERT INTO backtest_signals
+            SELECT signal_id, run_id, symbol, date, recommendation, composite_score, confidence,
+                   entry_price, exit_price, forward_return_1m, forward_return_3m, forward_return_6m,
+                   benchmark_return_1m, benchmark_return_3m, benchmark_return_6m,
+                   alpha_1m, alpha_3m, alpha_6m, '{"fundamentals": 70.0}', market_regime
+            FROM signals_copy;
+            DROP TABLE signals_copy;
+            PRAGMA user_version = 3;
+        """)
+        conn.close()
+
+        reopened = BacktestDatabase(db_path=db.db_path)
+        signals = reopened.get_backtest_run(run_id)['signals']
+        assert [s['agent_scores'] for s in signals] == [{'fundamentals': 70.0}] * 2
+        assert reopened.delete_backtest_run(run_id) is True
+
+        conn = sqlite3.connect(db.db_path)
+        assert conn.execute("SELECT COUNT(*) FROM backtest_signals").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM backtest_agent_scores").fetchone()[0] == 0
+        conn.close()
+
+    def test_signals_by_symbol(self, db):
+        run_id = _save(db, name='named')
+
+        signals = db.get_signals_by_symbol('INFY')
+        assert len(signals) == 1
+        assert signals[0]['run_id'] == run_id
+        assert signals[0]['run_name'] == 'named'
+        assert signals[0]['alpha_3m'] == 1.5
+
+    def test_binary_storage_round_trip(self, db):
+        run_id = _save(db)
+
+        conn = sqlite3.connect(db.db_path)
+        stored_id, stored_date = conn.execute(
+            "SELECT run_id, date FROM backtest_signals ORDER BY signal_id LIMIT 1"
+        ).fetchone()
+        conn.close()
+
+        assert isinstance(stored_id, bytes) and len(stored_id) == 16
+        assert isinstance(stored_date, int)
+        assert db.get_backtest_run(run_id)['signals'][0]['date'] == '2024-01-01T00:00:00'
+
+    def test_run_ids_are_time_ordered(self, db):
+        before_ms = int(time.time() * 1000)
+        run_ids = [_save(db, name=f'run{i}') for i in range(3)]
+
+        for run_id in run_ids:
+            parsed = uuid.UUID(run_id)
+            assert parsed.version == 7
+            assert parsed.variant == uuid.RFC_4122
+            assert parsed.int >> 80 >= before_ms
+        # Millisecond prefixes never go backwards
+        prefixes = [uuid.UUID(run_id).int >> 80 for run_id in run_ids]
+        assert prefixes == sorted(prefixes)
+
+    def test_malformed_run_id(self, db):
+        assert db.get_backtest_run('not-a-uuid') is None
+        assert db.delete_backtest_run('not-a-uuid') is False
+
+    def test_migrates_legacy_text_schema(self, tmp_path):
+        path = str(tmp_path / 'legacy.db')
+        run_id = '1b4e28ba-2fa1-11d2-883f-0016d3cca427'
+        conn = sqlite3.connect(path)
+        conn.executescript("""
+            CREATE TABLE backtest_runs (
+                run_id TEXT PRIMARY KEY, name TEXT NOT NULL, start_date TEXT NOT NULL,
+                end_date TEXT NOT NULL, symbols TEXT NOT NULL, frequency TEXT NOT NULL,
+                created_at TEXT NOT NULL, total_signals INTEGER NOT NULL,
+                summary TEXT NOT NULL, metadata TEXT
+            );
+            CREATE TABLE backtest_signals (
+                signal_id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL,
+                symbol TEXT NOT NULL, date TEXT NOT NULL, recommendation TEXT NOT NULL,
+                composite_score REAL NOT NULL, confidence REAL NOT NULL,
+                entry_price REAL NOT NULL, exit_price REAL,
+                forward_return_1m REAL, forward_return_3m REAL, forward_return_6m REAL,
+                benchmark_return_1m REAL, benchmark_return_3m REAL, benchmark_return_6m REAL,
+                alpha_1m REAL, alpha_3m REAL, alpha_6m REAL,
+                agent_scores TEXT NOT NULL, market_regime TEXT
+            );
+            CREATE INDEX idx_signals_run_id ON backtest_signals(run_id);
+        """)
+        conn.execute(
+            "INSERT INTO backtest_runs VALUES (?, 'old', '2023-01-01T00:00:00', '2023-12-31T00:00:00',"
+            " '[\"TCS\"]', 'monthly', '2024-01-01T00:00:00', 1, '{\"hit_rate_3m\": 55.0}', '{}')",
+            (run_id,),
+        )
+        conn.execute(
+            "INSERT INTO backtest_signals (run_id, symbol, date, recommendation, composite_score,"
+            " confidence, entry_price, alpha_3m, agent_scores, market_regime)"
+            " VALUES (?, 'TCS', '2023-03-01T00:00:00', 'BUY', 70, 0.7, 100, 2.5, '{}', 'BULL')",
+            (run_id,),
+        )
+        conn.commit()
+        conn.close()
+
+        db = BacktestDatabase(db_path=path)
+        run = db.get_backtest_run(run_id)
+
+        assert run['name'] == 'old'
+        assert run['signals'][0]['date'] == '2023-03-01T00:00:00'
+        assert db.list_backtest_runs()[0]['run_id'] == run_id
+        assert db.get_signals_by_symbol('TCS')[0]['alpha_3m'] == 2.5
+
+        # Re-opening an already-migrated database is a no-op
+        assert BacktestDatabase(db_path=path).get_backtest_run(run_id)['name'] == 'old'
+
+    def test_iter_signals_matches_get_run(self, db):
+        run_id = _save(db)
+
+        streamed = list(db.iter_backtest_signals(run_id))
+        assert streamed == db.get_backtest_run(run_id)['signals']
+        assert list(db.iter_backtest_signals('not-a-uuid')) == []
+
+    def test_get_run_without_agent_scores(self, db):
+        run_id = _save(db)
+
+        run = db.get_backtest_run(run_id, include_agent_scores=False)
+        assert all(s['agent_scores'] is None for s in run['signals'])
+        assert run['signals'][0]['alpha_3m'] == 1.5
+
+    def test_list_runs_from_summary_columns(self, db):
+        _save(db)
+
+        run = db.list_backtest_runs(include_full_summary=False)[0]
+        assert run['summary'] == {
+            'hit_rate_3m': 65.0,
+            'avg_alpha_3m': 1.5,
+            'sharpe_ratio_3m': 1.2,
+            'max_drawdown': -8.0,
+            'win_rate': 62.0,
+        }
+
+    def test_numpy_values_serialize(self, db):
+        result = _make_result('TCS', 1)
+        result.agent_scores = {'fundamentals': np.float32(70.0), 'momentum': np.int64(65)}
+        summary = _make_summary(1)
+        summary.performance_by_regime = {'BULL': {'count': np.int64(1), 'alpha': np.float64(2.5)}}
+
+        run_id = db.save_backtest_run(
+            name='numpy', results=[result], summary=summary,
+            start_date=datetime(2024, 1, 1), end_date=datetime(2024, 6, 30), symbols=['TCS'],
+        )
+        run = db.get_backtest_run(run_id)
+        assert run['summary']['performance_by_regime'] == {'BULL': {'count': 1, 'alpha': 2.5}}
+        assert run['signals'][0]['agent_scores'] == {'fundamentals': 70.0, 'momentum': 65.0}
+
+    def test_backfills_summary_columns_from_v1_schema(self, db):
+        _save(db)
+        conn = sqlite3.connect(db.db_path)
+        conn.execute("UPDATE backtest_runs SET hit_rate_3m = NULL, win_rate = NULL")
+        conn.execute("PRAGMA user_version = 1")
+        conn.commit()
+        conn.close()
+
+        reopened = BacktestDatabase(db_path=db.db_path)
+        summary = reopened.list_backtest_runs(include_full_summary=False)[0]['summary']
+        assert summary['hit_rate_3m'] == 65.0
+        assert summary['win_rate'] == 62.0
+
+
+@pytest.mark.skipif(not COLUMNAR_AVAILABLE, reason="duckdb/pyarrow not installed")
+class TestColumnarSignalStore:
+    """Test suite for the optional Parquet/DuckDB signal store"""
+
+    def test_signals_by_symbol_matches_sqlite(self, tmp_path):
+        path = str(tmp_path / 'backtest.db')
+        columnar = BacktestDatabase(db_path=path, columnar_dir=str(tmp_path / 'signals'))
+        run_id = _save(columnar, name='named')
+
+        assert (tmp_path / 'signals' / f'run_id={run_id}' / 'signals.parquet').exists()
+        rowstore = BacktestDatabase(db_path=path)
+        assert columnar.get_signals_by_symbol('INFY') == rowstore.get_signals_by_symbol('INFY')
+        assert columnar.get_signals_by_symbol('WIPRO') == []
+
+    def test_sync_and_delete(self, tmp_path):
+        path = str(tmp_path / 'backtest.db')
+        run_id = _save(BacktestDatabase(db_path=path))
+
+        # Runs saved before the store existed are exported on open
+        columnar = BacktestDatabase(db_path=path, columnar_dir=str(tmp_path / 'signals'))
+        assert columnar.get_signals_by_symbol('TCS')[0]['run_id'] == run_id
+
+        assert columnar.delete_backtest_run(run_id) is True
+        assert not (tmp_path / 'signals' / f'run_id={run_id}').exists()
+        assert columnar.get_signals_by_symbol('TCS') == []
+
+    def test_signals_arrow_matches_dict_api(self, tmp_path):
+        for columnar_dir in (None, str(tmp_path / 'signals')):
+            db = BacktestDatabase(db_path=str(tmp_path / 'backtest.db'), columnar_dir=columnar_dir)
+            run_id = _save(db)
+
+            table = db.get_signals_arrow(run_id)
+            signals = db.get_backtest_run(run_id)['signals']
+            assert table.num_rows == len(signals)
+            assert table.column('symbol').to_pylist() == [s['symbol'] for s in signals]
+            assert table.column('date').to_pylist()[0] == datetime(2024, 1, 1)
+
+            lite = db.get_signals_arrow(run_id, include_agent_scores=False)
+            assert 'agent_scores' not in lite.column_names
+            assert lite.column('alpha_3m').to_pylist() == [1.5, 1.5]
+
+        assert db.get_signals_arrow('1b4e28ba-2fa1-11d2-883f-0016d3cca427') is None
+
+
+class TestSignalBulkInsert:
+    """Test suite for chunked multi-row signal inserts"""
+
+    def test_save_spans_multiple_chunks(self, db):
+        results = [_make_result(f'SYM{i:03d}', 1 + i % 28, alpha=float(i)) for i in range(123)]
+        run_id = _save(db, results=results)
+
+        signals = db.get_backtest_run(run_id)['signals']
+        assert len(signals) == 123
+        assert sorted(s['alpha_3m'] for s in signals) == [float(i) for i in range(123)]
+
+    @pytest.mark.parametrize('count', [49, 50, 51, 100])
+    def test_chunk_boundaries(self, db, count):
+        results = [_make_result(f'SYM{i:03d}', 1 + i % 28, alpha=float(i)) for i in range(count)]
+        run_id = _save(db, results=results)
+
+        signals = db.get_backtest_run(run_id)['signals']
+        assert sorted(s['alpha_3m'] for s in signals) == [float(i) for i in range(count)]
+        assert all(s['agent_scores'] == {'fundamentals': 70.0, 'momentum': 65.0} for s in signals)
+
+
+class TestRunCache:
+    """Test suite for the in-process get_backtest_run cache"""
+
+    def test_repeat_reads_served_from_cache(self, db):
+        run_id = _save(db)
+        first = db.get_backtest_run(run_id)
+
+        # Changes behind the cache's back are not seen until invalidation
+        conn = sqlite3.connect(db.db_path)
+        conn.execute("UPDATE backtest_runs SET name = 'renamed'")
+        conn.commit()
+        conn.close()
+
+        second = db.get_backtest_run(run_id)
+        assert second == first and second['name'] == 'run'
+        assert db._run_cache.stats()['hits'] >= 1
+
+    def test_cached_copies_are_independent(self, db):
+        run_id = _save(db)
+        run = db.get_backtest_run(run_id)
+        with pytest.raises(TypeError):
+            run['signals'][0]['agent_scores']['fundamentals'] = 0.0
+        run['signals'].clear()
+        run['summary'].clear()
+
+        fresh = db.get_backtest_run(run_id)
+        assert fresh['signals'][0]['agent_scores']['fundamentals'] == 70.0
+        assert fresh['summary']['hit_rate_3m'] == 65.0
+
+    def test_delete_invalidates_cache(self, db):
+        run_id = _save(db)
+        db.get_backtest_run(run_id)
+        db.get_backtest_run(run_id, include_agent_scores=False)
+
+        assert db.delete_backtest_run(run_id) is True
+        assert db.get_backtest_run(run_id) is None
+        assert db.get_backtest_run(run_id, include_agent_scores=False) is None
+
+    def test_read_racing_delete_is_not_cached(self, db, monkeypatch):
+        run_id = _save(db)
+        fetch = db._fetch
+        calls = []
+
+        def fetch_then_delete(sql, params=()):
+            # The run is deleted after the read has loaded its metadata
+            calls.append(sql)
+            if len(calls) == 2:
+                assert db.delete_backtest_run(run_id) is True
+            return fetch(sql, params)
+
+        monkeypatch.setattr(db, '_fetch', fetch_then_delete)
+        db.get_backtest_run(run_id)
+        monkeypatch.setattr(db, '_fetch', fetch)
+
+        assert db.get_backtest_run(run_id) is None
+
+
+class TestStructOfArraysSave:
+    """Test suite for column-wise signal persistence"""
+
+    def test_soa_matches_object_save(self, db):
+        results = [_make_result('TCS', 1), _make_result('INFY', 2, alpha=np.nan)]
+        object_run = db.get_backtest_run(_save(db, results=results))
+
+        signals = {
+            'symbol': np.array(['TCS', 'INFY']),
+            'date': np.array(['2024-01-01', '2024-01-02'], dtype='datetime64[D]'),
+            'recommendation': ['BUY', 'BUY'],
+            'composite_score': np.full(2, 72.5),
+            'confidence': np.full(2, 0.8),
+            'entry_price': np.full(2, 100.0),
+            'exit_price': np.full(2, 110.0),
+            'forward_return_1m': np.full(2, 2.0),
+            'forward_return_3m': np.full(2, 5.0),
+            'benchmark_return_1m': np.full(2, 1.0),
+            'benchmark_return_3m': np.full(2, 3.5),
+            'alpha_1m': np.full(2, 1.0),
+            'alpha_3m': np.array([1.5, np.nan]),
+            'agent_scores': [r.agent_scores for r in results],
+            'market_regime': ['BULL', 'BULL'],
+        }
+        run_id = db.save_backtest_run_soa(
+            name='soa', signals=signals, summary=_make_summary(2),
+            start_date=datetime(2024, 1, 1), end_date=datetime(2024, 6, 30), symbols=['INFY', 'TCS'],
+        )
+        soa_run = db.get_backtest_run(run_id)
+
+        def strip(signal):
+            return {k: v for k, v in signal.items() if k != 'signal_id'}
+
+        assert soa_run['total_signals'] == 2
+        assert [strip(s) for s in soa_run['signals']] == [strip(s) for s in object_run['signals']]
+        assert soa_run['signals'][1]['alpha_3m'] is None
+
+    def test_soa_rejects_bad_columns(self, db):
+        kwargs = {'name': 'bad', 'summary': _make_summary(1), 'start_date': datetime(2024, 1, 1),
+                  'end_date': datetime(2024, 6, 30), 'symbols': ['TCS']}
+        with pytest.raises(ValueError, match='entry_price'):
+            db.save_backtest_run_soa(signals={
+                'symbol': ['TCS'], 'date': ['2024-01-01'], 'recommendation': ['BUY'],
+                'composite_score': [70.0], 'confidence': [0.7],
+            }, **kwargs)
+        with pytest.raises(ValueError, match='same length'):
+            db.save_backtest_run_soa(signals={
+                'symbol': ['TCS'], 'date': ['2024-01-01'], 'recommendation': ['BUY'],
+                'composite_score': [70.0], 'confidence': [0.7], 'entry_price': [100.0, 101.0],
+            }, **kwargs)
+        assert db.list_backtest_runs() == []
+
+
+class TestJsonBlobEncoding:
+    """Test suite for codec-prefixed JSON blob storage"""
+
+    def test_large_metadata_stored_compressed(self, db):
+        metadata = {'params': [{'agent': f'agent_{i}', 'weight': 0.2, 'note': 'steady'} for i in range(20)]}
+        run_id = db.save_backtest_run(
+            name='big', results=[_make_result('TCS', 1)], summary=_make_summary(1),
+            start_date=datetime(2024, 1, 1), end_date=datetime(2024, 6, 30), symbols=['TCS'],
+            metadata=metadata,
+        )
+
+        conn = sqlite3.connect(db.db_path)
+        stored = conn.execute("SELECT metadata FROM backtest_runs").fetchone()[0]
+        conn.close()
+
+        assert isinstance(stored, bytes) and stored[0] != 0
+        assert len(stored) < len(json.dumps(metadata))
+        assert db.get_backtest_run(run_id)['metadata'] == metadata
+
+    def test_reads_rows_written_as_json_text(self, db):
+        run_id = _save(db)
+        conn = sqlite3.connect(db.db_path)
+        conn.execute("UPDATE backtest_runs SET summary = '{\"hit_rate_3m\": 10.0}', metadata = '{}'")
+        conn.commit()
+        conn.close()
+
+        run = db.get_backtest_run(run_id)
+        assert run['summary'] == {'hit_rate_3m': 10.0}
+        assert run['metadata'] == {}
+
+
+class TestAgentScoreTable:
+    """Test suite for the normalized agent score side table"""
+
+    def test_scores_stored_one_row_per_agent(self, db):
+        _save(db)
+
+        conn = sqlite3.connect(db.db_path)
+        assert conn.execute("SELECT COUNT(*) FROM backtest_agent_scores").fetchone()[0] == 4
+        assert [r[0] for r in conn.execute("SELECT name FROM backtest_agents ORDER BY agent_id")] == [
+            'fundamentals', 'momentum'
+        ]
+        conn.close()
+
+    def test_agent_score_averages(self, db):
+        first = _save(db, results=[_make_result('TCS', 1)])
+        second_result = _make_result('INFY', 2)
+        second_result.agent_scores = {'fundamentals': 50.0, 'quality': 40.0}
+        second = _save(db, results=[second_result])
+
+        assert db.get_agent_score_averages() == {'fundamentals': 60.0, 'momentum': 65.0, 'quality': 40.0}
+        assert db.get_agent_score_averages(second) == {'fundamentals': 50.0, 'quality': 40.0}
+        assert db.get_agent_score_averages(first) == {'fundamentals': 70.0, 'momentum': 65.0}
+        assert db.get_agent_score_averages('not-a-uuid') == {}
+
+    def test_empty_agent_scores(self, db):
+        result = _make_result('TCS', 1)
+        result.agent_scores = {}
+        run_id = _save(db, results=[result])
+
+        assert db.get_backtest_run(run_id)['signals'][0]['agent_scores'] == {}
+
+
+class TestReadWriteSplit:
+    """Test suite for the WAL reader/writer connection split"""
+
+    def test_reads_proceed_during_open_write(self, db):
+        run_id = _save(db)
+
+        with db._write_lock:
+            db._writer.execute("BEGIN IMMEDIATE")
+            db._writer.execute("DELETE FROM backtest_runs")
+            # The reader still sees the last committed snapshot
+            assert [r['run_id'] for r in db.list_backtest_runs()] == [run_id]
+            assert db.get_backtest_run(run_id)['total_signals'] == 2
+            db._writer.rollback()
+
+        db.close()
+
+    def test_concurrent_reads(self, db):
+        run_ids = [_save(db) for _ in range(3)]
+        errors = []
+
+        def read():
+            try:
+                for _ in range(20):
+                    # Miss the run cache so every call reads from SQLite
+                    db._run_cache.clear()
+                    for run_id in run_ids:
+                        assert db.get_backtest_run(run_id)['total_signals'] == 2
+                    assert len(db.list_backtest_runs()) == 3
+                    assert len(db.get_signals_by_symbol('TCS')) == 3
+            except Exception as e:  # surfaced in the main thread below
+                errors.append(e)
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        # One reader per thread that read; exited threads are pruned on next open
+        assert len(db._readers) <= 9
+
+    def test_reader_is_read_only(self, db):
+        reader = db._get_reader()
+        if isinstance(reader, sqlite3.Connection):
+            expected = sqlite3.OperationalError
+        else:
+            expected = backtest_db.apsw.ReadOnlyError
+        with pytest.raises(expected):
+            reader.execute("DELETE FROM backtest_runs")
@@ -10,8 +10,11 @@ import threading
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from unittest.mock import MagicMock
 
-from core.cache_manager import LRUCache, CacheManager, TechnicalIndicatorCache, get_cache_manager
+from core.cache_manager import (
+    LRUCache, CacheManager, TechnicalIndicatorCache, IndicatorDiskCache, get_cache_manager
+)
 
 
 class TestLRUCache:
@@ -313,6 +316,32 @@ class TestTechnicalIndicatorCache:
         assert indicators2 is not None
         assert indicators2['bar_count'] == 103
 
+    def test_unchanged_data_hits_cache(self):
+        """Test unchanged price data returns cached indicators without recalculating"""
+        indicator_cache = TechnicalIndicatorCache()
+        calculator = MagicMock(side_effect=self.simple_calculator)
+
+        price_data = self.create_sample_price_data(100)
+        indicators1 = indicator_cache.get_indicators('HIT', price_data, calculator)
+        indicators2 = indicator_cache.get_indicators('HIT', price_data.copy(), calculator)
+
+        assert calculator.call_count == 1
+        assert indicators2 is indicators1
+
+    def test_revised_last_bar_recalculates(self):
+        """Test a changed final close is not served from cache"""
+        indicator_cache = TechnicalIndicatorCache()
+        calculator = MagicMock(side_effect=self.simple_calculator)
+
+        price_data = self.create_sample_price_data(100)
+        indicator_cache.get_indicators('REVISED', price_data, calculator)
+        revised = price_data.copy()
+        revised.iloc[-1, revised.columns.get_loc('Close')] += 1.0
+        indicators = indicator_cache.get_indicators('REVISED', revised, calculator)
+
+        assert calculator.call_count == 2
+        assert indicators['current_price'] == pytest.approx(revised['Close'].iloc[-1])
+
     def test_force_recalculation(self):
         """Test forcing full recalculation"""
         indicator_cache = TechnicalIndicatorCache()
@@ -371,6 +400,96 @@ class TestTechnicalIndicatorCache:
         assert stats['size'] >= 1
 
 
+
+class TestIndicatorDiskCache:
+    """Test suite for IndicatorDiskCache class"""
+
+    def create_price_data(self, num_bars=50):
+        """Deterministic price data for testing"""
+        dates = pd.date_range('2024-01-01', periods=num_bars, freq='D')
+        return pd.DataFrame({'Close': np.linspace(100, 150, num_bars)}, index=dates)
+
+    def sample_indicators(self):
+        """Indicators mixing floats, None, ints and arrays"""
+        return {
+            'rsi': 55.5,
+            'sma_200': None,
+            'bar_count': 50,
+            'obv': np.arange(50, dtype=np.float64),
+        }
+
+    def test_round_trip(self, tmp_path):
+        """Saved indicators load back with their types"""
+        disk = IndicatorDiskCache(str(tmp_path))
+        price_data = self.create_price_data()
+
+        assert disk.save('TCS', price_data, self.sample_indicators())
+        loaded = disk.load('TCS', price_data)
+
+        assert loaded['rsi'] == 55.5
+        assert loaded['sma_200'] is None
+        assert loaded['bar_count'] == 50 and isinstance(loaded['bar_count'], int)
+        np.testing.assert_array_equal(loaded['obv'], np.arange(50))
+
+    def test_changed_data_misses(self, tmp_path):
+        """An entry is only served for the same bars it was built from"""
+        disk = IndicatorDiskCache(str(tmp_path))
+        price_data = self.create_price_data()
+        disk.save('TCS', price_data, self.sample_indicators())
+
+        revised = price_data.copy()
+        revised.iloc[-1, 0] += 1.0
+
+        assert disk.load('TCS', revised) is None
+        assert disk.load('TCS', self.create_price_data(51)) is None
+        assert disk.load('INFY', price_data) is None
+
+    def test_unsupported_values_not_saved(self, tmp_path):
+        """Results holding non-numeric values are not persisted"""
+        disk = IndicatorDiskCache(str(tmp_path))
+
+        assert not disk.save('TCS', self.create_price_data(), {'trend': 'up'})
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unsafe_symbol_characters(self, tmp_path):
+        """Index and ampersand symbols map to files inside the cache dir"""
+        disk = IndicatorDiskCache(str(tmp_path))
+        price_data = self.create_price_data()
+
+        disk.save('^NSEI', price_data, {'rsi': 1.0})
+        disk.save('M&M', price_data, {'rsi': 2.0})
+
+        assert disk.load('^NSEI', price_data) == {'rsi': 1.0}
+        assert disk.load('M&M', price_data) == {'rsi': 2.0}
+
+    def test_restart_skips_calculation(self, tmp_path):
+        """A fresh in-memory cache is served from disk without recalculating"""
+        price_data = self.create_price_data()
+        calculator = MagicMock(return_value={'rsi': 42.0})
+
+        first = TechnicalIndicatorCache(
+            cache_manager=CacheManager(), disk_cache=IndicatorDiskCache(str(tmp_path))
+        )
+        first.get_indicators('DISK', price_data, calculator)
+
+        restarted = TechnicalIndicatorCache(
+            cache_manager=CacheManager(), disk_cache=IndicatorDiskCache(str(tmp_path))
+        )
+        indicators = restarted.get_indicators('DISK', price_data, calculator)
+
+        assert indicators == {'rsi': 42.0}
+        assert calculator.call_count == 1
+
+    def test_invalidate_removes_file(self, tmp_path):
+        """Invalidating a symbol also deletes its file"""
+        disk = IndicatorDiskCache(str(tmp_path))
+        indicator_cache = TechnicalIndicatorCache(cache_manager=CacheManager(), disk_cache=disk)
+        price_data = self.create_price_data()
+        indicator_cache.get_indicators('GONE', price_data, lambda data: {'rsi': 1.0})
+
+        assert indicator_cache.invalidate('GONE') is True
+        assert disk.load('GONE', price_data) is None
+
 class TestGlobalCacheManager:
     """Test global cache manager singleton"""
 
@@ -0,0 +1,64 @@
+"""
+Unit tests for HistoricalDataCollector storage
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.data_collector import HistoricalDataCollector
+
+
+def _analysis(symbol):
+    return {
+        'symbol': symbol,
+        'composite_score': 70.0,
+        'recommendation': 'BUY',
+        'confidence': 0.8,
+        'agent_scores': {'quality': 70.0},
+        'weights': {'quality': 1.0},
+    }
+
+
+@pytest.fixture
+def collector():
+    """Collector whose database is a mock"""
+    return HistoricalDataCollector(
+        db=MagicMock(),
+        stock_scorer=MagicMock(),
+        market_regime_service=MagicMock(),
+        enabled=False
+    )
+
+
+class TestStoreAnalyses:
+    """Tests for storing a collection sweep"""
+
+    def test_bulk_save(self, collector):
+        """A healthy sweep is stored in one bulk call"""
+        analyses = [_analysis('TCS'), _analysis('INFY')]
+
+        assert collector._store_analyses(analyses) == 0
+        collector.db.save_stock_analyses_bulk.assert_called_once_with(analyses)
+        collector.db.save_stock_analysis.assert_not_called()
+
+    def test_bad_row_fails_only_its_symbol(self, collector):
+        """If the bulk insert fails, rows are retried one at a time"""
+        collector.db.save_stock_analyses_bulk.side_effect = ValueError("bad row")
+
+        def save_one(**analysis):
+            if analysis['symbol'] == 'INFY':
+                raise ValueError("bad row")
+            return 1
+
+        collector.db.save_stock_analysis.side_effect = save_one
+
+        analyses = [_analysis('TCS'), _analysis('INFY'), _analysis('WIPRO')]
+
+        failures = collector._store_analyses(analyses)
+
+        assert failures == 1
+        assert collector.db.save_stock_analysis.call_count == 3
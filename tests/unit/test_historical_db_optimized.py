@@ -0,0 +1,318 @@
+"""
+Unit tests for OptimizedHistoricalDatabase.
+
+The module file name contains a dot, so it is loaded by path.
+"""
+
+import importlib.util
+import sqlite3
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from data.historical_db import HistoricalDatabase
+
+_spec = importlib.util.spec_from_file_location(
+    'historical_db_optimized',
+    Path(__file__).parent.parent.parent / 'data' / 'historical_db.optimized.py'
+)
+optimized = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(optimized)
+OptimizedHistoricalDatabase = optimized.OptimizedHistoricalDatabase
+
+_BASE_TS = datetime.now(timezone.utc) - timedelta(days=1)
+
+
+def _analysis(i: int, symbol: str = 'TCS', **overrides) -> dict:
+    analysis = {
+        'symbol': symbol,
+        'timestamp': _BASE_TS + timedelta(seconds=i),
+        'composite_score': 70.0 + i % 5,
+        'recommendation': 'BUY',
+        'confidence': 0.8,
+        'agent_scores': {'fundamentals': 70.0, 'momentum': float(i)},
+        'weights': {'fundamentals': 0.4, 'momentum': 0.6},
+        'market_regime': {'regime': 'BULL'},
+        'price': 100.0,
+        'sector': 'IT',
+        'narrative': f'analysis {i}',
+    }
+    analysis.update(overrides)
+    return analysis
+
+
+@pytest.fixture(params=[
+    pytest.param(False, id='sqlite3'),
+    pytest.param(True, id='apsw', marks=pytest.mark.skipif(
+        not optimized.APSW_AVAILABLE, reason="apsw not installed")),
+])
+def db(request, tmp_path):
+    database = OptimizedHistoricalDatabase(
+        str(tmp_path / 'history.db'), pool_size=2, use_apsw=request.param
+    )
+    yield database
+    database.close()
+
+
+class TestSharedSchema:
+    """Test suite for sharing one file with HistoricalDatabase"""
+
+    def test_round_trip_with_historical_database(self, tmp_path):
+        path = str(tmp_path / 'shared.db')
+        legacy = HistoricalDatabase(path)
+        legacy.save_stock_analysis(
+            'TCS', 70.0, 'BUY', 0.8, {'fundamentals': 65.0}, {'fundamentals': 0.4},
+            {'regime': 'BULL'}, 100.0, 'IT', 'legacy row'
+        )
+
+        db = OptimizedHistoricalDatabase(path, pool_size=1)
+        db.batch_insert_analyses([_analysis(1, timestamp=None)])
+        legacy.save_stock_analysis('TCS', 71.0, 'BUY', 0.8, {'fundamentals': 66.0}, {'fundamentals': 0.4})
+
+        history = db.get_stock_history('TCS')
+        assert [h['agent_scores']['fundamentals'] for h in history] == [65.0, 70.0, 66.0]
+        assert history[0]['market_regime'] == {'regime': 'BULL'}
+        assert history[2]['market_regime'] is None
+
+        # HistoricalDatabase still reads every row, including the optimized one
+        rows = legacy.get_stock_history('TCS', days=30)
+        assert sorted(r['agent_scores']['fundamentals'] for r in rows) == [65.0, 66.0, 70.0]
+        db.close()
+
+    def test_restores_json_columns_of_blob_only_table(self, tmp_path):
+        path = str(tmp_path / 'blob_only.db')
+        conn = sqlite3.connect(path)
+        conn.execute("""
+            CREATE TABLE stock_analyses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, symbol TEXT NOT NULL,
+                timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                composite_score REAL NOT NULL, recommendation TEXT NOT NULL,
+                confidence REAL NOT NULL, agent_scores_blob BLOB NOT NULL,
+                weights_blob BLOB NOT NULL, market_regime_blob BLOB,
+                price REAL, sector TEXT, narrative TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        narrative = 'strong momentum ' * 50
+        conn.execute(
+            "INSERT INTO stock_analyses (symbol, composite_score, recommendation, confidence, "
+            "agent_scores_blob, weights_blob, market_regime_blob, narrative) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ('INFY', 60.0, 'HOLD', 0.5, optimized._pack({'fundamentals': 55.0}),
+             optimized._pack({'fundamentals': 1.0}), optimized._pack(None),
+             bytes((optimized._CODEC_ZLIB,)) + zlib.compress(narrative.encode()))
+        )
+        conn.commit()
+        conn.close()
+
+        OptimizedHistoricalDatabase(path, pool_size=1).close()
+
+        rows = HistoricalDatabase(path).get_stock_history('INFY', days=30)
+        assert rows[0]['agent_scores'] == {'fundamentals': 55.0}
+        assert rows[0]['market_regime'] is None
+        assert rows[0]['narrative'] == narrative
+
+
+class TestStockHistory:
+    """Test suite for keyset-paginated history reads"""
+
+    def test_paging_across_equal_timestamps(self, db):
+        # HistoricalDatabase rows are not deduplicated and can share one
+        # CURRENT_TIMESTAMP second; the id tie-breaker must neither skip
+        # nor repeat rows at page boundaries
+        with db._get_writer() as conn:
+            conn.executemany(
+                "INSERT INTO stock_analyses (symbol, composite_score, recommendation, confidence, "
+                "agent_scores_json, weights_json) VALUES ('TCS', 70.0, 'BUY', 0.8, ?, '{}')",
+                [(f'{{"momentum": {i}.0}}',) for i in range(50)]
+            )
+
+        history = list(db.iter_stock_history('TCS', page_size=7))
+        assert len({h['timestamp'] for h in history}) <= 2
+        assert [h['id'] for h in history] == sorted(h['id'] for h in history)
+        assert [h['agent_scores']['momentum'] for h in history] == [float(i) for i in range(50)]
+
+    def test_max_rows_and_after_ts(self, db):
+        db.batch_insert_analyses([_analysis(i) for i in range(30)])
+
+        assert len(db.get_stock_history('TCS', max_rows=10)) == 10
+        assert len(db.get_stock_history('TCS', max_rows=None)) == 30
+
+        newest = db.get_stock_history('TCS', max_rows=None)[-1]['timestamp']
+        assert list(db.iter_stock_history('TCS', after_ts=newest)) == []
+        assert db.get_stock_history('NONE') == []
+
+    def test_history_query_seeks_index(self, db):
+        with db._get_writer() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN " + optimized._SQL_STOCK_HISTORY,
+                ('TCS', optimized._cutoff(30), -1, 10)
+            ).fetchall()
+        assert any('USING INDEX' in row[-1] and 'symbol=?' in row[-1] for row in plan)
+
+
+class TestIdempotentInsert:
+    """Test suite for ON CONFLICT deduplication of batch inserts"""
+
+    def test_retried_batch_is_skipped(self, db):
+        batch = [_analysis(i) for i in range(100)]
+        assert db.batch_insert_analyses(batch) == 100
+        assert db.batch_insert_analyses(batch) == 0
+        assert db.batch_insert_analyses(batch[90:] + [_analysis(100)]) == 1
+        assert len(db.get_stock_history('TCS', max_rows=None)) == 101
+
+    def test_legacy_rows_are_not_constrained(self, tmp_path):
+        path = str(tmp_path / 'shared.db')
+        db = OptimizedHistoricalDatabase(path, pool_size=1)
+        legacy = HistoricalDatabase(path)
+        for _ in range(3):
+            legacy.save_stock_analysis('TCS', 70.0, 'BUY', 0.8, {}, {})
+        assert len(legacy.get_stock_history('TCS', days=30)) == 3
+        db.close()
+
+    def test_existing_duplicates_removed_before_index(self, tmp_path):
+        path = str(tmp_path / 'dupes.db')
+        db = OptimizedHistoricalDatabase(path, pool_size=1)
+        with db._get_writer() as conn:
+            conn.execute("DROP INDEX idx_unique_symbol_ts")
+            conn.executemany(
+                f"INSERT INTO stock_analyses ({optimized._ANALYSIS_INSERT_COLUMNS}) "
+                f"VALUES {optimized._ANALYSIS_ROW_PLACEHOLDERS}",
+                db._encode_analyses([_analysis(0), _analysis(0), _analysis(1)])
+            )
+        db.close()
+
+        db = OptimizedHistoricalDatabase(path, pool_size=1)
+        history = db.get_stock_history('TCS')
+        assert [h['agent_scores']['momentum'] for h in history] == [0.0, 1.0]
+        db.close()
+
+
+class TestQueryCache:
+    """Test suite for the TTL/version-gated query cache"""
+
+    def test_history_cache_invalidated_by_insert(self, db):
+        db.batch_insert_analyses([_analysis(0)])
+        first = db.get_stock_history_cached('TCS')
+        assert db.get_stock_history_cached('TCS') is first
+
+        db.batch_insert_analyses([_analysis(1)])
+        assert len(db.get_stock_history_cached('TCS')) == 2
+
+    def test_top_performers_cache_invalidated_by_insert(self, db):
+        db.batch_insert_analyses([_analysis(0, symbol='TCS')])
+        first = db.get_top_performers_optimized(min_analyses=1)
+        assert db.get_top_performers_optimized(min_analyses=1) is first
+
+        db.batch_insert_analyses([_analysis(4, symbol='INFY')])
+        top = db.get_top_performers_optimized(min_analyses=1)
+        assert [p['symbol'] for p in top] == ['INFY', 'TCS']
+
+    def test_stats_count_every_table(self, db):
+        db.batch_insert_analyses([_analysis(i) for i in range(3)])
+        tables = db.get_database_stats()['tables']
+        assert tables == {'stock_analyses': 3, 'market_regimes': 0, 'watchlist': 0, 'user_searches': 0}
+
+
+class TestBatchInsert:
+    """Test suite for multi-row and bulk inserts"""
+
+    @pytest.mark.parametrize('count', [1, 75, 76, 77, 153])
+    def test_chunk_boundaries(self, db, count):
+        assert db.batch_insert_analyses([_analysis(i) for i in range(count)]) == count
+        history = db.get_stock_history('TCS', max_rows=None)
+        assert [h['agent_scores']['momentum'] for h in history] == [float(i) for i in range(count)]
+
+    def test_failed_batch_rolls_back(self, db):
+        bad = _analysis(1, symbol=None)
+        with pytest.raises(sqlite3.IntegrityError):
+            db.batch_insert_analyses([_analysis(0), bad])
+        assert db.get_stock_history('TCS') == []
+        # The writer is usable again after the rollback
+        assert db.batch_insert_analyses([_analysis(0)]) == 1
+
+    def test_bulk_insert_recreates_aggregate_index(self, db):
+        inserted = db.batch_insert_analyses_bulk(
+            [_analysis(i, symbol=f'S{i % 3}') for i in range(40)], drop_indexes_threshold=10
+        )
+        assert inserted == 40
+
+        with db._get_writer() as conn:
+            indexes = {row['name'] for row in conn.execute("PRAGMA index_list(stock_analyses)")}
+        assert 'idx_stock_agg' in indexes
+        top = db.get_top_performers_optimized(min_analyses=1)
+        assert sorted(p['analysis_count'] for p in top) == [13, 13, 14]
+
+
+class TestColumnCodecs:
+    """Test suite for the encoded companion columns"""
+
+    def test_large_values_compress_and_round_trip(self, db):
+        scores = {f'agent_{i}': float(i) for i in range(60)}
+        narrative = 'Fundamentals improving on margin expansion. ' * 30
+        db.batch_insert_analyses([_analysis(0, agent_scores=scores, narrative=narrative)])
+
+        with db._get_writer() as conn:
+            blob, stored_narrative = conn.execute(
+                "SELECT agent_scores_blob, narrative FROM stock_analyses"
+            ).fetchone()
+        assert blob[0] in (optimized._CODEC_ZSTD, optimized._CODEC_ZLIB)
+        assert stored_narrative == narrative
+
+        history = db.get_stock_history('TCS')
+        assert history[0]['agent_scores'] == scores
+        assert history[0]['narrative'] == narrative
+
+    def test_unpack_handles_every_codec(self):
+        value = {'fundamentals': 1.5, 'tags': ['a', 'b']}
+        assert optimized._unpack(optimized._pack(value)) == value
+        assert optimized._unpack(b'\x00{"a": 1}') == {'a': 1}
+        assert optimized._unpack('{"a": 1}') == {'a': 1}
+        nan = optimized._unpack(b'\x00{"a": NaN}')['a']
+        assert nan != nan
+        with pytest.raises(ValueError):
+            optimized._unpack(b'\x09')
+
+
+class TestConnections:
+    """Test suite for the writer/reader pool lifecycle"""
+
+    def test_reader_pool_matches_backend(self, db):
+        reader = db._reader_pool.queue[0]
+        assert isinstance(reader, sqlite3.Connection) is not db.use_apsw
+
+    def test_new_file_uses_incremental_auto_vacuum(self, db):
+        with db._get_writer() as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+    def test_incremental_vacuum_releases_free_pages(self, db):
+        db.batch_insert_analyses([_analysis(i, narrative='x' * 2000) for i in range(300)])
+        assert db.incremental_vacuum() == 0
+        with db._get_writer() as conn:
+            conn.execute("DELETE FROM stock_analyses")
+
+        assert db.incremental_vacuum(pages=50) == 50
+        assert db.incremental_vacuum(min_free_pages=10**6) == 0
+        assert db.incremental_vacuum() > 0
+        with db._get_writer() as conn:
+            assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+    def test_full_vacuum_converts_legacy_file(self, tmp_path):
+        path = str(tmp_path / 'legacy.db')
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE legacy (x)")
+        conn.close()
+        db = OptimizedHistoricalDatabase(path, pool_size=1)
+        with db._get_writer() as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+        db.full_vacuum()
+        with db._get_writer() as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        db.close()
+
+    def test_close_is_idempotent(self, tmp_path):
+        db = OptimizedHistoricalDatabase(str(tmp_path / 'close.db'), pool_size=1)
+        db.close()
+        db.close()
+        assert db._reader_pool.empty()
@@ -0,0 +1,458 @@
+"""
+Unit tests for HybridDataProvider.
+
+Providers are mocked, so these tests exercise caching, batching, fallback
+and stats bookkeeping without network access.
+"""
+
+import pytest
+import sys
+import os
+import gc
+import threading
+import time
+import weakref
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from data import hybrid_provider as hybrid_module
+from data.hybrid_provider import HybridDataProvider, _downcast_ohlcv, _widen_ohlcv
+
+
+def _make_data(symbol, provider='nse'):
+    """Comprehensive data that needs no enrichment"""
+    dates = pd.date_range(end=datetime.now(), periods=30, freq='D')
+    return {
+        'symbol': symbol,
+        'current_price': 100.0,
+        'historical_data': pd.DataFrame({'Close': np.linspace(90, 100, 30)}, index=dates),
+        'info': {'returnOnEquity': 0.2},
+        'data_completeness': {
+            'has_historical': True,
+            'has_financials': True,
+        },
+        'provider': provider,
+    }
+
+
+@pytest.fixture
+def provider():
+    """HybridDataProvider whose NSE and Yahoo providers are mocks"""
+    with patch('data.hybrid_provider.NSEProvider') as nse_cls, \
+            patch('data.hybrid_provider.YahooFinanceProvider') as yahoo_cls:
+        nse_cls.return_value.get_comprehensive_data.side_effect = _make_data
+        yahoo_cls.return_value.get_comprehensive_data.side_effect = (
+            lambda symbol: _make_data(symbol, 'yahoo')
+        )
+        hybrid = HybridDataProvider()
+        hybrid.yahoo_cls = yahoo_cls
+        yield hybrid
+        hybrid.shutdown()
+
+
+class TestBatchData:
+    """Tests for get_batch_data"""
+
+    def test_fetches_all_symbols(self, provider):
+        """Every requested symbol gets a result"""
+        results = provider.get_batch_data(['TCS', 'INFY', 'RELIANCE'], max_workers=3)
+
+        assert set(results) == {'TCS', 'INFY', 'RELIANCE'}
+        assert results['INFY']['symbol'] == 'INFY'
+        assert provider.stats['total_requests'] == 3
+        assert provider.stats['nse_success'] == 3
+
+    def test_cache_hits_skip_workers(self, provider):
+        """Fresh cache entries are returned without submitting fetches"""
+        provider.get_comprehensive_data('TCS')
+        provider.nse_provider.get_comprehensive_data.reset_mock()
+
+        results = provider.get_batch_data(['TCS', 'INFY'])
+
+        provider.nse_provider.get_comprehensive_data.assert_called_once_with('INFY')
+        assert set(results) == {'TCS', 'INFY'}
+
+    def test_stats_are_not_lost_under_concurrency(self, provider):
+        """Concurrent fetches count every request"""
+        symbols = [f"S{i}" for i in range(40)]
+        provider.get_batch_data(symbols, max_workers=8)
+
+        assert provider.stats['total_requests'] == 40
+        assert provider.stats['nse_success'] == 40
+
+
+class TestHttpSession:
+    """Tests for the shared keep-alive session"""
+
+    def test_yahoo_provider_gets_shared_session(self, provider):
+        """The Yahoo provider is built with the hybrid provider's session"""
+        assert provider.yahoo_provider is not None
+        assert provider.yahoo_cls.call_args.kwargs['session'] is provider._http_session
+
+
+class TestLazyProviders:
+    """Tests for constructing providers on first use"""
+
+    def test_providers_built_on_first_use(self, provider):
+        """Only the provider a fetch actually needs gets constructed"""
+        provider.yahoo_cls.assert_not_called()
+
+        provider.get_comprehensive_data('TCS')
+
+        assert provider._nse_provider is not None
+        provider.yahoo_cls.assert_not_called()
+        assert provider.yahoo_available
+        provider.yahoo_cls.assert_called_once()
+
+    def test_failed_construction_marks_unavailable(self):
+        """A provider whose constructor raises is reported unavailable, once"""
+        with patch('data.hybrid_provider.NSEProvider', side_effect=ImportError("no nsepy")) as nse_cls:
+            hybrid = HybridDataProvider()
+            try:
+                assert not hybrid.nse_available
+                assert hybrid.nse_provider is None
+                assert nse_cls.call_count == 1
+            finally:
+                hybrid.shutdown()
+
+
+class TestTryProvider:
+    """Tests for dispatching _try_provider by provider name"""
+
+    def test_yahoo_dispatch(self, provider):
+        """The yahoo entry uses the Yahoo provider and its stats keys"""
+        data = provider._try_provider('TCS', 'yahoo')
+
+        assert data['provider'] == 'yahoo'
+        assert provider.stats['yahoo_success'] == 1
+        assert provider.stats['nse_success'] == 0
+
+    def test_unknown_provider(self, provider):
+        """An unknown provider name yields empty data without touching stats"""
+        data = provider._try_provider('TCS', 'bloomberg')
+
+        assert "not available" in data['error']
+        assert provider.stats['nse_failure'] == provider.stats['yahoo_failure'] == 0
+
+    def test_unavailable_provider(self, provider):
+        """A provider marked unavailable is not called"""
+        provider.nse_available = False
+
+        data = provider._try_provider('TCS', 'nse')
+
+        assert "not available" in data['error']
+
+
+class TestNegativeCache:
+    """Tests for short-lived caching of failed provider fetches"""
+
+    def test_failed_provider_is_not_retried(self, provider):
+        """A provider that just failed for a symbol is skipped until the TTL passes"""
+        provider.nse_provider.get_comprehensive_data.side_effect = RuntimeError("down")
+
+        first = provider._try_provider('TCS', 'nse')
+        second = provider._try_provider('TCS', 'nse')
+
+        assert 'error' in first and 'error' in second
+        assert provider.nse_provider.get_comprehensive_data.call_count == 1
+        assert provider.stats['nse_failure'] == 1
+
+    def test_expired_failure_is_retried(self, provider):
+        """Once expired, the provider is called again and success clears the entry"""
+        provider._neg_cache[('TCS', 'nse')] = 0
+
+        data = provider._try_provider('TCS', 'nse')
+
+        assert data['symbol'] == 'TCS'
+        assert ('TCS', 'nse') not in provider._neg_cache
+
+
+class TestSingleFlight:
+    """Tests for collapsing concurrent misses into one fetch"""
+
+    def test_concurrent_misses_share_one_fetch(self, provider):
+        """Callers racing on an uncached symbol wait for the first fetch"""
+        def slow_fetch(symbol):
+            time.sleep(0.2)
+            return _make_data(symbol)
+
+        provider.nse_provider.get_comprehensive_data.side_effect = slow_fetch
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(provider.get_comprehensive_data('TCS')))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert provider.nse_provider.get_comprehensive_data.call_count == 1
+        assert len(results) == 5 and all(r['symbol'] == 'TCS' for r in results)
+        assert provider._inflight == {}
+
+    def test_failed_fetch_clears_inflight_entry(self, provider):
+        """A failed shared fetch raises and leaves no in-flight entry behind"""
+        provider._fetch_comprehensive_data = MagicMock(side_effect=RuntimeError("boom"))
+
+        with pytest.raises(RuntimeError):
+            provider.get_comprehensive_data('TCS')
+        assert provider._inflight == {}
+
+
+class TestStaleWhileRevalidate:
+    """Tests for serving expired entries while they refresh"""
+
+    def test_stale_entry_served_and_refreshed(self, provider):
+        """Within the stale window the old entry is returned and replaced in the background"""
+        old = _make_data('TCS', 'old')
+        provider._cache_data('TCS', old)
+        provider._flush_cache_writes()
+        provider.cache_expiry['TCS'] = datetime.now() - timedelta(seconds=1)
+
+        assert provider.get_comprehensive_data('TCS')['provider'] == 'old'
+
+        provider.executor.shutdown(wait=True)
+        assert provider._get_cached_data('TCS')['provider'] == 'nse'
+        assert provider.nse_provider.get_comprehensive_data.call_count == 1
+
+    def test_entry_past_stale_window_fetched_synchronously(self, provider):
+        """Entries older than TTL + stale_window are not served"""
+        provider._cache_data('TCS', _make_data('TCS', 'old'))
+        provider._flush_cache_writes()
+        provider.cache_expiry['TCS'] = datetime.now() - timedelta(seconds=provider.stale_window + 1)
+
+        assert provider.get_comprehensive_data('TCS')['provider'] == 'nse'
+
+
+class TestFetchWithFallback:
+    """Tests for _fetch_with_fallback"""
+
+    def test_double_failure_makes_no_extra_call(self, provider):
+        """When both providers fail the caller's empty value comes back without a re-probe"""
+        provider.nse_provider.get_historical_data.side_effect = RuntimeError("nse down")
+        provider.yahoo_provider.get_historical_data.side_effect = RuntimeError("yahoo down")
+
+        result = provider.get_historical_data('TCS')
+
+        assert isinstance(result, pd.DataFrame) and result.empty
+        assert provider.nse_provider.get_historical_data.call_count == 1
+        assert provider.yahoo_provider.get_historical_data.call_count == 1
+
+
+class TestStats:
+    """Tests for usage counters and the reports built from them"""
+
+    def test_reports_use_consistent_snapshots(self, provider):
+        """Health and provider stats report copies of the counters"""
+        provider.get_comprehensive_data('TCS')
+        provider.nse_provider.get_comprehensive_data.side_effect = RuntimeError("down")
+        provider.get_comprehensive_data('INFY')
+
+        health = provider.get_health_status()
+        assert health['nse_provider']['success_rate'] == pytest.approx(50.0)
+        assert health['stats']['total_requests'] == 2
+        assert health['stats'] is not provider.stats
+        assert provider.get_provider_stats()['nse_failure'] == 1
+
+
+class TestEnrichment:
+    """Tests for merging Yahoo info into NSE data"""
+
+    def test_only_consumed_fields_are_copied(self, provider):
+        """Agent-read Yahoo fields are merged; unused fields are not"""
+        nse_data = _make_data('TCS')
+        nse_data['info'] = {'current_price': 3500.0}
+        nse_data['data_completeness']['has_financials'] = False
+        yahoo_data = _make_data('TCS', 'yahoo')
+        yahoo_data['info'] = {
+            'currentPrice': 3490.0,
+            'regularMarketPrice': 3490.0,
+            'trailingPE': 28.0,
+            'targetMeanPrice': 4000.0,
+            'forwardPE': None,
+            'longBusinessSummary': 'x' * 1000,
+        }
+        provider.yahoo_provider.get_comprehensive_data.side_effect = None
+        provider.yahoo_provider.get_comprehensive_data.return_value = yahoo_data
+
+        info = provider._enrich_data('TCS', nse_data)['info']
+
+        assert info == {
+            'current_price': 3500.0,
+            'currentPrice': 3500.0,
+            'regularMarketPrice': 3490.0,
+            'trailingPE': 28.0,
+            'targetMeanPrice': 4000.0,
+        }
+
+    def test_yahoo_price_fills_missing_nse_price(self, provider):
+        """Without an NSE price the sentiment agent still gets Yahoo's"""
+        nse_data = _make_data('TCS')
+        nse_data['info'] = {}
+        nse_data['data_completeness']['has_financials'] = False
+        yahoo_data = _make_data('TCS', 'yahoo')
+        yahoo_data['info'] = {'currentPrice': 3490.0, 'targetMeanPrice': 4000.0}
+        provider.yahoo_provider.get_comprehensive_data.side_effect = None
+        provider.yahoo_provider.get_comprehensive_data.return_value = yahoo_data
+
+        info = provider._enrich_data('TCS', nse_data)['info']
+
+        assert info['currentPrice'] == 3490.0
+
+
+class TestCacheCompression:
+    """Tests for compressed cache entries"""
+
+    def test_round_trip(self, provider):
+        """Cached data comes back equal, including its DataFrame"""
+        data = _make_data('TCS')
+        provider._cache_data('TCS', data)
+        provider._flush_cache_writes()
+
+        cached = provider._get_cached_data('TCS')
+
+        assert cached['current_price'] == 100.0
+        pd.testing.assert_frame_equal(cached['historical_data'], data['historical_data'])
+
+    def test_entries_stored_compressed(self, provider):
+        """With zstandard installed the cache holds bytes, not the dict"""
+        pytest.importorskip("zstandard")
+        provider._cache_data('TCS', _make_data('TCS'))
+        provider._flush_cache_writes()
+
+        assert isinstance(provider.cache['TCS'], bytes)
+        assert provider._get_cached_data('TCS')['symbol'] == 'TCS'
+
+    def test_entries_uncompressed_without_zstandard(self, provider):
+        """Without zstandard entries are stored as-is"""
+        data = _make_data('TCS')
+        with patch.object(hybrid_module, 'ZSTANDARD_AVAILABLE', False):
+            provider._cache_data('TCS', data)
+            provider._flush_cache_writes()
+
+        assert provider.cache['TCS'] is data
+        assert provider._get_cached_data('TCS') is data
+
+
+class TestOhlcvDowncast:
+    """Tests for narrowing OHLCV columns in cache entries"""
+
+    def _ohlcv(self, volume):
+        dates = pd.date_range('2024-01-01', periods=3, freq='D')
+        return pd.DataFrame({
+            'Open': [100.05, 101.10, 99.95],
+            'Close': [100.55, 100.80, 101.25],
+            'Volume': np.array(volume, dtype=np.int64),
+        }, index=dates)
+
+    def test_prices_and_volume_narrowed(self):
+        """Prices become float32, volume uint32, with the originals reported"""
+        narrow, original = _downcast_ohlcv(self._ohlcv([1_000, 2_000, 3_000]))
+
+        assert narrow['Close'].dtype == np.float32
+        assert narrow['Volume'].dtype == np.uint32
+        assert original == {'Open': np.float64, 'Close': np.float64, 'Volume': np.int64}
+        np.testing.assert_allclose(narrow['Close'], [100.55, 100.80, 101.25], atol=1e-4)
+
+    def test_widening_restores_exact_prices(self):
+        """Narrowed prices come back equal to the originals, not just close"""
+        df = self._ohlcv([1_000, 2_000, 3_000])
+        df['Close'] = [2345.65, 99999.99, np.nan]
+
+        narrow, original = _downcast_ohlcv(df)
+
+        pd.testing.assert_frame_equal(_widen_ohlcv(narrow, original), df)
+
+    def test_sub_paisa_prices_kept(self):
+        """Prices that rounding to paise would change keep float64"""
+        df = self._ohlcv([1_000, 2_000, 3_000])
+        df['Close'] = [2345.64990234375, 100.8, 101.25]
+
+        narrow, original = _downcast_ohlcv(df)
+
+        assert narrow['Close'].dtype == np.float64
+        assert 'Close' not in original
+        assert narrow['Open'].dtype == np.float32
+
+    def test_out_of_range_volume_kept(self):
+        """Volume that does not fit uint32 keeps its dtype"""
+        narrow, original = _downcast_ohlcv(self._ohlcv([1, 2, 2**33]))
+
+        assert narrow['Volume'].dtype == np.int64
+        assert 'Volume' not in original
+
+    def test_cached_entry_widened_on_read(self, provider):
+        """Readers get float64 prices and the original volume dtype back"""
+        pytest.importorskip("zstandard")
+        data = _make_data('TCS')
+        data['historical_data'] = self._ohlcv([1_000, 2_000, 3_000])
+        provider._cache_data('TCS', data)
+        provider._flush_cache_writes()
+
+        historical = provider._get_cached_data('TCS')['historical_data']
+
+        assert historical['Close'].dtype == np.float64
+        assert historical['Volume'].dtype == np.int64
+        pd.testing.assert_frame_equal(historical, data['historical_data'])
+        assert data['historical_data']['Close'].dtype == np.float64
+
+
+class TestWriteBehind:
+    """Tests for buffering cache writes"""
+
+    def test_buffered_entry_is_served(self, provider):
+        """A just-written entry is a cache hit before the writer stores it"""
+        data = _make_data('TCS')
+        provider._cache_data('TCS', data)
+
+        assert provider._get_cached_data('TCS') is data
+
+    def test_writer_thread_flushes(self, provider):
+        """The background writer moves buffered entries into the cache"""
+        provider._cache_data('TCS', _make_data('TCS'))
+
+        deadline = time.monotonic() + 5
+        while 'TCS' not in provider.cache and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert 'TCS' in provider.cache
+        assert provider._write_buffer == {}
+
+    def test_clear_cache_drops_buffered_writes(self, provider):
+        """Clearing the cache also discards writes not yet flushed"""
+        provider._cache_data('TCS', _make_data('TCS'))
+
+        provider.clear_cache()
+        provider._flush_cache_writes()
+
+        assert provider._get_cached_data('TCS') is None
+
+    def test_abandoned_provider_is_collected(self):
+        """The writer thread does not keep an unused provider alive"""
+        with patch('data.hybrid_provider.NSEProvider'), \
+                patch('data.hybrid_provider.YahooFinanceProvider'):
+            hybrid = HybridDataProvider()
+        writer = hybrid._writer_thread
+        ref = weakref.ref(hybrid)
+
+        del hybrid
+        gc.collect()
+        writer.join(timeout=5)
+
+        assert ref() is None
+        assert not writer.is_alive()
+
+    def test_shutdown_flushes(self, provider):
+        """Pending writes are stored when the provider shuts down"""
+        provider._writer_stop.set()
+        provider._writer_thread.join()
+        provider._cache_data('TCS', _make_data('TCS'))
+
+        provider.shutdown()
+
+        assert 'TCS' in provider.cache
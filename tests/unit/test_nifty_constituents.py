@@ -0,0 +1,102 @@
+"""
+Unit tests for the NIFTY constituents data and its helper functions.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from data.nifty_constituents import (
+    NIFTY_50,
+    get_sectors,
+    weights_by_sector,
+    get_top_symbols_by_weight,
+    get_all_indices,
+    get_stock_info,
+    get_symbols_by_sector,
+)
+
+
+class TestNifty50Analytics:
+    """Vectorized helpers must agree with a plain scan of NIFTY_50"""
+
+    def test_get_sectors_sorted_unique(self):
+        assert get_sectors() == sorted({data['sector'] for data in NIFTY_50.values()})
+
+    def test_symbols_by_sector_ignores_case(self):
+        expected = [s for s, data in NIFTY_50.items() if data['sector'] == 'Information Technology']
+
+        assert get_symbols_by_sector('information technology') == expected
+        assert get_symbols_by_sector('INFORMATION TECHNOLOGY') == expected
+        assert get_symbols_by_sector('No Such Sector') == []
+
+    def test_weights_by_sector(self):
+        expected = {}
+        for data in NIFTY_50.values():
+            expected[data['sector']] = expected.get(data['sector'], 0.0) + data['weight']
+
+        result = weights_by_sector()
+
+        assert result.keys() == expected.keys()
+        for sector, weight in expected.items():
+            assert result[sector] == pytest.approx(weight)
+
+    def test_top_symbols_by_weight(self):
+        expected = sorted(NIFTY_50, key=lambda s: NIFTY_50[s]['weight'], reverse=True)
+
+        assert get_top_symbols_by_weight(10) == expected[:10]
+        assert get_top_symbols_by_weight(len(NIFTY_50) + 5) == expected
+
+
+class TestFrozenTables:
+    """Module-level lookup tables are read-only with shared category strings"""
+
+    def test_nifty_50_is_read_only(self):
+        with pytest.raises(TypeError):
+            NIFTY_50['NEWCO'] = {}
+
+    def test_stock_rows_are_read_only(self):
+        with pytest.raises(TypeError):
+            NIFTY_50['TCS']['weight'] = 0.0
+
+    def test_stock_info_is_mutable_copy(self):
+        info = get_stock_info('TCS')
+        info['weight'] = 0.0
+
+        assert NIFTY_50['TCS']['weight'] != 0.0
+
+    def test_sector_mapping_is_read_only(self):
+        from data.indian_stock_sectors import INDIAN_STOCK_SECTORS
+
+        with pytest.raises(TypeError):
+            INDIAN_STOCK_SECTORS['NEWCO'] = 'Unknown'
+
+    def test_sector_strings_are_shared(self):
+        it_rows = [data for data in NIFTY_50.values() if data['sector'] == 'Information Technology']
+
+        assert len(it_rows) > 1
+        assert all(row['sector'] is it_rows[0]['sector'] for row in it_rows)
+
+
+class TestStockInfo:
+    """get_stock_info answers from the precomputed symbol index"""
+
+    def test_lists_every_index(self):
+        info = get_stock_info('TCS')
+
+        assert info['symbol'] == 'TCS'
+        assert info['name'] == NIFTY_50['TCS']['name']
+        assert info['indices'] == [
+            name for name, index_data in get_all_indices().items() if 'TCS' in index_data
+        ]
+        assert 'NIFTY_IT' in info['indices']
+
+    def test_unknown_symbol(self):
+        assert get_stock_info('NOSUCH') == {}
+
+    def test_result_is_a_copy(self):
+        get_stock_info('TCS')['indices'].append('X')
+
+        assert 'X' not in get_stock_info('TCS')['indices']
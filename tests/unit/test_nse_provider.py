@@ -0,0 +1,239 @@
+"""
+Unit tests for NSEProvider indicator helpers.
+
+The helpers are pure numpy, so the provider is built without __init__
+(which requires nsepy).
+"""
+
+import pytest
+import sys
+import os
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from data.base_provider import BaseDataProvider
+from data.nse_provider import NSEProvider
+
+
+@pytest.fixture
+def provider():
+    """NSEProvider without network or nsepy setup"""
+    return NSEProvider.__new__(NSEProvider)
+
+
+@pytest.fixture
+def ohlcv():
+    """300 bars of random OHLCV as float64 arrays"""
+    rng = np.random.default_rng(7)
+    close = 1000 + np.cumsum(rng.normal(0, 10, 300))
+    high = close + rng.uniform(0, 15, 300)
+    low = close - rng.uniform(0, 15, 300)
+    volume = rng.uniform(1e5, 5e6, 300).round()
+    return high, low, close, volume
+
+
+class TestVwap:
+    """Tests for _calculate_vwap"""
+
+    def _pandas_vwap(self, high, low, close, volume, window):
+        """Reference rolling VWAP built with pandas"""
+        typical = (pd.Series(high) + pd.Series(low) + pd.Series(close)) / 3
+        volume = pd.Series(volume)
+        vwap = (typical * volume).rolling(window).sum() / volume.rolling(window).sum()
+        return vwap.fillna(typical).values
+
+    def test_matches_pandas_rolling(self, provider, ohlcv):
+        """Prefix-sum VWAP equals the pandas rolling computation"""
+        expected = self._pandas_vwap(*ohlcv, window=50)
+
+        np.testing.assert_allclose(provider._calculate_vwap(*ohlcv), expected, rtol=1e-9)
+
+    def test_short_series_is_typical_price(self, provider, ohlcv):
+        """Fewer bars than the window yield the typical price"""
+        high, low, close, volume = (a[:10] for a in ohlcv)
+
+        np.testing.assert_allclose(
+            provider._calculate_vwap(high, low, close, volume), (high + low + close) / 3
+        )
+
+    def test_zero_volume_window_falls_back(self, provider, ohlcv):
+        """A window without volume uses the typical price instead of NaN"""
+        high, low, close, volume = ohlcv
+        volume = volume.copy()
+        volume[100:160] = 0.0
+
+        vwap = provider._calculate_vwap(high, low, close, volume)
+
+        assert not np.isnan(vwap).any()
+        assert vwap[155] == pytest.approx((high[155] + low[155] + close[155]) / 3)
+
+
+class TestVolumeZscore:
+    """Tests for _calculate_volume_zscore"""
+
+    def test_matches_pandas_rolling(self, provider, ohlcv):
+        """Window z-scores equal pandas rolling mean/std (sample std)"""
+        volume = pd.Series(ohlcv[3])
+        expected = ((volume - volume.rolling(20).mean()) / volume.rolling(20).std()).fillna(0).values
+
+        zscore = provider._calculate_volume_zscore(ohlcv[3])
+
+        assert zscore.dtype == np.float32
+        np.testing.assert_allclose(zscore, expected, atol=1e-4)
+
+    def test_flat_and_short_series_are_zero(self, provider):
+        """Constant volume and series shorter than the window score 0"""
+        assert not provider._calculate_volume_zscore(np.full(50, 1e6)).any()
+        # Not exactly representable as a float32 mean of 20 values
+        assert not provider._calculate_volume_zscore(np.full(50, 12_345_677.0)).any()
+        assert not provider._calculate_volume_zscore(np.arange(10.0)).any()
+
+
+class TestBasicIndicators:
+    """Tests for the TA-Lib-free _get_basic_indicators"""
+
+    def _pandas_basic(self, close):
+        """Reference values from the pandas rolling implementation"""
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0).rolling(14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+        rsi = (100 - 100 / (1 + gain / loss)).iloc[-1]
+        sma_20 = close.rolling(20).mean().iloc[-1]
+        sma_50 = close.rolling(50).mean().iloc[-1]
+        return {
+            'sma_20': None if pd.isna(sma_20) else float(sma_20),
+            'sma_50': None if pd.isna(sma_50) else float(sma_50),
+            'rsi': None if pd.isna(rsi) else float(rsi),
+        }
+
+    @pytest.mark.parametrize('bars', [30, 300])
+    def test_matches_pandas_rolling(self, provider, ohlcv, bars):
+        """Trailing-window values equal the last pandas rolling values"""
+        close = pd.Series(ohlcv[2][:bars])
+
+        result = provider._get_basic_indicators(pd.DataFrame({'Close': close}))
+        expected = self._pandas_basic(close)
+
+        assert result.keys() == expected.keys()
+        for key, value in expected.items():
+            assert result[key] == (None if value is None else pytest.approx(value))
+
+    def test_rsi_edge_cases(self, provider):
+        """Only gains give RSI 100; a flat series has no RSI"""
+        rising = provider._get_basic_indicators(pd.DataFrame({'Close': np.arange(1.0, 31.0)}))
+        flat = provider._get_basic_indicators(pd.DataFrame({'Close': np.full(30, 5.0)}))
+
+        assert rising['rsi'] == 100.0
+        assert flat['rsi'] is None
+
+
+class TestHistoricalData:
+    """Tests for get_historical_data request building"""
+
+    @pytest.fixture
+    def get_history(self, provider):
+        """Mocked nsepy.get_history returning a small OHLCV frame"""
+        provider._rate_limiter = None
+        frame = pd.DataFrame({
+            'Open': [1.0, 2.0], 'High': [1.5, 2.5], 'Low': [0.5, 1.5],
+            'Close': [1.2, 2.2], 'Volume': [100, 200],
+        })
+        with patch('data.nse_provider.get_history', create=True, return_value=frame) as mock:
+            yield mock
+
+    @pytest.mark.parametrize('symbol, is_index, clean', [
+        ('TCS', False, 'TCS'),
+        ('^NSEI', True, 'NSEI'),
+        ('nifty bank', True, 'nifty bank'),
+        ('SENSEX', True, 'SENSEX'),
+        ('CNXIT', True, 'CNXIT'),
+        ('M^M', False, 'MM'),
+    ])
+    def test_index_detection(self, provider, get_history, symbol, is_index, clean):
+        """Index symbols are fetched with index=True and without the caret"""
+        provider.get_historical_data(symbol)
+
+        assert get_history.call_args.kwargs['index'] is is_index
+        assert get_history.call_args.kwargs['symbol'] == clean
+
+    def test_period_window(self, provider, get_history):
+        """The period string sets the start date; unknown periods use 2 years"""
+        end = datetime(2024, 6, 30)
+
+        provider.get_historical_data('TCS', period='3mo', end_date=end)
+        assert (end - get_history.call_args.kwargs['start']).days == 90
+
+        provider.get_historical_data('TCS', period='10y', end_date=end)
+        assert (end - get_history.call_args.kwargs['start']).days == 730
+
+
+class TestCalculateIndicators:
+    """Tests for _calculate_indicators (needs TA-Lib)"""
+
+    def test_derived_values_match_talib(self, provider, ohlcv):
+        """SMA-20 and NATR derived from BBANDS and ATR equal TA-Lib's own functions"""
+        talib = pytest.importorskip("talib")
+        high, low, close, volume = ohlcv
+        frame = pd.DataFrame({'High': high, 'Low': low, 'Close': close, 'Volume': volume})
+
+        result = provider._calculate_indicators(frame)
+
+        assert result['sma_20'] == pytest.approx(talib.SMA(close, timeperiod=20)[-1])
+        assert result['natr'] == pytest.approx(talib.NATR(high, low, close, timeperiod=14)[-1])
+        assert result['bb_middle'] == result['sma_20']
+
+    def test_accepts_integer_volume(self, provider, ohlcv):
+        """Mixed column dtypes are read into one float64 buffer"""
+        pytest.importorskip("talib")
+        high, low, close, volume = ohlcv
+        frame = pd.DataFrame({
+            'Open': close, 'High': high, 'Low': low, 'Close': close,
+            'Volume': volume.astype(np.int64),
+        })
+
+        result = provider._calculate_indicators(frame)
+
+        assert result['rsi'] is not None
+        assert result['obv'].dtype == np.float64
+        assert result['vwap'] == pytest.approx(provider._calculate_vwap(high, low, close, volume)[-1])
+
+
+    def test_result_shapes(self, provider, ohlcv):
+        """OBV and A/D stay arrays; the rest are floats, or None before their lookback"""
+        pytest.importorskip("talib")
+        high, low, close, volume = (a[:150] for a in ohlcv)
+        frame = pd.DataFrame({'High': high, 'Low': low, 'Close': close, 'Volume': volume})
+
+        result = provider._calculate_indicators(frame)
+
+        assert isinstance(result['obv'], np.ndarray) and len(result['obv']) == 150
+        assert isinstance(result['ad'], np.ndarray)
+        assert result['sma_200'] is None
+        scalars = {k: v for k, v in result.items() if k not in ('obv', 'ad', 'sma_200')}
+        assert all(type(v) is float for v in scalars.values()), scalars
+
+
+class TestComprehensiveData:
+    """Tests for fields get_comprehensive_data derives itself"""
+
+    def test_52_week_range_uses_last_252_bars(self, provider):
+        """High/low cover only the last 252 bars of history"""
+        BaseDataProvider.__init__(provider, cache_duration=1200)
+        dates = pd.date_range('2022-01-01', periods=400, freq='D')
+        high = np.full(400, 110.0)
+        low = np.full(400, 90.0)
+        high[10], low[10] = 500.0, 1.0      # outside the window
+        high[300], low[350] = 150.0, 70.0   # inside it
+        history = pd.DataFrame({'High': high, 'Low': low, 'Close': 100.0, 'Volume': 1e6}, index=dates)
+
+        with patch.object(provider, 'get_historical_data', return_value=history), \
+                patch.object(provider, 'get_stock_data', return_value={'current_price': 100.0}), \
+                patch.object(provider, 'get_technical_indicators', return_value={}):
+            data = provider.get_comprehensive_data('TCS')
+
+        assert data['week_52_high'] == 150.0
+        assert data['week_52_low'] == 70.0
@@ -0,0 +1,57 @@
+"""
+Unit tests for the token bucket rate limiter.
+"""
+
+import pytest
+import threading
+import time
+from utils.rate_limiter import TokenBucket
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket class"""
+
+    def test_burst_up_to_capacity(self):
+        """A full bucket serves `capacity` calls without waiting"""
+        bucket = TokenBucket(rate=1, capacity=3)
+
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    def test_waits_for_refill(self):
+        """Once empty, the next call waits about 1/rate"""
+        bucket = TokenBucket(rate=20)
+        bucket.acquire()
+
+        start = time.monotonic()
+        waited = bucket.acquire()
+
+        assert waited == pytest.approx(0.05, abs=0.01)
+        assert time.monotonic() - start >= 0.045
+
+    def test_concurrent_callers_share_the_rate(self):
+        """Threads are spaced 1/rate apart in aggregate"""
+        bucket = TokenBucket(rate=50)
+        times = []
+        lock = threading.Lock()
+
+        def worker():
+            bucket.acquire()
+            with lock:
+                times.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        start = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # First call is free, the other five take 1/50 s each
+        assert max(times) - start >= 5 / 50 - 0.01
+
+    def test_invalid_arguments(self):
+        """Rate must be positive and capacity at least one"""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1, capacity=0)
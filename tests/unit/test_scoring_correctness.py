@@ -18,7 +18,9 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 from agents.sentiment_agent import SentimentAgent
 from agents.fundamentals_agent import FundamentalsAgent
 from core.stock_scorer import StockScorer
-from data.indian_stock_sectors import INDIAN_STOCK_SECTORS, get_sector
+from data.indian_stock_sectors import (
+    INDIAN_STOCK_SECTORS, get_sector, get_all_sectors, get_stocks_by_sector
+)
 
 
 # ---------------------------------------------------------------------------
@@ -432,6 +434,12 @@ class TestGrasimSector:
     def test_get_sector_returns_cement(self):
         assert get_sector('GRASIM') == 'Cement'
 
+    def test_get_sector_normalizes_symbol(self):
+        assert get_sector('GRASIM.NS') == 'Cement'
+        assert get_sector('grasim.BO') == 'Cement'
+        assert get_sector('M&M') == 'Automobile'
+        assert get_sector('UNKNOWNCO') == 'Unknown'
+
     def test_grasim_count_in_values(self):
         """GRASIM should only appear once as a key (Python dict guarantees uniqueness)."""
         grasim_entries = [v for k, v in INDIAN_STOCK_SECTORS.items() if k == 'GRASIM']
@@ -445,6 +453,13 @@ class TestGrasimSector:
         infra_stocks = [k for k, v in INDIAN_STOCK_SECTORS.items() if v == 'Infrastructure']
         assert 'GRASIM' not in infra_stocks
 
+    def test_stocks_by_sector_index(self):
+        """The precomputed reverse index matches a scan of the mapping."""
+        assert 'GRASIM' in get_stocks_by_sector('Cement')
+        assert get_stocks_by_sector('Infrastructure') == {'LT', 'ADANIENT', 'ADANIPORTS'}
+        assert get_stocks_by_sector('No Such Sector') == frozenset()
+        assert get_all_sectors() == set(INDIAN_STOCK_SECTORS.values())
+
 
 # ===========================================================================
 # 8. Hybrid Enrichment — NSE data enriched by Yahoo when financials missing